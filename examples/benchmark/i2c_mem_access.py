@@ -0,0 +1,61 @@
+"""
+I2C register access time: writeto/readfrom and readfrom_mem/writeto_mem
+
+Needs a PCA9955B at 0xBC (8 bit address) on I2C( 0 ) of the board. 
+On host_sim, a PCA9955B model is attached to the simulated bus so the 
+accesses are done on the device. Host_sim times are Python overhead 
+only and not bus timing. 
+
+Usage on host_sim (from top folder of the repository)
+	PYTHONPATH=host_sim:. python3 examples/benchmark/i2c_mem_access.py
+"""
+
+from	machine		import	I2C
+from	utime		import	ticks_us, ticks_diff
+
+from	nxp_periph	import	PCA9955B
+
+REPEAT	= 1000
+
+def access_time( led_c, mem_access ):
+	led_c.mem_access	= mem_access
+	buf					= bytearray( 16 )
+
+	start	= ticks_us()
+	for i in range( REPEAT ):
+		led_c.write_registers( "PWM0", i & 0xFF )
+	t_write	= ticks_diff( ticks_us(), start ) / REPEAT
+
+	start	= ticks_us()
+	for i in range( REPEAT ):
+		led_c.read_registers( "PWM0", 1 )
+	t_read	= ticks_diff( ticks_us(), start ) / REPEAT
+
+	start	= ticks_us()
+	for i in range( REPEAT ):
+		led_c.read_into( "PWM0", buf )
+	t_burst	= ticks_diff( ticks_us(), start ) / REPEAT
+
+	return t_write, t_read, t_burst
+
+def main():
+	i2c		= I2C( 0, freq = (400 * 1000) )
+
+	if hasattr( i2c, "attach" ):	#	host_sim
+		from	sim_devices	import	PCA9955B_model
+		i2c.attach( PCA9955B_model( address = 0xBC >> 1 ) )
+
+	led_c	= PCA9955B( i2c, address = 0xBC >> 1 )
+
+	print( led_c.info() )
+	print( "time per register access [us]" )
+	print( "    {:24} {:>10} {:>10} {:>16}".format( "", "write 1B", "read 1B", "read_into 16B" ) )
+
+	for mem_access in ( False, True ):
+		label	= "readfrom_mem/writeto_mem" if mem_access else "writeto/readfrom"
+		print( "    {:24} {:10.1f} {:10.1f} {:16.1f}".format( label, *access_time( led_c, mem_access ) ) )
+
+	led_c.pwm( 0, 0 )
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,91 @@
+"""
+Register name lookup cost
+
+Compares register name to address lookup of flat REG_NAME tuple
+(tuple.index(), linear search) and the class lookup table
+(reg_addr(), dict). Devices with register_map are expanded into a
+flat tuple with "reserved" padding for the "index()" column.
+
+Each driver instance is made on a simulated bus with a device model.
+
+Usage (from top folder of the repository)
+	PYTHONPATH=host_sim:. python3 examples/benchmark/register_lookup.py
+"""
+
+from	utime		import	ticks_us, ticks_diff
+from	machine		import	I2C, SPI
+
+from	sim_devices	import	register_file, PCA9955B_model, PCA9957_model, PCAL6524_model
+from	sim_devices	import	PCF2131_model, P3T1755_model, FXOS8700_model
+
+from	nxp_periph	import	PCA9955B, PCA9956B, PCA9632, PCA9957
+from	nxp_periph	import	PCAL6408, PCAL6416, PCAL6524, PCAL6534, PCAL9722, PCA9555
+from	nxp_periph	import	PCF2131_I2C, PCF85063A, PCF85063TP, PCF86263A, PCF85053A
+from	nxp_periph	import	LM75B, P3T1755, P3T1035
+from	nxp_periph	import	FXOS8700, FXLS8974
+from	nxp_periph	import	PCA8561, PCA9629A
+
+DRIVERS	= [	PCA9955B, PCA9956B, PCA9632, PCA9957,
+			PCAL6408, PCAL6416, PCAL6524, PCAL6534, PCAL9722, PCA9555,
+			PCF2131_I2C, PCF85063A, PCF85063TP, PCF86263A, PCF85053A,
+			LM75B, P3T1755, P3T1035,
+			FXOS8700, FXLS8974,
+			PCA8561, PCA9629A,
+			]
+
+MODELS	= {	PCA9955B	: PCA9955B_model,
+			PCAL6524	: PCAL6524_model,
+			PCF2131_I2C	: PCF2131_model,
+			P3T1755		: P3T1755_model,
+			FXOS8700	: FXOS8700_model,
+			}
+
+SPI_MODELS	= {	PCA9957		: PCA9957_model,
+				PCAL9722	: register_file,
+				}
+
+REPEAT	= 10
+
+def target( cls ):
+	if cls in SPI_MODELS:
+		spi	= SPI( 0 )
+		spi.attach( SPI_MODELS[ cls ]() )
+		return cls( spi, None )
+
+	i2c		= I2C( 0 )
+	model	= MODELS[ cls ]() if cls in MODELS else register_file( cls.DEFAULT_ADDR )
+	i2c.attach( model )
+
+	return cls( i2c, model.address )
+
+def lookup_by_index( flat, names ):
+	start	= ticks_us()
+	for i in range( REPEAT ):
+		for n in names:
+			flat.index( n )
+	return ticks_diff( ticks_us(), start )
+
+def lookup_by_map( dev, names ):
+	start	= ticks_us()
+	for i in range( REPEAT ):
+		for n in names:
+			dev.reg_addr( n )
+	return ticks_diff( ticks_us(), start )
+
+def main():
+	print( "register name lookup cost (average per lookup over all register names)" )
+	print( "    {:14} {:>5} {:>12} {:>12} {:>8}".format( "class", "names", "index() [us]", "map [us]", "ratio" ) )
+
+	for cls in DRIVERS:
+		dev		= target( cls )
+		flat	= tuple( cls.REG_NAME )
+		names	= [ n for n in dev.reg_map()[ 0 ] if n.lower() != "reserved" ]
+		count	= len( names ) * REPEAT
+
+		t_index	= lookup_by_index( flat, names ) / count
+		t_map	= lookup_by_map( dev, names ) / count
+
+		print( "    {:14} {:5} {:12.2f} {:12.2f} {:8.1f}".format( cls.__name__, len( names ), t_index, t_map, t_index / t_map ) )
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,36 @@
+import	uasyncio
+from	machine		import	I2C, SPI
+from	nxp_periph	import	PCA9955B, PCT2075, NAFE13388
+
+async def led_task( led_c ):
+	while True:
+		for i in range( 100 ):
+			await led_c.awrite_registers( "PWM0", i )
+			await uasyncio.sleep_ms( 10 )
+
+async def temp_task( temp_sensor ):
+	while True:
+		data	= await temp_sensor.aread_registers( "Temp", 2 )
+		print( "temp = {} degC".format( ((data[ 0 ] << 8 | data[ 1 ]) & 0xFFE0) / 256.0 ) )
+		await uasyncio.sleep_ms( 1000 )
+
+async def afe_task( afe ):
+	while True:
+		print( "afe  = {} uV".format( await afe.ameasure( 0 ) ) )
+
+def main():
+	i2c			= I2C( 0, freq = (400 * 1000) )
+	spi			= SPI( 0, 1000_000, cs = 0, phase = 1 )
+
+	led_c		= PCA9955B( i2c, 0xBC >> 1 )
+	temp_sensor	= PCT2075( i2c )
+	afe			= NAFE13388( spi, None )
+
+	loop	= uasyncio.get_event_loop()
+	loop.create_task( led_task( led_c ) )
+	loop.create_task( temp_task( temp_sensor ) )
+	loop.create_task( afe_task( afe ) )
+	loop.run_forever()
+
+if __name__ == "__main__":
+	main()
@@ -1,6 +1,6 @@
 from	machine		import	I2C
 from	utime		import	sleep
-from	nxp_periph	import	PCA9629A
+from	nxp_periph	import	PCA9629A, DeviceGroup
 
 def main():
 	INTERVAL	= 2
@@ -14,7 +14,7 @@ def main():
 					PCA9629A( i2c, address = 0x48 >> 1 )
 					]
 
-	all_mtr		= PCA9629A( i2c, address = 0xE0 >> 1 )
+	all_mtr		= DeviceGroup( mtrs, 0xE0 >> 1, sub = 0 )	#	all motors through ALLCALLADR
 
 	print( "motor stop" )
 	all_mtr.stop()
@@ -0,0 +1,218 @@
+"""
+Driver benchmark on simulated buses
+
+Runs high-level driver operations on host_sim buses and records bus
+transactions, bytes on the wire and host (Python) time per call.
+Bus transactions and bytes are compared with benchmark_baseline.json.
+The run fails (exit status 1) if an operation needs more than its
+baseline. Host time is shown for information only.
+
+Usage (from top folder of the repository)
+	PYTHONPATH=host_sim:. python3 host_sim/benchmark.py				# run and check
+	PYTHONPATH=host_sim:. python3 host_sim/benchmark.py --update		# rewrite baseline
+	PYTHONPATH=host_sim:. python3 host_sim/benchmark.py six_axis	# run selected operations
+"""
+
+import	sys
+import	io
+import	os
+import	json
+import	time
+import	contextlib
+
+from	machine		import	I2C, SPI
+from	sim_devices	import	*
+from	nxp_periph	import	*
+
+BASELINE	= os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), "benchmark_baseline.json" )
+REPEAT		= 20
+CHECK_KEYS	= ( "transactions", "bytes" )
+
+def led_flush():
+	i2c	= I2C( 0 )
+	i2c.attach( PCA9955B_model() )
+	led	= PCA9955B( i2c )
+
+	for i in range( led.CHANNELS ):
+		led.buf( i, i / led.CHANNELS )
+
+	return i2c, led.flush
+
+def led_dump():
+	i2c	= I2C( 0 )
+	i2c.attach( PCA9955B_model() )
+
+	return i2c, PCA9955B( i2c ).dump
+
+def gpio_dump():
+	i2c	= I2C( 0 )
+	i2c.attach( PCAL6524_model() )
+
+	return i2c, PCAL6524( i2c ).dump
+
+def pca9957_pwm_list():
+	spi	= SPI( 0 )
+	spi.attach( PCA9957_model() )
+	led	= PCA9957( spi, None )
+	v	= [ i / led.CHANNELS for i in range( led.CHANNELS ) ]
+
+	return spi, lambda: led.pwm( v )
+
+def rtc_now():
+	i2c	= I2C( 0 )
+	rtc	= i2c.attach( PCF2131_model() )
+
+	return i2c, PCF2131_I2C( i2c, rtc.address ).now
+
+def rtc_timestamp():
+	i2c	= I2C( 0 )
+	rtc	= i2c.attach( PCF2131_model() )
+
+	return i2c, PCF2131_I2C( i2c, rtc.address ).timestamp
+
+def temp():
+	i2c	= I2C( 0 )
+	i2c.attach( P3T1755_model() )
+	ts	= P3T1755( i2c )
+
+	return i2c, lambda: ts.temp
+
+def six_axis():
+	i2c	= I2C( 0 )
+	i2c.attach( FXOS8700_model() )
+
+	return i2c, FXOS8700( i2c ).six_axis
+
+def afe_read():
+	spi	= SPI( 0 )
+	spi.attach( NAFE13388_model() )
+
+	return spi, NAFE13388( spi, None ).read
+
+def uart_write():
+	i2c		= I2C( 0 )
+	i2c.attach( SC16IS7xx_model() )
+	uart	= SC16IS7xx( i2c )
+	data	= list( range( 64 ) )
+
+	return i2c, lambda: uart.write( data )
+
+def eeprom_write():
+	i2c		= I2C( 0 )
+	i2c.attach( M24C02_model() )
+	eeprom	= M24C02( i2c )
+	data	= [ i & 0xFF for i in range( 256 ) ]
+
+	return i2c, lambda: eeprom.write( 0, data )
+
+def lcd_puts():
+	i2c	= I2C( 0 )
+	i2c.attach( register_file( PCA8561.DEFAULT_ADDR ) )
+	lcd	= PCA8561( i2c )
+
+	return i2c, lambda: lcd.puts( "ABCD" )
+
+BENCHMARKS	= {
+				"LED_controller_base.flush"		: led_flush,
+				"PCA995xB_base.dump"			: led_dump,
+				"PCA9957.pwm(list)"				: pca9957_pwm_list,
+				"RTC_base.now"					: rtc_now,
+				"RTC_base.timestamp"			: rtc_timestamp,
+				"temp_sensor_base.temp"			: temp,
+				"FXOS8700.six_axis"				: six_axis,
+				"NAFE13388.read"				: afe_read,
+				"SC16IS7xx.write(64 bytes)"		: uart_write,
+				"M24C02.write(256 bytes)"		: eeprom_write,
+				"PCA8561.puts"					: lcd_puts,
+				"PCAL6524.dump"					: gpio_dump,
+				}
+
+def bus_count( bus ):
+	s	= bus.stats()
+
+	if isinstance( bus, I2C ):
+		n	= s[ "bytes_written" ] + s[ "bytes_read" ]
+	else:
+		n	= s[ "bytes" ]
+
+	return { "transactions": s[ "transactions" ], "bytes": n, "bus_time_us": round( s[ "bus_time_us" ], 1 ) }
+
+def run( name ):
+	"""
+	run a benchmark
+
+	Parameters
+	----------
+	name : str
+		Key of BENCHMARKS
+
+	Returns
+	-------
+	dict : transactions, bytes, bus_time_us and host_us per call
+
+	"""
+	with contextlib.redirect_stdout( io.StringIO() ):	#	drivers print in initialization and errors
+		bus, op	= BENCHMARKS[ name ]()
+
+		bus.stats_clear()
+		op()
+		result	= bus_count( bus )
+
+		start	= time.perf_counter()
+		for i in range( REPEAT ):
+			op()
+		result[ "host_us" ]	= round( (time.perf_counter() - start) * 1e6 / REPEAT, 1 )
+
+	return result
+
+def main():
+	update	= "--update" in sys.argv
+	names	= [ a for a in sys.argv[ 1 : ] if not a.startswith( "--" ) ]
+	names	= [ n for n in BENCHMARKS if not names or any( a in n for a in names ) ]
+
+	try:
+		with open( BASELINE ) as f:
+			baseline	= json.load( f )
+	except OSError:
+		baseline	= {}
+
+	fmt		= "    {:28} {:>12} {:>8} {:>12} {:>10}  {}"
+	failed	= []
+
+	print( "driver benchmark (per call)" )
+	print( fmt.format( "", "transactions", "bytes", "bus_time_us", "host_us", "baseline" ) )
+
+	for name in names:
+		r	= run( name )
+		b	= baseline.get( name )
+
+		if b is None:
+			status	= "(none)"
+		elif any( b[ k ] < r[ k ] for k in CHECK_KEYS ):
+			status	= "REGRESSION {} transactions, {} bytes".format( b[ "transactions" ], b[ "bytes" ] )
+			failed	+= [ name ]
+		elif any( r[ k ] < b[ k ] for k in CHECK_KEYS ):
+			status	= "improved from {} transactions, {} bytes".format( b[ "transactions" ], b[ "bytes" ] )
+		else:
+			status	= "ok"
+
+		print( fmt.format( name, r[ "transactions" ], r[ "bytes" ], r[ "bus_time_us" ], r[ "host_us" ], status ) )
+
+		if update:
+			baseline[ name ]	= { k: r[ k ] for k in CHECK_KEYS + ( "bus_time_us", ) }
+
+	if update:
+		with open( BASELINE, "w" ) as f:
+			json.dump( baseline, f, indent = "\t" )
+			f.write( "\n" )
+		print( "baseline updated: {}".format( BASELINE ) )
+		return 0
+
+	if failed:
+		print( "bus efficiency regression: {}".format( ", ".join( failed ) ) )
+		return 1
+
+	return 0
+
+if __name__ == "__main__":
+	sys.exit( main() )
@@ -0,0 +1,423 @@
+"""
+Host-side stand-in of MicroPython "machine" module
+
+Simulated I2C and SPI buses pass transfers to device models which are
+connected by attach(). See sim_devices.py for the models.
+Both buses count the traffic. Its result can be taken by stats().
+
+Example
+-------
+>>> from machine import I2C
+>>> from sim_devices import PCA9955B_model
+>>> i2c	= I2C( 0 )
+>>> led	= i2c.attach( PCA9955B_model() )
+>>> ... run driver code ...
+>>> print( i2c.stats() )
+
+"""
+
+import	errno
+
+def disable_irq():
+	return 0
+
+def enable_irq( state = 0 ):
+	pass
+
+def freq():
+	return 600_000_000
+
+def unique_id():
+	return b"host_sim"
+
+def idle():
+	pass
+
+class Pin:
+	"""
+	Simulated GPIO pin
+
+	value( v ) sets the pin level as an output. drive( v ) sets the level
+	from outside and calls the IRQ handler if the edge matches its trigger.
+	"""
+	IN				= 0
+	OUT				= 1
+	OPEN_DRAIN		= 2
+	ALT				= 3
+	PULL_UP			= 1
+	PULL_DOWN		= 2
+	IRQ_FALLING		= 1
+	IRQ_RISING		= 2
+	IRQ_LOW_LEVEL	= 4
+	IRQ_HIGH_LEVEL	= 8
+
+	def __init__( self, id, mode = -1, pull = -1, *, value = None, **kwargs ):
+		self.id			= id
+		self.__mode		= self.IN
+		self.__pull		= None
+		self.__level	= 0
+		self.__handler	= None
+		self.__trigger	= 0
+
+		self.init( mode, pull, value = value )
+
+	def init( self, mode = -1, pull = -1, *, value = None, **kwargs ):
+		if mode != -1:
+			self.__mode		= mode
+		if pull != -1:
+			self.__pull		= pull
+			self.__level	= 1 if pull == self.PULL_UP else self.__level
+		if value is not None:
+			self.__level	= 1 if value else 0
+
+	def value( self, v = None ):
+		if v is None:
+			return self.__level
+
+		self.__level	= 1 if v else 0
+
+	def __call__( self, v = None ):
+		return self.value( v )
+
+	def on( self ):
+		self.value( 1 )
+
+	def off( self ):
+		self.value( 0 )
+
+	high	= on
+	low		= off
+
+	def mode( self ):
+		return self.__mode
+
+	def pull( self ):
+		return self.__pull
+
+	def irq( self, handler = None, trigger = IRQ_FALLING | IRQ_RISING, **kwargs ):
+		self.__handler	= handler
+		self.__trigger	= trigger
+
+	def drive( self, v ):
+		"""
+		simulate external signal change
+		"""
+		prev			= self.__level
+		self.__level	= 1 if v else 0
+
+		if self.__handler is None or prev == self.__level:
+			return
+
+		edge	= self.IRQ_RISING if self.__level else self.IRQ_FALLING
+		if self.__trigger & edge:
+			self.__handler( self )
+
+class I2C:
+	"""
+	Simulated I2C bus
+
+	Bus time in stats() is estimated from bit count in the transactions
+	(START, address and data with ACK bits, Repeated-START and STOP) and
+	the bus frequency.
+	"""
+	def __init__( self, id = 0, *, scl = None, sda = None, freq = 400_000, timeout = 50_000 ):
+		self.id			= id
+		self.freq		= freq
+		self.devices	= {}
+		self.log		= None		#	set a list to record transfers
+
+		self.stats_clear()
+
+	def init( self, *, scl = None, sda = None, freq = 400_000 ):
+		self.freq	= freq
+
+	def deinit( self ):
+		pass
+
+	def attach( self, device ):
+		"""
+		connect a device model on the bus
+
+		Parameters
+		----------
+		device : obj
+			Device model. It needs to have "address" and i2c_ack(),
+			i2c_write() and i2c_read() methods.
+
+		Returns
+		-------
+		obj : the device model
+
+		"""
+		self.devices[ device.address ]	= device
+		return device
+
+	def detach( self, device ):
+		del self.devices[ device.address ]
+
+	def stats_clear( self ):
+		self.transactions	= 0
+		self.bytes_written	= 0
+		self.bytes_read		= 0
+		self.nacks			= 0
+		self.bits			= 0
+
+	def stats( self ):
+		"""
+		traffic since last stats_clear()
+
+		Returns
+		-------
+		dict : transactions, bytes written/read, NACKs and bus time in microseconds
+
+		"""
+		return	{
+					"transactions"	: self.transactions,
+					"bytes_written"	: self.bytes_written,
+					"bytes_read"	: self.bytes_read,
+					"nacks"			: self.nacks,
+					"bus_time_us"	: self.bits * 1_000_000 / self.freq,
+				}
+
+	def __target( self, addr ):
+		self.transactions	+= 1
+		self.bits			+= 1 + 9		#	START + address
+
+		d	= self.devices.get( addr )
+
+		if d is None:
+			g	= [ m for m in self.devices.values() if hasattr( m, "i2c_group_ack" ) and m.i2c_group_ack( addr ) ]
+			d	= group_target( g ) if g else None
+
+		if d is None or not d.i2c_ack():
+			self.nacks	+= 1
+			self.bits	+= 1
+			raise OSError( errno.ENODEV )
+
+		return d
+
+	def __write( self, addr, data, stop ):
+		d	= self.__target( addr )
+
+		self.bytes_written	+= len( data )
+		self.bits			+= len( data ) * 9 + (1 if stop else 0)
+
+		if self.log is not None:
+			self.log	+= [ ( "W", addr, data ) ]
+
+		d.i2c_write( data, stop )
+
+	def __read( self, addr, buf, stop ):
+		d	= self.__target( addr )
+
+		buf[ : ]			= d.i2c_read( len( buf ) )
+		self.bytes_read		+= len( buf )
+		self.bits			+= len( buf ) * 9 + (1 if stop else 0)
+
+		if self.log is not None:
+			self.log	+= [ ( "R", addr, bytes( buf ) ) ]
+
+	def scan( self ):
+		return [ a for a in sorted( self.devices ) if self.devices[ a ].i2c_ack() ]
+
+	def writeto( self, addr, buf, stop = True ):
+		self.__write( addr, bytes( buf ), stop )
+		return len( buf )
+
+	def writevto( self, addr, vector, stop = True ):
+		data	= b"".join( bytes( b ) for b in vector )
+		self.__write( addr, data, stop )
+		return len( data )
+
+	def readfrom_into( self, addr, buf, stop = True ):
+		self.__read( addr, buf, stop )
+
+	def readfrom( self, addr, nbytes, stop = True ):
+		buf	= bytearray( nbytes )
+		self.__read( addr, buf, stop )
+		return bytes( buf )
+
+	def readfrom_mem_into( self, addr, memaddr, buf, *, addrsize = 8 ):
+		self.__write( addr, memaddr.to_bytes( addrsize // 8, "big" ), False )
+		self.__read( addr, buf, True )
+
+	def readfrom_mem( self, addr, memaddr, nbytes, *, addrsize = 8 ):
+		buf	= bytearray( nbytes )
+		self.readfrom_mem_into( addr, memaddr, buf, addrsize = addrsize )
+		return bytes( buf )
+
+	def writeto_mem( self, addr, memaddr, buf, *, addrsize = 8 ):
+		self.__write( addr, memaddr.to_bytes( addrsize // 8, "big" ) + bytes( buf ), True )
+
+class group_target:
+	"""
+	Devices responding to a group address (ALLCALLADR/SUBADRx)
+
+	Written data goes to all devices. Read data is wired-AND of all devices.
+	"""
+	def __init__( self, devices ):
+		self.devices	= devices
+
+	def i2c_ack( self ):
+		return any( d.i2c_ack() for d in self.devices )
+
+	def i2c_write( self, data, stop ):
+		for d in self.devices:
+			d.i2c_write( data, stop )
+
+	def i2c_read( self, n ):
+		rtn	= bytearray( b"\xFF" * n )
+
+		for d in self.devices:
+			for i, v in enumerate( d.i2c_read( n ) ):
+				rtn[ i ]	&= v
+
+		return rtn
+
+class SPI:
+	"""
+	Simulated SPI bus
+
+	A device attached with "cs" Pin is selected while the pin is LOW.
+	A device attached without "cs" is selected always (hardware chip select).
+	Each transfer method call is a frame for the device.
+	"""
+	MSB	= 0
+	LSB	= 1
+
+	def __init__( self, id = 0, baudrate = 1_000_000, *, polarity = 0, phase = 0, bits = 8, firstbit = MSB, **kwargs ):
+		self.id			= id
+		self.baudrate	= baudrate
+		self.devices	= []
+		self.log		= None		#	set a list to record transfers
+
+		self.stats_clear()
+
+	def init( self, baudrate = 1_000_000, **kwargs ):
+		self.baudrate	= baudrate
+
+	def deinit( self ):
+		pass
+
+	def attach( self, device, cs = None ):
+		"""
+		connect a device model on the bus
+
+		Parameters
+		----------
+		device : obj
+			Device model. It needs to have spi_transfer() method.
+		cs : machine.Pin, option
+			Chip select pin
+
+		Returns
+		-------
+		obj : the device model
+
+		"""
+		self.devices	+= [ ( cs, device ) ]
+		return device
+
+	def stats_clear( self ):
+		self.transactions	= 0
+		self.bytes			= 0
+
+	def stats( self ):
+		"""
+		traffic since last stats_clear()
+
+		Returns
+		-------
+		dict : transactions, bytes and bus time in microseconds
+
+		"""
+		return	{
+					"transactions"	: self.transactions,
+					"bytes"			: self.bytes,
+					"bus_time_us"	: self.bytes * 8 * 1_000_000 / self.baudrate,
+				}
+
+	def __transfer( self, data ):
+		self.transactions	+= 1
+		self.bytes			+= len( data )
+
+		rtn	= None
+		for cs, d in self.devices:
+			if cs is None or not cs.value():
+				r	= d.spi_transfer( data )
+				rtn	= r if rtn is None else rtn
+
+		rtn	= b"\xFF" * len( data ) if rtn is None else bytes( rtn )
+
+		if self.log is not None:
+			self.log	+= [ ( data, rtn ) ]
+
+		return rtn
+
+	def write( self, buf ):
+		self.__transfer( bytes( buf ) )
+
+	def read( self, nbytes, write = 0x00 ):
+		return self.__transfer( bytes( [ write ] * nbytes ) )
+
+	def readinto( self, buf, write = 0x00 ):
+		buf[ : ]	= self.__transfer( bytes( [ write ] * len( buf ) ) )
+
+	def write_readinto( self, write_buf, read_buf ):
+		read_buf[ : ]	= self.__transfer( bytes( write_buf ) )
+
+SoftI2C	= I2C
+SoftSPI	= SPI
+
+class Timer:
+	"""
+	Simulated timer
+
+	No callback happens by itself on host. Call fire() to simulate
+	the timer expiration.
+	"""
+	ONE_SHOT	= 0
+	PERIODIC	= 1
+
+	def __init__( self, id = -1, **kwargs ):
+		self.id			= id
+		self.mode		= self.PERIODIC
+		self.period		= -1
+		self.callback	= None
+
+		if kwargs:
+			self.init( **kwargs )
+
+	def init( self, *, mode = PERIODIC, freq = -1, period = -1, callback = None, **kwargs ):
+		self.mode		= mode
+		self.period		= (1000 / freq) if 0 < freq else period
+		self.callback	= callback
+
+	def deinit( self ):
+		self.callback	= None
+
+	def fire( self ):
+		"""
+		call the callback as the timer expired
+		"""
+		cb	= self.callback
+
+		if self.mode == self.ONE_SHOT:
+			self.deinit()
+
+		if cb:
+			cb( self )
+
+class ADC:
+	"""
+	Simulated ADC. Set "value" to change the reading.
+	"""
+	def __init__( self, pin, **kwargs ):
+		self.pin	= pin
+		self.value	= 0x8000
+
+	def read_u16( self ):
+		return self.value
+
+	def read_uv( self ):
+		return self.value * 3_300_000 // 0xFFFF
@@ -0,0 +1,23 @@
+"""
+Host-side stand-in of MicroPython "micropython" module
+"""
+
+def const( expr ):
+	return expr
+
+def schedule( func, arg ):
+	"""
+	No interrupt context on host. The function is called immediately.
+	"""
+	func( arg )
+
+def alloc_emergency_exception_buf( size ):
+	pass
+
+def opt_level( level = None ):
+	return 0
+
+def native( func ):
+	return func
+
+viper	= native
@@ -0,0 +1,96 @@
+"""
+MicroPython compatible module loading on CPython
+
+MicroPython doesn't do private name mangling. Names like "self.__if"
+are shared between a class and its subclasses and the nxp_periph
+drivers rely on it (a base class method calls "self.__read()" which
+is defined in a device class, for example).
+
+This module installs an import hook which loads the source of listed
+packages with the double underscore names renamed to a single
+underscore prefixed name before compiling. The renamed code behaves
+same as it does on MicroPython.
+
+The hook is installed by "sitecustomize.py" in this directory.
+"""
+
+import	sys
+import	warnings
+import	io
+import	tokenize
+import	importlib.util
+import	importlib.machinery
+
+PACKAGES	= [ "nxp_periph", "demo_lib" ]
+PREFIX		= "_mpy"
+
+def demangle( source ):
+	"""
+	rename "__name" (not "__name__") identifiers in source
+
+	String literals of a private name (used with hasattr()/getattr())
+	are renamed too.
+
+	Parameters
+	----------
+	source : str
+		Python source code
+
+	Returns
+	-------
+	str : converted source code
+
+	"""
+	lines	= source.splitlines( keepends = True )
+	names	= []
+
+	for tok in tokenize.generate_tokens( io.StringIO( source ).readline ):
+		s	= tok.string
+		if tok.type == tokenize.NAME and s.startswith( "__" ) and not s.endswith( "__" ):
+			names	+= [ tok.start ]
+		elif tok.type == tokenize.STRING and s[ 1 : 3 ] == "__" and s[ 1 : -1 ].isidentifier() and not s.endswith( "__" + s[ 0 ] ):
+			names	+= [ ( tok.start[ 0 ], tok.start[ 1 ] + 1 ) ]	#	like hasattr( self, "__adr" )
+
+	for row, col in reversed( names ):
+		line			= lines[ row - 1 ]
+		lines[ row - 1 ]	= line[ : col ] + PREFIX + line[ col : ]
+
+	return "".join( lines )
+
+class mpy_loader( importlib.machinery.SourceFileLoader ):
+	"""
+	source loader with demangling
+
+	Compiled code is not cached to keep the __pycache__ for normal
+	CPython imports clean.
+	"""
+	def get_code( self, fullname ):
+		path	= self.get_filename( fullname )
+		source	= importlib.util.decode_source( self.get_data( path ) )
+
+		with warnings.catch_warnings():
+			warnings.simplefilter( "ignore", SyntaxWarning )	#	"is" with literals works on MicroPython
+			return compile( demangle( source ), path, "exec", dont_inherit = True )
+
+class mpy_finder:
+	"""
+	meta path finder to apply mpy_loader on PACKAGES
+	"""
+	@classmethod
+	def find_spec( cls, fullname, path = None, target = None ):
+		if fullname.split( "." )[ 0 ] not in PACKAGES:
+			return None
+
+		spec	= importlib.machinery.PathFinder.find_spec( fullname, path )
+
+		if spec and type( spec.loader ) == importlib.machinery.SourceFileLoader:
+			spec.loader	= mpy_loader( spec.loader.name, spec.loader.path )
+
+		return spec
+
+def install():
+	"""
+	install the import hook (does nothing if already installed)
+	"""
+	if mpy_finder not in sys.meta_path:
+		sys.meta_path.insert( 0, mpy_finder )
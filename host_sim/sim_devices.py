@@ -0,0 +1,661 @@
+"""
+Register-file device models for simulated I2C/SPI buses
+
+Each model can be connected to machine.I2C or machine.SPI in host_sim
+by attach(). The models behave like the devices in the register access
+level: register pointer, auto-increment, read-only registers and
+registers which change its value by the device itself.
+
+The "reg" bytearray holds register values. It can be read/written
+directly from test code to set/check the device state.
+"""
+
+import	datetime
+from	utime	import	ticks_ms, ticks_diff
+
+class register_file:
+	"""
+	Generic register-file device model
+
+	I2C: The first byte in write transfer is a register pointer.
+	Following bytes are written from the pointer.
+	Read transfer reads from the pointer.
+
+	SPI: The first byte is a register address with read flag at bit7.
+	Following bytes are read/written from the address.
+
+	Subclasses can override read_reg()/write_reg() to implement register
+	behavior and next_ptr() for auto-increment rule.
+
+	Devices with ALLCALLADR/SUBADR1-3 registers set GROUP_REGS. The model
+	responds to the addresses enabled in MODE register (see i2c_group_ack()).
+	"""
+	DEFAULT_ADDR	= 0x00
+	SIZE			= 256
+	RESET			= {}		#	register reset values
+	READ_ONLY		= ()		#	writing to these registers is ignored
+	AI_FLAG			= None		#	auto-increment flag in pointer. None for always auto-increment
+	MODE			= 0x00		#	register of group address enable bits
+	GROUP_REGS		= None		#	ALLCALLADR, SUBADR1, SUBADR2 and SUBADR3 register addresses
+	GROUP_BITS		= ( 0x01, 0x08, 0x04, 0x02 )	#	ALLCALL, SUB1, SUB2 and SUB3 bits in MODE
+
+	def __init__( self, address = None, size = None, ai_flag = None ):
+		"""
+		Parameters
+		----------
+		address : int, option
+			I2C target address. DEFAULT_ADDR if not given
+		size : int, option
+			Number of registers. SIZE if not given
+		ai_flag : int, option
+			Auto-increment flag in the register pointer. AI_FLAG if not given
+
+		"""
+		self.address	= self.DEFAULT_ADDR if address is None else address
+		self.size		= self.SIZE if size is None else size
+		self.ai_flag	= self.AI_FLAG if ai_flag is None else ai_flag
+		self.reg		= bytearray( self.size )
+		self.ptr		= 0
+		self.ai			= True
+
+		self.reset()
+
+	def reset( self ):
+		self.reg[ : ]	= bytes( self.size )
+		for r, v in self.RESET.items():
+			self.reg[ r ]	= v
+
+	def read_reg( self, r ):
+		return self.reg[ r ]
+
+	def write_reg( self, r, v ):
+		if r not in self.READ_ONLY:
+			self.reg[ r ]	= v
+
+	def next_ptr( self, r ):
+		return (r + 1) % self.size if self.ai else r
+
+	def set_ptr( self, p ):
+		if self.ai_flag is None:
+			self.ai		= True
+		else:
+			self.ai		= bool( p & self.ai_flag )
+			p		   &= ~self.ai_flag
+
+		self.ptr	= p % self.size
+
+	#	I2C protocol
+
+	def i2c_ack( self ):
+		return True
+
+	def i2c_group_ack( self, addr ):
+		"""
+		check the address is one of enabled group addresses
+		"""
+		if not self.GROUP_REGS:
+			return False
+
+		mode	= self.reg[ self.MODE ]
+
+		return any( mode & b and self.reg[ r ] >> 1 == addr for r, b in zip( self.GROUP_REGS, self.GROUP_BITS ) )
+
+	def i2c_write( self, data, stop ):
+		if not data:
+			return
+
+		self.set_ptr( data[ 0 ] )
+
+		for v in data[ 1 : ]:
+			self.write_reg( self.ptr, v )
+			self.ptr	= self.next_ptr( self.ptr )
+
+	def i2c_read( self, n ):
+		rtn	= bytearray( n )
+
+		for i in range( n ):
+			rtn[ i ]	= self.read_reg( self.ptr )
+			self.ptr	= self.next_ptr( self.ptr )
+
+		return rtn
+
+	#	SPI protocol
+
+	def spi_transfer( self, data ):
+		rtn	= bytearray( len( data ) )
+
+		if not data:
+			return rtn
+
+		read		= data[ 0 ] & 0x80
+		self.ai		= True
+		self.ptr	= (data[ 0 ] & 0x7F) % self.size
+
+		for i in range( 1, len( data ) ):
+			if read:
+				rtn[ i ]	= self.read_reg( self.ptr )
+			else:
+				self.write_reg( self.ptr, data[ i ] )
+			self.ptr	= self.next_ptr( self.ptr )
+
+		return rtn
+
+class LED_driver_model( register_file ):
+	"""
+	Common behavior of PCA9955B and PCA9957 models
+
+	PWMALL/IREFALL writes go to all PWM/IREF registers and read as 0.
+	Writing CLRERR bit in MODE2 clears EFLAG registers.
+	"""
+	MODE2		= 0x01
+	CLRERR		= 0x10
+
+	def write_reg( self, r, v ):
+		if r == self.PWMALL:
+			self.reg[ self.PWM0 : self.PWM0 + self.CHANNELS ]	= bytes( [ v ] * self.CHANNELS )
+		elif r == self.IREFALL:
+			self.reg[ self.IREF0 : self.IREF0 + self.CHANNELS ]	= bytes( [ v ] * self.CHANNELS )
+		elif r == self.MODE2:
+			if v & self.CLRERR:
+				for e in self.READ_ONLY:
+					self.reg[ e ]	= 0x00
+			self.reg[ r ]	= v & ~self.CLRERR
+		else:
+			super().write_reg( r, v )
+
+class PCA9955B_model( LED_driver_model ):
+	"""
+	PCA9955B: 16 channel LED driver (I2C), auto-increment by bit7 of pointer
+	"""
+	DEFAULT_ADDR	= 0xE0 >> 1
+	SIZE			= 0x4A
+	AI_FLAG			= 0x80
+	RESET			= { 0x00: 0x89, 0x01: 0x05, 0x3F: 0x08, 0x43: 0xE0 }
+	READ_ONLY		= range( 0x46, 0x4A )		#	EFLAG0-3
+	GROUP_REGS		= ( 0x43, 0x40, 0x41, 0x42 )
+	CHANNELS		= 16
+	PWM0			= 0x08
+	IREF0			= 0x18
+	PWMALL			= 0x44
+	IREFALL			= 0x45
+
+class PCA9957_model( LED_driver_model ):
+	"""
+	PCA9957: 24 channel LED driver (SPI)
+
+	SPI frame is 2 bytes: register address << 1 | read flag and data.
+	Read data comes out in the 2nd byte of next frame. No auto-increment.
+	"""
+	SIZE			= 0x6C
+	RESET			= { 0x00: 0x00, 0x01: 0x05, 0x69: 0x0B }
+	READ_ONLY		= range( 0x02, 0x08 )		#	EFLAG0-5
+	CHANNELS		= 24
+	PWM0			= 0x10
+	IREF0			= 0x28
+	PWMALL			= 0x6A
+	IREFALL			= 0x6B
+
+	def __init__( self, size = None ):
+		super().__init__( size = size )
+		self.sdo	= 0xFF
+
+	def spi_transfer( self, data ):
+		rtn			= bytearray( len( data ) )
+		rtn[ -1 ]	= self.sdo
+		self.sdo	= 0xFF
+
+		if len( data ) < 2:
+			return rtn
+
+		r	= (data[ 0 ] >> 1) % self.size
+
+		if data[ 0 ] & 0x01:
+			self.sdo	= self.read_reg( r )
+		else:
+			self.write_reg( r, data[ 1 ] )
+
+		return rtn
+
+class PCAL6524_model( register_file ):
+	"""
+	PCAL6524: 24 bit GPIO expander (I2C), auto-increment by bit7 of pointer
+
+	Set input levels by drive(). Unmasked input changes latch interrupt
+	status which is cleared by reading the input port or writing to
+	interrupt clear register.
+	"""
+	DEFAULT_ADDR	= 0x44 >> 1
+	SIZE			= 0x77
+	AI_FLAG			= 0x80
+	RESET			= dict( [ ( r, 0xFF ) for r in ( 0x04, 0x05, 0x06, 0x0C, 0x0D, 0x0E, 0x40, 0x41, 0x42, 0x43, 0x44, 0x45, 0x50, 0x51, 0x52, 0x54, 0x55, 0x56 ) ] )
+	READ_ONLY		= ( 0x00, 0x01, 0x02, 0x58, 0x59, 0x5A, 0x6C, 0x6D, 0x6E )
+	INPUT			= 0x00
+	OUTPUT			= 0x04
+	POLARITY		= 0x08
+	CONFIG			= 0x0C
+	INT_MASK		= 0x54
+	INT_STATUS		= 0x58
+	INT_CLEAR		= 0x68
+	INPUT_STATUS	= 0x6C
+	N_PORTS			= 3
+
+	def __init__( self, address = None ):
+		self.inputs	= [ 0x00 ] * self.N_PORTS
+		super().__init__( address )
+
+	def level( self, port ):
+		cfg	= self.reg[ self.CONFIG + port ]
+		return (self.inputs[ port ] & cfg) | (self.reg[ self.OUTPUT + port ] & ~cfg & 0xFF)
+
+	def drive( self, value ):
+		"""
+		set input pin levels
+
+		Parameters
+		----------
+		value : int
+			Input levels. Port 0 in LSB.
+
+		"""
+		for p in range( self.N_PORTS ):
+			prev				= self.level( p )
+			self.inputs[ p ]	= (value >> (p * 8)) & 0xFF
+			changed				= prev ^ self.level( p )
+			self.reg[ self.INT_STATUS + p ]	|= changed & ~self.reg[ self.INT_MASK + p ] & 0xFF
+
+	def read_reg( self, r ):
+		if self.INPUT <= r < self.INPUT + self.N_PORTS:
+			p	= r - self.INPUT
+			self.reg[ self.INT_STATUS + p ]	= 0x00
+			return self.level( p ) ^ self.reg[ self.POLARITY + p ]
+
+		if self.INPUT_STATUS <= r < self.INPUT_STATUS + self.N_PORTS:
+			return self.level( r - self.INPUT_STATUS )
+
+		if self.INT_CLEAR <= r < self.INT_CLEAR + self.N_PORTS:
+			return 0x00
+
+		return self.reg[ r ]
+
+	def write_reg( self, r, v ):
+		if self.INT_CLEAR <= r < self.INT_CLEAR + self.N_PORTS:
+			self.reg[ self.INT_STATUS + r - self.INT_CLEAR ]	&= ~v & 0xFF
+		else:
+			super().write_reg( r, v )
+
+class PCF2131_model( register_file ):
+	"""
+	PCF2131: RTC (I2C and SPI), always auto-increment
+
+	Time registers count up from the written time while STOP bit is 0.
+	Writing 0xA5 to SR_Reset does software reset.
+	"""
+	DEFAULT_ADDR	= 0xA6 >> 1
+	SIZE			= 0x37
+	RESET			= { 0x00: 0x08, 0x05: 0x24, 0x07: 0x80, 0x31: 0x3F, 0x32: 0x07, 0x33: 0x3F, 0x34: 0x07 }
+	CONTROL_1		= 0x00
+	SR_RESET		= 0x05
+	TIME			= range( 0x06, 0x0E )
+	STOP			= 0x20
+	OSF				= 0x80
+
+	def reset( self ):
+		super().reset()
+		self.base		= datetime.datetime( 2000, 1, 1 )
+		self.base_ticks	= ticks_ms()
+		self.osf		= self.OSF
+
+	def now( self ):
+		if self.reg[ self.CONTROL_1 ] & self.STOP:
+			return self.base
+
+		return self.base + datetime.timedelta( milliseconds = ticks_diff( ticks_ms(), self.base_ticks ) )
+
+	@staticmethod
+	def bcd( v ):
+		return (v // 10) << 4 | v % 10
+
+	@staticmethod
+	def bin( v ):
+		return (v >> 4) * 10 + (v & 0x0F)
+
+	def time_regs( self ):
+		t	= self.now()
+		return	[	self.bcd( t.microsecond // 10000 ), self.bcd( t.second ) | self.osf, self.bcd( t.minute ), self.bcd( t.hour ),
+					self.bcd( t.day ), t.isoweekday() % 7, self.bcd( t.month ), self.bcd( t.year % 100 ) ]
+
+	def read_reg( self, r ):
+		if r in self.TIME:
+			return self.time_regs()[ r - self.TIME.start ]
+
+		return self.reg[ r ]
+
+	def write_reg( self, r, v ):
+		if r in self.TIME:
+			tr		= self.time_regs()
+			tr[ r - self.TIME.start ]	= v
+			self.osf	= 0x00 if r == 0x07 else self.osf
+			self.base	= datetime.datetime( 2000 + self.bin( tr[ 7 ] ), max( 1, self.bin( tr[ 6 ] ) ), max( 1, self.bin( tr[ 4 ] ) ),
+											self.bin( tr[ 3 ] & 0x3F ), self.bin( tr[ 2 ] & 0x7F ), self.bin( tr[ 1 ] & 0x7F ), self.bin( tr[ 0 ] ) * 10000 )
+			self.base_ticks	= ticks_ms()
+		elif r == self.SR_RESET:
+			if v == 0xA5:
+				self.reset()
+		elif r == self.CONTROL_1:
+			t				= self.now()
+			self.reg[ r ]	= v
+			self.base		= t
+			self.base_ticks	= ticks_ms()
+		else:
+			super().write_reg( r, v )
+
+class P3T1755_model( register_file ):
+	"""
+	P3T1755: temperature sensor (I2C) with pointer register
+
+	The pointer selects a register. Read/write bytes are MSB first within
+	the register, no increment to next register.
+	Set "temperature" to change the reading.
+	"""
+	DEFAULT_ADDR	= 0x98 >> 1
+	SIZE			= 4
+	WIDTH			= ( 2, 1, 2, 2 )
+	OS				= 0x80		#	one-shot bit in Conf, reads as 0
+
+	def reset( self ):
+		self.temperature	= 25.0
+		self.regs			= [ 0, 0x28, 0x4B00, 0x5000 ]
+		self.byte			= 0
+
+	def read_reg( self, r ):
+		if 0 == r:
+			return int( self.temperature * 256 ) & 0xFFF0
+
+		return self.regs[ r ]
+
+	def write_reg( self, r, v ):
+		if 1 == r:
+			v	&= ~self.OS
+		if 0 != r:
+			self.regs[ r ]	= v
+
+	def i2c_write( self, data, stop ):
+		if not data:
+			return
+
+		self.ptr	= data[ 0 ] & 0x03
+		self.byte	= 0
+		width		= self.WIDTH[ self.ptr ]
+
+		if 1 < len( data ):
+			v	= 0
+			for b in data[ 1 : 1 + width ]:
+				v	= v << 8 | b
+			self.write_reg( self.ptr, v << (8 * (width - len( data[ 1 : 1 + width ] ))) )
+
+	def i2c_read( self, n ):
+		width	= self.WIDTH[ self.ptr ]
+		v		= self.read_reg( self.ptr ).to_bytes( width, "big" )
+
+		return bytearray( v[ i % width ] for i in range( n ) )
+
+class FXOS8700_model( register_file ):
+	"""
+	FXOS8700: 6-axis accelerometer and magnetometer (I2C)
+
+	Set "accel" and "mag" (3 signed 16 bit values) to change the reading.
+	In hybrid mode with hyb_autoinc_mode, auto-increment goes from
+	OUT_Z_LSB (0x06) to M_OUT_X_MSB (0x33).
+	"""
+	DEFAULT_ADDR	= 0x1F
+	SIZE			= 0x7A
+	RESET			= { 0x0D: 0xC7 }
+	READ_ONLY		= ( 0x00, 0x0B, 0x0C, 0x0D, 0x10, 0x16, 0x1E, 0x22, 0x32, 0x51, 0x53, 0x5E ) + tuple( range( 0x01, 0x07 ) ) + tuple( range( 0x33, 0x3F ) ) + tuple( range( 0x45, 0x51 ) )
+	ACCEL			= 0x01
+	MAG				= 0x33
+	M_CTRL_REG1		= 0x5B
+	M_CTRL_REG2		= 0x5C
+
+	def reset( self ):
+		super().reset()
+		self.accel	= [ 0, 0, 0x4000 ]
+		self.mag	= [ 0, 0, 0 ]
+
+	def read_reg( self, r ):
+		for base, v in ( ( self.ACCEL, self.accel ), ( self.MAG, self.mag ) ):
+			if base <= r < base + 6:
+				d	= (v[ (r - base) // 2 ] & 0xFFFF).to_bytes( 2, "big" )
+				return d[ (r - base) % 2 ]
+
+		if 0x00 == r:
+			return 0xFF		#	ZYXOW and ZYXDR flags
+
+		return self.reg[ r ]
+
+	def next_ptr( self, r ):
+		hybrid	= (self.reg[ self.M_CTRL_REG1 ] & 0x03) == 0x03 and self.reg[ self.M_CTRL_REG2 ] & 0x20
+
+		if hybrid and r == self.ACCEL + 5:
+			return self.MAG
+
+		return super().next_ptr( r )
+
+class NAFE13388_model:
+	"""
+	NAFE13388: analog front-end (SPI)
+
+	16 bit SPI command word is register/command address << 1 with
+	read flag (0x4000). 2 byte frame is a command.
+	Channel data registers (0x40-0x4F) are 24 bit, others are 16 bit.
+	Channel configuration registers (0x20-0x23) are paged by the
+	logical channel which is selected by command 0x0000-0x000F.
+	Conversion commands copy "inputs" values into the data registers.
+	"""
+	CMD_RESET		= 0x0014
+	CMD_SS			= 0x2000
+	CMD_MC			= 0x2004
+	CH_CONFIG		= range( 0x20, 0x24 )
+	CH_CONFIG4		= 0x24
+	CH_DATA			= range( 0x40, 0x50 )
+	DIE_TEMP		= 0x34
+
+	def __init__( self ):
+		self.inputs	= [ 0 ] * 16
+		self.reset()
+
+	def reset( self ):
+		self.regs		= { self.DIE_TEMP: 25 * 64 }
+		self.ch_config	= [ [ 0 ] * 4 for i in range( 16 ) ]
+		self.ch			= 0
+
+	def read_reg( self, r ):
+		if r in self.CH_CONFIG:
+			return self.ch_config[ self.ch ][ r - self.CH_CONFIG.start ]
+
+		return self.regs.get( r, 0 )
+
+	def write_reg( self, r, v ):
+		if r in self.CH_CONFIG:
+			self.ch_config[ self.ch ][ r - self.CH_CONFIG.start ]	= v
+		else:
+			self.regs[ r ]	= v
+
+	def command( self, cmd ):
+		if cmd < 0x10:
+			self.ch	= cmd
+		elif cmd == self.CMD_RESET:
+			self.reset()
+		elif cmd == self.CMD_SS:
+			self.regs[ self.CH_DATA.start + self.ch ]	= self.inputs[ self.ch ] & 0xFFFFFF
+		elif cmd == self.CMD_MC:
+			for ch in range( 16 ):
+				if self.regs.get( self.CH_CONFIG4, 0 ) & (1 << ch):
+					self.regs[ self.CH_DATA.start + ch ]	= self.inputs[ ch ] & 0xFFFFFF
+
+	def spi_transfer( self, data ):
+		rtn	= bytearray( len( data ) )
+
+		if len( data ) < 2:
+			return rtn
+
+		cmd	= (data[ 0 ] << 8 | data[ 1 ]) >> 1
+
+		if 2 == len( data ):
+			self.command( cmd )
+		elif cmd & 0x2000:
+			r			= cmd & 0x1FFF
+			width		= 3 if r in self.CH_DATA else 2
+			v			= self.read_reg( r ).to_bytes( width, "big" )
+			n			= min( width, len( data ) - 2 )
+			rtn[ 2 : 2 + n ]	= v[ : n ]
+		else:
+			self.write_reg( cmd, data[ 2 ] << 8 | data[ 3 ] if 4 <= len( data ) else data[ 2 ] << 8 )
+
+		return rtn
+
+class SC16IS7xx_model:
+	"""
+	SC16IS7xx: UART with I2C/SPI interface (2 channels)
+
+	Sub-address is register << 3 | channel << 1 (bit7 is read flag on SPI).
+	No auto-increment. DLL/DLH and enhanced registers are mapped by LCR.
+	Transmitted data is stored in "tx". Use receive() to put data in RX FIFO.
+	"""
+	DEFAULT_ADDR	= 0x90 >> 1
+	RHR				= 0x00
+	FCR				= 0x02
+	LCR				= 0x03
+	LSR				= 0x05
+	TXLVL			= 0x08
+	RXLVL			= 0x09
+	FIFO_SIZE		= 64
+
+	def __init__( self, address = None ):
+		self.address	= self.DEFAULT_ADDR if address is None else address
+		self.tx			= [ bytearray(), bytearray() ]
+		self.rx			= [ bytearray(), bytearray() ]
+		self.regs		= [ [ 0 ] * 16, [ 0 ] * 16 ]
+		self.special	= [ [ 0x01, 0x00 ], [ 0x01, 0x00 ] ]	#	DLL, DLH
+		self.enhanced	= [ {}, {} ]
+		self.sub		= 0
+
+		for ch in range( 2 ):
+			self.regs[ ch ][ self.LCR ]	= 0x1D
+
+	def receive( self, data, ch = 0 ):
+		"""
+		put received data in RX FIFO
+		"""
+		self.rx[ ch ]	+= bytes( data )
+
+	def access( self, sub, v = None ):
+		r	= (sub >> 3) & 0x0F
+		ch	= (sub >> 1) & 0x01
+		lcr	= self.regs[ ch ][ self.LCR ]
+
+		if lcr == 0xBF and r in ( 2, 4, 5, 6, 7 ):
+			if v is None:
+				return self.enhanced[ ch ].get( r, 0 )
+			self.enhanced[ ch ][ r ]	= v
+			return
+
+		if lcr & 0x80 and r in ( 0, 1 ):
+			if v is None:
+				return self.special[ ch ][ r ]
+			self.special[ ch ][ r ]	= v
+			return
+
+		if v is None:
+			if r == self.RHR:
+				if not self.rx[ ch ]:
+					return 0
+				d	= self.rx[ ch ][ 0 ]
+				del self.rx[ ch ][ 0 ]
+				return d
+			if r == self.FCR:
+				return 0xC1 if self.regs[ ch ][ r ] & 0x01 else 0x01	#	IIR
+			if r == self.LSR:
+				return 0x60 | (0x01 if self.rx[ ch ] else 0x00)
+			if r == self.TXLVL:
+				return self.FIFO_SIZE
+			if r == self.RXLVL:
+				return len( self.rx[ ch ] )
+			return self.regs[ ch ][ r ]
+
+		if r == self.RHR:
+			self.tx[ ch ].append( v )
+		elif r == self.FCR:
+			if v & 0x02:
+				self.rx[ ch ]	= bytearray()
+			self.regs[ ch ][ r ]	= v & 0x01
+		elif r not in ( self.LSR, self.TXLVL, self.RXLVL ):
+			self.regs[ ch ][ r ]	= v
+
+	def i2c_ack( self ):
+		return True
+
+	def i2c_write( self, data, stop ):
+		if not data:
+			return
+
+		self.sub	= data[ 0 ]
+
+		for v in data[ 1 : ]:
+			self.access( self.sub, v )
+
+	def i2c_read( self, n ):
+		return bytearray( self.access( self.sub ) for i in range( n ) )
+
+	def spi_transfer( self, data ):
+		rtn	= bytearray( len( data ) )
+
+		if not data:
+			return rtn
+
+		sub	= data[ 0 ] & 0x7F
+
+		for i in range( 1, len( data ) ):
+			if data[ 0 ] & 0x80:
+				rtn[ i ]	= self.access( sub )
+			else:
+				self.access( sub, data[ i ] )
+
+		return rtn
+
+class M24C02_model( register_file ):
+	"""
+	M24C02: 2K bit EEPROM (I2C)
+
+	Page write rolls over in 16 byte page. The device doesn't respond
+	(NACK) during write cycle (5 ms) after STOP-condition of a write.
+	"""
+	DEFAULT_ADDR	= 0xA0 >> 1
+	SIZE			= 256
+	PAGE			= 16
+	WRITE_CYCLE		= 5		#	milliseconds
+
+	def reset( self ):
+		self.reg[ : ]	= b"\xFF" * self.size
+		self.busy_from	= None
+
+	def i2c_ack( self ):
+		if self.busy_from is not None:
+			if ticks_diff( ticks_ms(), self.busy_from ) < self.WRITE_CYCLE:
+				return False
+			self.busy_from	= None
+
+		return True
+
+	def i2c_write( self, data, stop ):
+		if not data:
+			return
+
+		self.ptr	= data[ 0 ]
+		page		= self.ptr & ~(self.PAGE - 1)
+
+		for v in data[ 1 : ]:
+			self.reg[ self.ptr ]	= v
+			self.ptr				= page | ((self.ptr + 1) % self.PAGE)
+
+		if 1 < len( data ) and stop:
+			self.busy_from	= ticks_ms()
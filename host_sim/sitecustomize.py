@@ -0,0 +1,6 @@
+#	Loaded automatically by CPython when this directory is in PYTHONPATH
+#	See mpy_compat.py
+
+import	mpy_compat
+
+mpy_compat.install()
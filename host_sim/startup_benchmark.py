@@ -0,0 +1,98 @@
+"""
+Startup benchmark of a single-device application
+
+Measures time and heap to import the nxp_periph package and make a
+P3T1755 instance. "eager" mode imports the 13 submodules which the
+package star-imported before lazy loading (modules added later, like
+sampler or bus_scan, are not included). Those are the current sources, 
+so the eager numbers are not a measurement of the old package itself. 
+"lazy" mode imports only the needed name. Each mode runs in a fresh 
+interpreter. "submodules" is the number of loaded nxp_periph modules.
+
+Heap is gc.mem_alloc() on MicroPython and tracemalloc on CPython.
+
+Usage (from top folder of the repository)
+	PYTHONPATH=host_sim:. python3 host_sim/startup_benchmark.py
+
+On MicroPython, copy this file to the board, reset it and run
+	>>> import startup_benchmark
+	>>> startup_benchmark.measure( "lazy" )
+"""
+
+import	sys
+import	gc
+
+try:
+	from	utime	import	ticks_us, ticks_diff
+except ImportError:
+	from	time	import	perf_counter
+	ticks_us	= lambda: int( perf_counter() * 1e6 )
+	ticks_diff	= lambda a, b: a - b
+
+try:
+	mem_alloc	= gc.mem_alloc
+except AttributeError:
+	import	tracemalloc
+	tracemalloc.start()
+	mem_alloc	= lambda: tracemalloc.get_traced_memory()[ 0 ]
+
+#	submodules star-imported by the package before lazy loading
+SUBMODULES	= ( "RTC", "temp_sensor", "LED_controller", "GPIO", "stepper_motor", "interface", "protocol_bridge",
+				"LCD_driver", "accelerometer", "afe", "MikanUtil", "ard_brd_dev", "bus_mux_switch" )
+
+def measure( mode ):
+	"""
+	measure import time and heap
+	
+	Parameters
+	----------
+	mode : str
+		"eager" or "lazy"
+
+	Returns
+	-------
+	dict : import_us, instance_us, heap_bytes and number of loaded submodules
+
+	"""
+	from	machine		import	I2C
+	i2c	= I2C( 0 )
+
+	gc.collect()
+	mem		= mem_alloc()
+	start	= ticks_us()
+
+	if mode == "eager":
+		for m in SUBMODULES:
+			__import__( "nxp_periph." + m )
+		
+	from	nxp_periph	import	P3T1755
+
+	imported	= ticks_us()
+	P3T1755( i2c )
+	done		= ticks_us()
+	
+	gc.collect()
+	
+	return	{
+				"import_us"		: ticks_diff( imported, start ),
+				"instance_us"	: ticks_diff( done, imported ),
+				"heap_bytes"	: mem_alloc() - mem,
+				"submodules"	: len( [ m for m in sys.modules if m.startswith( "nxp_periph." ) ] ),
+			}
+
+def main():
+	import	subprocess
+	import	json
+	
+	fmt	= "    {:8} {:>10} {:>12} {:>11} {:>11}"
+	print( "startup of single-device (P3T1755) application" )
+	print( fmt.format( "", "import_us", "instance_us", "heap_bytes", "submodules" ) )
+	
+	for mode in ( "eager", "lazy" ):
+		code	= "import json, startup_benchmark as s; print( json.dumps( s.measure( '{}' ) ) )".format( mode )
+		out		= subprocess.run( [ sys.executable, "-c", code ], capture_output = True, text = True, check = True ).stdout
+		r		= json.loads( out.splitlines()[ -1 ] )
+		print( fmt.format( mode, r[ "import_us" ], r[ "instance_us" ], r[ "heap_bytes" ], r[ "submodules" ] ) )
+
+if __name__ == "__main__":
+	main()
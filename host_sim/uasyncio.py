@@ -0,0 +1,34 @@
+"""
+Host-side stand-in of MicroPython "uasyncio" module
+"""
+
+from	asyncio	import	*
+import	asyncio	as	_asyncio
+
+def sleep_ms( ms ):
+	return _asyncio.sleep( ms / 1000 )
+
+def get_event_loop( runq_len = 0, waitq_len = 0 ):
+	try:
+		return _asyncio.get_running_loop()
+	except RuntimeError:
+		loop	= _asyncio.new_event_loop()
+		_asyncio.set_event_loop( loop )
+		return loop
+
+class ThreadSafeFlag:
+	"""
+	set() can be called from callbacks, wait() clears the flag
+	"""
+	def __init__( self ):
+		self.__event	= Event()
+
+	def set( self ):
+		self.__event.set()
+
+	def clear( self ):
+		self.__event.clear()
+
+	async def wait( self ):
+		await self.__event.wait()
+		self.__event.clear()
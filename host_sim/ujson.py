@@ -0,0 +1,3 @@
+#	Host-side stand-in of MicroPython "ujson" module
+
+from	json	import	*
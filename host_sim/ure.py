@@ -0,0 +1,3 @@
+#	Host-side stand-in of MicroPython "ure" module
+
+from	re	import	*
@@ -0,0 +1,3 @@
+#	Host-side stand-in of MicroPython "ustruct" module
+
+from	struct	import	*
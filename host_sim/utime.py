@@ -0,0 +1,64 @@
+"""
+Host-side stand-in of MicroPython "utime" module
+
+Sleeps don't block by default. Those advance a virtual clock which is
+added to ticks and time. It makes the drivers run fast on host while
+the device models (like EEPROM write cycle) see the time passing.
+Set REAL_SLEEP = True to block really.
+"""
+
+import	time	as	_time
+
+REAL_SLEEP		= False
+TICKS_PERIOD	= 1 << 30
+
+_offset	= 0.0
+
+def _now():
+	return _time.perf_counter() + _offset
+
+def sleep( seconds ):
+	global	_offset
+
+	if REAL_SLEEP:
+		_time.sleep( seconds )
+	else:
+		_offset	+= seconds
+
+def sleep_ms( ms ):
+	sleep( ms / 1000 )
+
+def sleep_us( us ):
+	sleep( us / 1000000 )
+
+def ticks_ms():
+	return int( _now() * 1000 ) % TICKS_PERIOD
+
+def ticks_us():
+	return int( _now() * 1000000 ) % TICKS_PERIOD
+
+ticks_cpu	= ticks_us
+
+def ticks_add( ticks, delta ):
+	return (ticks + delta) % TICKS_PERIOD
+
+def ticks_diff( ticks1, ticks2 ):
+	d	= (ticks1 - ticks2) % TICKS_PERIOD
+	return d - TICKS_PERIOD if (TICKS_PERIOD // 2) <= d else d
+
+def time():
+	return int( _time.time() + _offset )
+
+def time_ns():
+	return _time.time_ns() + int( _offset * 1e9 )
+
+def localtime( secs = None ):
+	t	= _time.localtime( time() if secs is None else secs )
+	return ( t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec, t.tm_wday, t.tm_yday )
+
+def gmtime( secs = None ):
+	t	= _time.gmtime( time() if secs is None else secs )
+	return ( t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec, t.tm_wday, t.tm_yday )
+
+def mktime( t ):
+	return int( _time.mktime( tuple( t[ : 8 ] ) + ( -1, ) ) )
@@ -1,9 +1,40 @@
-from nxp_periph.interface	import	I2C_target, SPI_target
+from nxp_periph.interface	import	I2C_target, SPI_target, register_map
+
+def _pcal_access( names ):
+	"""
+	register access flags for register_map of PCAL devices
+	
+	Input port, interrupt status and input status registers are 
+	read-only. Interrupt clear registers are write-only. 
+	"""
+	ro	= ( "input port", "interrupt status", "input status" )
+	flags	= {}
+
+	for n in names:
+		ln	= n.lower()
+		if any( ln.startswith( p ) for p in ro ):
+			flags[ n ]	= register_map.READ
+		elif ln.startswith( "interrupt clear" ):
+			flags[ n ]	= register_map.WRITE
+	
+	return flags
+
+def _volatile( names ):
+	"""
+	volatile registers for register shadow of GPIO devices
+	
+	Input port, interrupt status, interrupt clear and input status 
+	registers change without host writes. 
+	"""
+	vp	= ( "input port", "interrupt status", "interrupt clear", "input status" )
+
+	return dict.fromkeys( [ n for n in names if any( n.lower().startswith( p ) for p in vp ) ], 0xFF )
 
 class GPIO_base():
 	"""
 	An abstraction class to make user interface.
 	"""
+	_reg_list		= ( None, None )
 
 	def input( self ):
 		"""
@@ -81,7 +112,43 @@ class GPIO_base():
 			self.write_registers( self.__cfg, args[ 0 ] )
 
 	def dump( self ):
-		return	[ self.read_registers( rn, 1 ) for rn in self.REG_NAME  if rn is not "reserved" ]
+		"""
+		dump register values
+	
+		Returns
+		-------
+		list : register data
+			List of integers in order of REG_LIST
+
+		"""
+		rv	= self.dump_all()
+		
+		if rv is None:
+			return None
+		
+		return [ rv[ r[ "idx" ] ] for r in self.REG_LIST ]
+
+	@property
+	def REG_LIST( self ):
+		"""
+		list of register address and name
+		
+		Built from REG_NAME at first access and kept in the class. 
+		Reserved addresses are skipped. 
+
+		Returns
+		-------
+		tuple : dict of "idx" (address) and "name" for each register
+		
+		"""
+		cls	= self.__class__
+		rl	= cls._reg_list
+
+		if rl[ 0 ] is not cls:
+			rl				= ( cls, tuple( { "idx": i, "name": rn } for i, rn in enumerate( cls.REG_NAME ) if rn != "reserved" ) )
+			cls._reg_list	= rl
+		
+		return rl[ 1 ]
 
 	@property
 	def value( self ):
@@ -120,12 +187,15 @@ class PCA9555( GPIO_base, I2C_target ):
 	DEFAULT_ADDR	= 0x40 >> 1
 	N_PORTS			= 2
 	N_BITS			= 16
+	BURST_WRITE		= False		#	register pointer toggles in a port pair only
+	AI_BLOCK		= 2
 	
 	REG_NAME	= ( "Input port 0", "Input port 1",
 					"Output port 0", "Output port 1",
 					"Polarity Inversion port 0", "Polarity Inversion port 1",
 					"Configuration port 0", "Configuration port 1"
 					)
+	REG_VOLATILE	= _volatile( REG_NAME )
 
 	def __init__( self, i2c, address = DEFAULT_ADDR ):
 		"""
@@ -154,12 +224,14 @@ class PCA9554( GPIO_base, I2C_target ):
 	DEFAULT_ADDR	= 0x40 >> 1
 	N_PORTS			= 1
 	N_BITS			= 8
+	BURST_WRITE		= False		#	no auto increment
 	
 	REG_NAME	= ( "Input Port",
 					"Output Port"
 					"Polarity Inversion",
 					"Configuration"
 					)
+	REG_VOLATILE	= _volatile( REG_NAME )
 
 	def __init__( self, i2c, address = DEFAULT_ADDR ):
 		"""			
@@ -179,7 +251,6 @@ class PCA9554( GPIO_base, I2C_target ):
 class PCAL6xxx_base( GPIO_base, I2C_target ):
 	def __init__( self, i2c, address, auto_increment_flag = 0x00 ):
 		I2C_target.__init__( self, i2c, address, auto_increment_flag = auto_increment_flag )
-		self.REG_LIST	= [ { "idx": self.REG_NAME.index( rn ), "name": rn } for rn in self.REG_NAME if rn is not "reserved" ]
 
 	def __setup_EVB( self ):
 		"""
@@ -224,49 +295,12 @@ class PCAL6xxx_base( GPIO_base, I2C_target ):
 	def status( self ):
 		return 	self.read_registers( self.__is, self.__np )
 
-	def dump_reg( self ):
-		rv		= self.dump()
-		
-		for i, name in enumerate( self.REG_NAME ):
-			if name is "reserved":
-				rv.insert( i, 0 )
-		
-		length	= len( rv )
-
-		index	= [ (i // 2) if 0 == i % 2 else (i // 2) + ((length + 1) // 2) for i in range( length ) ]
-		reg		= [ self.REG_NAME[ i ] for i in index ]
-		rv		= [ rv[ i ]            for i in index ]
-		lf		= [ {"end":""} if 0 == i % 2 else {"end":"\n"} for i in range( length ) ]
-
-		ml		= len( max( self.REG_NAME, key = len ) )
-		fmt		= "    {{:{}}}".format( ml )
-		fmt	   += " (0x{:02X}) : 0x{:02X}"
-		
-		print( "register dump: \"{}\", {}".format( self.__class__.__name__, self.dev_access() ) )
-		for i, j, k, l in zip( reg, index, rv, lf ):
-			print( fmt.format( i, j, k ), **l )
-
-		if 1 == length % 2:
-			print( "" )
-
 class PCAL65xx_base( PCAL6xxx_base ):
 	AUTO_INCREMENT	= 0x80
 
 	def __init__( self, i2c, address ):
 		super().__init__( i2c, address, auto_increment_flag = self.AUTO_INCREMENT )
 
-	def dump( self ):
-		"""
-		dump register values
-	
-		Returns
-		-------
-		list : register data
-			List of integers
-
-		"""
-		return self.read_registers( 0, len( self.REG_LIST ) )
-
 class PCAL6408( PCAL6xxx_base ):
 	"""
 	PCAL6408: 8 bit GPIO expander
@@ -276,21 +310,23 @@ class PCAL6408( PCAL6xxx_base ):
 	DEFAULT_ADDR	= (0x40 >> 1) + ADDR_BIT
 	N_PORTS			= 1
 	N_BITS			= 8
+	BURST_WRITE		= False		#	no auto increment
 	
-	REG_NAME_0x00	= [ "Input Port",
+	REG_NAME_0x00	= ( "Input Port",
 						"Output Port",
 						"Polarity Inversion",
 						"Configuration", 
-						]
-	REG_NAME_0x40	= [ "Output drive strength 0", "Output drive strength 1", 
+						)
+	REG_NAME_0x40	= ( "Output drive strength 0", "Output drive strength 1", 
 						"Input latch", 
 						"Pull-up/pull-down enable", 
 						"Pull-up/pull-down selection", 
 						"Interrupt mask", 
 						"Interrupt status", 
 						"Output port configuration", 
-						]
-	REG_NAME	= REG_NAME_0x00 + [ "reserved" ] * (0x40 - len( REG_NAME_0x00 )) + REG_NAME_0x40
+						)
+	REG_NAME	= register_map( { 0x00: REG_NAME_0x00, 0x40: REG_NAME_0x40 }, access = _pcal_access( REG_NAME_0x00 + REG_NAME_0x40 ) )
+	REG_VOLATILE	= _volatile( REG_NAME_0x00 + REG_NAME_0x40 )
 
 
 	def __init__( self, i2c, address = DEFAULT_ADDR, setup_EVB = False ):
@@ -325,13 +361,15 @@ class PCAL6416( PCAL6xxx_base ):
 	DEFAULT_ADDR	= (0x40 >> 1) + ADDR_BIT
 	N_PORTS			= 2
 	N_BITS			= 16
+	BURST_WRITE		= False		#	register pointer toggles in a port pair only
+	AI_BLOCK		= 2
 	
-	REG_NAME_0x00	= [ "Input Port 0", "Input Port 1",
+	REG_NAME_0x00	= ( "Input Port 0", "Input Port 1",
 						"Output Port 0", "Output Port 1", 
 						"Polarity Inversion port 0", "Polarity Inversion port 1", 
 						"Configuration port 0", "Configuration port 1", 
-						]
-	REG_NAME_0x40	= [ "Output drive strength register 0", "Output drive strength register 0B", 
+						)
+	REG_NAME_0x40	= ( "Output drive strength register 0", "Output drive strength register 0B", 
 						"Output drive strength register 1", "Output drive strength register 1B", 
 						"Input latch register 0", 
 						"Input latch register 1", 
@@ -344,8 +382,9 @@ class PCAL6416( PCAL6xxx_base ):
 						"Interrupt status register 0", 
 						"Interrupt status register 1", 
 						"Output port configuration register", 
-						]
-	REG_NAME	= REG_NAME_0x00 + [ "reserved" ] * (0x40 - len( REG_NAME_0x00 )) + REG_NAME_0x40
+						)
+	REG_NAME	= register_map( { 0x00: REG_NAME_0x00, 0x40: REG_NAME_0x40 }, access = _pcal_access( REG_NAME_0x00 + REG_NAME_0x40 ) )
+	REG_VOLATILE	= _volatile( REG_NAME_0x00 + REG_NAME_0x40 )
 
 	def __init__( self, i2c, address = DEFAULT_ADDR, setup_EVB = False ):
 		"""
@@ -380,12 +419,12 @@ class PCAL6524( PCAL65xx_base ):
 	N_PORTS			= 3
 	N_BITS			= 24
 	
-	REG_NAME_0x00	= [ "Input Port 0", "Input Port 1", "Input Port 2", "reserved", 
+	REG_NAME_0x00	= ( "Input Port 0", "Input Port 1", "Input Port 2", "reserved", 
 						"Output Port 0", "Output Port 1", "Output Port 2", "reserved", 
 						"Polarity Inversion port 0",  "Polarity Inversion port 1", "Polarity Inversion port 2", "reserved", 
 						"Configuration port 0", "Configuration port 1", "Configuration port 2",
-						]
-	REG_NAME_0x40	= [ "Output drive strength register port 0A", "Output drive strength register port 0B", 
+						)
+	REG_NAME_0x40	= ( "Output drive strength register port 0A", "Output drive strength register port 0B", 
 						"Output drive strength register port 1A", "Output drive strength register port 1B", 
 						"Output drive strength register port 2A", "Output drive strength register port 2B", 
 						"reserved", "reserved", 
@@ -432,8 +471,9 @@ class PCAL6524( PCAL65xx_base ):
 						"Switch debounce enable 0", 
 						"Switch debounce enable 1", 
 						"Switch debounce count"
-						]
-	REG_NAME	= REG_NAME_0x00 + [ "reserved" ] * (0x40 - len( REG_NAME_0x00 )) + REG_NAME_0x40
+						)
+	REG_NAME	= register_map( { 0x00: REG_NAME_0x00, 0x40: REG_NAME_0x40 }, access = _pcal_access( REG_NAME_0x00 + REG_NAME_0x40 ) )
+	REG_VOLATILE	= _volatile( REG_NAME_0x00 + REG_NAME_0x40 )
 
 	def __init__( self, i2c, address = DEFAULT_ADDR, setup_EVB = False ):
 		"""
@@ -482,12 +522,12 @@ class PCAL6534( PCAL65xx_base ):
 	N_PORTS			= 5
 	N_BITS			= 34
 
-	REG_NAME_0x00	= [ "Input Port 0", "Input Port 1", "Input Port 2", "Input Port 3", "Input Port 4",
+	REG_NAME_0x00	= ( "Input Port 0", "Input Port 1", "Input Port 2", "Input Port 3", "Input Port 4",
 						"Output Port 0", "Output Port 1", "Output Port 2", "Output Port 3", "Output Port 4",
 						"Polarity Inversion port 0",  "Polarity Inversion port 1", "Polarity Inversion port 2", "Polarity Inversion port 3", "Polarity Inversion port 4",
 						"Configuration port 0", "Configuration port 1", "Configuration port 2", "Configuration port 3", "Configuration port 4", 
-						]
-	REG_NAME_0x30	= [ "Output drive strength register port 0A", "Output drive strength register port 0B", 
+						)
+	REG_NAME_0x30	= ( "Output drive strength register port 0A", "Output drive strength register port 0B", 
 						"Output drive strength register port 1A", "Output drive strength register port 1B", 
 						"Output drive strength register port 2A", "Output drive strength register port 2B", 
 						"Output drive strength register port 3A", "Output drive strength register port 3B", 
@@ -546,8 +586,9 @@ class PCAL6534( PCAL65xx_base ):
 						"Switch debounce enable 0", 
 						"Switch debounce enable 1", 
 						"Switch debounce count"
-						]
-	REG_NAME	= REG_NAME_0x00 + [ "reserved" ] * (0x30 - len( REG_NAME_0x00 )) + REG_NAME_0x30
+						)
+	REG_NAME	= register_map( { 0x00: REG_NAME_0x00, 0x30: REG_NAME_0x30 }, access = _pcal_access( REG_NAME_0x00 + REG_NAME_0x30 ) )
+	REG_VOLATILE	= _volatile( REG_NAME_0x00 + REG_NAME_0x30 )
 
 	def __init__( self, i2c, address = DEFAULT_ADDR, setup_EVB = False ):
 		"""
@@ -588,7 +629,6 @@ class PCAL6534( PCAL65xx_base ):
 class PCAL97xx_base( GPIO_base, SPI_target ):
 	def __init__( self, spi, cs, *, address = 0x20 ):
 		SPI_target.__init__( self, spi, cs )
-		self.REG_LIST	= [ { "idx": self.REG_NAME.index( rn ), "name": rn } for rn in self.REG_NAME if rn is not "reserved" ]
 		self.address	= address
 		
 	def __setup_EVB( self ):
@@ -649,12 +689,13 @@ class PCAL97xx_base( GPIO_base, SPI_target ):
 		"""
 		#print( "SPI write_registers: {}, {}".format( reg, data ) )
 		
-		reg		= self.REG_NAME.index( reg ) if type( reg ) != int else reg
+		reg		= self.reg_addr( reg )
 		
 		if type( data ) == int:
 			data	= [ data ]
 		
-		self.send( [ self.address << 1, reg | 0x80 ] + data )
+		self.send( [ self.address << 1, reg | 0x80 ] + data, reg )
+		self.shadow_update( reg, data )
 		
 	def read_registers( self, reg, length ):
 		"""
@@ -670,9 +711,9 @@ class PCAL97xx_base( GPIO_base, SPI_target ):
 		"""
 		#print( "SPI read_registers: {}, {}".format( reg, length ) )
 		
-		reg		 = self.REG_NAME.index( reg ) if type( reg ) != int else reg
+		reg		 = self.reg_addr( reg )
 
-		r	= self.receive( [self.address << 1 | 0x1, reg | 0x80 ] + [ 0x00 ] * length )
+		r	= self.receive( [self.address << 1 | 0x1, reg | 0x80 ] + [ 0x00 ] * length, reg )
 
 		return r[ 2 ] if 1 == length else r[ 2: ]
 
@@ -686,12 +727,12 @@ class PCAL9722( PCAL97xx_base ):
 	N_PORTS			= 3
 	N_BITS			= 22
 	
-	REG_NAME_0x00	= [ "Input Port 0", "Input Port 1", "Input Port 2", "reserved", 
+	REG_NAME_0x00	= ( "Input Port 0", "Input Port 1", "Input Port 2", "reserved", 
 						"Output Port 0", "Output Port 1", "Output Port 2", "reserved", 
 						"Polarity Inversion port 0",  "Polarity Inversion port 1", "Polarity Inversion port 2", "reserved", 
 						"Configuration port 0", "Configuration port 1", "Configuration port 2",
-						]
-	REG_NAME_0x40	= [ "Output drive strength register port 0A", "Output drive strength register port 0B", 
+						)
+	REG_NAME_0x40	= ( "Output drive strength register port 0A", "Output drive strength register port 0B", 
 						"Output drive strength register port 1A", "Output drive strength register port 1B", 
 						"Output drive strength register port 2A", "Output drive strength register port 2B", 
 						"reserved", "reserved", 
@@ -738,8 +779,9 @@ class PCAL9722( PCAL97xx_base ):
 						"Switch debounce enable 0", 
 						"Switch debounce enable 1", 
 						"Switch debounce count"
-						]
-	REG_NAME	= REG_NAME_0x00 + [ "reserved" ] * (0x40 - len( REG_NAME_0x00 )) + REG_NAME_0x40
+						)
+	REG_NAME	= register_map( { 0x00: REG_NAME_0x00, 0x40: REG_NAME_0x40 }, access = _pcal_access( REG_NAME_0x00 + REG_NAME_0x40 ) )
+	REG_VOLATILE	= _volatile( REG_NAME_0x00 + REG_NAME_0x40 )
 
 	def __init__( self, spi, cs = None, *, address = DEFAULT_ADDR, setup_EVB = False ):
 		"""
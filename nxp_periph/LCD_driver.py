@@ -24,6 +24,7 @@ class PCA8561( I2C_target ):
 					"COM3_15_08",
 					"COM3_17_16"
 					]
+	REG_VOLATILE	= { "Software_reset": 0xFF }
 
 	def __init__( self, i2c, address = DEFAULT_ADDR ):
 		"""
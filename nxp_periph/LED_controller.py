@@ -417,6 +417,8 @@ class PCA995xB_base( LED_controller_base, I2C_target ):
 	AUTO_INCREMENT		= 0x80
 	PWM_INIT			= 0x00
 	IREF_INIT			= 0x10
+	AI_END				= "PWMALL"		#	registers from PWMALL are read one by one
+	WRITE_ONLY			= ( "PWMALL", "IREFALL" )
 
 	def __init__( self, i2c, address = DEFAULT_ADDR, pwm = PWM_INIT, iref = IREF_INIT, current_control = False, setup_EVB = False ):
 		"""
@@ -441,8 +443,8 @@ class PCA995xB_base( LED_controller_base, I2C_target ):
 		if setup_EVB:
 			self.__setup_EVB()
 			
-		self.__pwm_base		= self.REG_NAME.index( "IREF0" if current_control else "PWM0"  )
-		self.__iref_base	= self.REG_NAME.index( "PWM0"  if current_control else "IREF0" )
+		self.__pwm_base		= self.reg_addr( "IREF0" if current_control else "PWM0"  )
+		self.__iref_base	= self.reg_addr( "PWM0"  if current_control else "IREF0" )
 		
 		init	=	{
 						"LEDOUT0": [ 0xAA ] * (self.CHANNELS // 4),
@@ -450,8 +452,9 @@ class PCA995xB_base( LED_controller_base, I2C_target ):
 						"IREFALL": iref
 					}
 					
-		for r, v in init.items():	#	don't care: register access order
-			self.write_registers( r, v )
+		with self.batch():			#	don't care: register access order
+			for r, v in init.items():
+				self.write_registers( r, v )
 
 	def __setup_EVB( self ):
 		"""
@@ -475,15 +478,6 @@ class PCA995xB_base( LED_controller_base, I2C_target ):
 		"""
 		self.pwm( *args, alt = True )
 
-	def dump( self ):
-		data	= super().dump()
-		start	= self.REG_NAME.index( "PWMALL" )
-
-		for i in range( start, len( self.REG_NAME ) ):
-			data[ i ]	= self.read_registers( i, 1 )
-			
-		return data
-
 class PCA9955B( PCA995xB_base, gradation_control ):
 	"""
 	PCA9955B class
@@ -531,6 +525,8 @@ class PCA9955B( PCA995xB_base, gradation_control ):
 							"PWMALL", "IREFALL",
 							"EFLAG0", "EFLAG1", "EFLAG2", "EFLAG3"
 						)
+	REG_VOLATILE	= dict.fromkeys( ( "GRAD_CNTL", "EFLAG0", "EFLAG1", "EFLAG2", "EFLAG3" ), 0xFF )
+	REG_VOLATILE[ "MODE2" ]	= 0xD0	#	OVERTEMP, ERROR and CLRERR bits
 						
 	def __gradation_groups( self, list ):
 		bn	= 0
@@ -587,6 +583,8 @@ class PCA9956B( PCA995xB_base ):
 							"PWMALL", "IREFALL",
 							"EFLAG0", "EFLAG1", "EFLAG2", "EFLAG3", "EFLAG4", "EFLAG5"
 						)
+	REG_VOLATILE	= dict.fromkeys( ( "EFLAG0", "EFLAG1", "EFLAG2", "EFLAG3", "EFLAG4", "EFLAG5" ), 0xFF )
+	REG_VOLATILE[ "MODE2" ]	= 0xD0	#	OVERTEMP, ERROR and CLRERR bits
 
 class PCA96xx_base( LED_controller_base, I2C_target ):
 	"""
@@ -613,7 +611,7 @@ class PCA96xx_base( LED_controller_base, I2C_target ):
 		I2C_target.__init__( self, i2c, address, auto_increment_flag = self.AUTO_INCREMENT )
 		LED_controller_base.__init__( self, init_val = pwm )
 		
-		self.__pwm_base	= self.REG_NAME.index( "PWM0" )
+		self.__pwm_base	= self.reg_addr( "PWM0" )
 		
 
 
@@ -662,8 +660,9 @@ class PCA9632( PCA96xx_base ):
 						"PWM0": [ pwm ] * self.CHANNELS
 					}
 					
-		for r, v in init.items():	#	don't care: register access order
-			self.write_registers( r, v )
+		with self.batch():			#	don't care: register access order
+			for r, v in init.items():
+				self.write_registers( r, v )
 
 
 class PCA9957_base( LED_controller_base, gradation_control, SPI_target ):
@@ -673,6 +672,9 @@ class PCA9957_base( LED_controller_base, gradation_control, SPI_target ):
 	PWM_INIT			= 0x00
 	IREF_INIT			= 0x10
 
+	BURST_WRITE			= False		#	no auto increment on PCA9957
+	WRITE_ONLY			= ( "PWMALL", "IREFALL" )
+
 	def __init__( self, spi, cs = None, pwm = PWM_INIT, iref = IREF_INIT, current_control = False, setup_EVB = False ):
 		"""
 		PCA9957_base initializer
@@ -698,8 +700,8 @@ class PCA9957_base( LED_controller_base, gradation_control, SPI_target ):
 			
 		LED_controller_base.__init__( self, init_val = iref if current_control else pwm )
 
-		self.__pwm_base		= self.REG_NAME.index( "IREF0" if current_control else "PWM0" )
-		self.__iref_base	= self.REG_NAME.index( "PWM0"  if current_control else "IREF0" )
+		self.__pwm_base		= self.reg_addr( "IREF0" if current_control else "PWM0" )
+		self.__iref_base	= self.reg_addr( "PWM0"  if current_control else "IREF0" )
 
 		init	=	{
 						"MODE2"		: 0x18,		#	to forth output channels working when error happened
@@ -708,8 +710,9 @@ class PCA9957_base( LED_controller_base, gradation_control, SPI_target ):
 						"IREFALL"	: iref
 					}
 					
-		for r, v in init.items():	#	don't care: register access order
-			self.write_registers( r, v )
+		with self.batch():			#	don't care: register access order
+			for r, v in init.items():
+				self.write_registers( r, v )
 
 	def iref( self, *args ):
 		"""
@@ -738,11 +741,13 @@ class PCA9957_base( LED_controller_base, gradation_control, SPI_target ):
 		
 		data		= [ data ] if type(data) == int else data
 
-		reg			= self.REG_NAME.index( reg ) if type( reg ) != int else reg
+		reg			= self.reg_addr( reg )
 		reg_list	= [ i << 1 for i in range( reg, reg + len( data ) ) ]
 
-		for r, v in zip( reg_list, data ):
-			self.send( [ r, v ] )
+		for i, ( r, v ) in enumerate( zip( reg_list, data ) ):
+			self.send( [ r, v ], reg + i )
+
+		self.shadow_update( reg, data )
 			
 	def read_registers( self, reg, length ):
 		"""
@@ -761,13 +766,13 @@ class PCA9957_base( LED_controller_base, gradation_control, SPI_target ):
 			generated between write and read transactions.
 		"""
 		data		= [ 0xFF ] * length
-		reg			= self.REG_NAME.index( reg ) if type( reg ) != int else reg
+		reg			= self.reg_addr( reg )
 		reg_list	= [ (i << 1) | 0x01 for i in range( reg, reg + len( data ) ) ]
 
 		pairs	= []
-		for r, v in zip( reg_list, data ):
-			self.send( [ r, v ] )
-			pairs	+= [self.receive( [ 0xFF, 0xFF ] )]
+		for i, ( r, v ) in enumerate( zip( reg_list, data ) ):
+			self.send( [ r, v ], reg + i )
+			pairs	+= [self.receive( [ 0xFF, 0xFF ], reg + i )]
 		
 		rtn	= []
 		for p in pairs:
@@ -844,6 +849,8 @@ class PCA9957( PCA9957_base ):
 							"OFFSET",
 							"PWMALL", "IREFALL"
 						)
+	REG_VOLATILE	= dict.fromkeys( ( "GRAD_CNTL0", "GRAD_CNTL1", "EFLAG0", "EFLAG1", "EFLAG2", "EFLAG3", "EFLAG4", "EFLAG5" ), 0xFF )
+	REG_VOLATILE[ "MODE2" ]	= 0xD0	#	OVERTEMP, ERROR and CLRERR bits
 
 	def __gradation_groups( self, list ):
 		bn	= 0
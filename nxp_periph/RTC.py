@@ -102,6 +102,7 @@ class RTC_base():
 		and date&time is set to ( 2015, 1, 1, 0, 0, 0, 0, None )
 		"""
 		self.__software_reset()
+		self.shadow_invalidate()
 		self.init( self.DEINIT_VAL )
 
 	def alarm_int( self, pin_select, **kwargs ):
@@ -423,6 +424,18 @@ class PCF2131_base( RTC_base ):
 							"INT_A_MASK1", "INT_A_MASK2", "INT_B_MASK1", "INT_B_MASK2",
 							"Watchdg_tim_ctl", "Watchdg_tim_val"
 						)
+	REG_VOLATILE	= dict.fromkeys( (
+							"SR_Reset", "100th_Seconds", "Seconds", "Minutes", "Hours", "Days", "Weekdays", "Months", "Years",
+							"Timestp_ctl1", "Sec_timestp1", "Min_timestp1", "Hour_timestp1", "Day_timestp1", "Mon_timestp1", "Year_timestp1",
+							"Timestp_ctl2", "Sec_timestp2", "Min_timestp2", "Hour_timestp2", "Day_timestp2", "Mon_timestp2", "Year_timestp2",
+							"Timestp_ctl3", "Sec_timestp3", "Min_timestp3", "Hour_timestp3", "Day_timestp3", "Mon_timestp3", "Year_timestp3",
+							"Timestp_ctl4", "Sec_timestp4", "Min_timestp4", "Hour_timestp4", "Day_timestp4", "Mon_timestp4", "Year_timestp4",
+							"Control_2", "Control_3", "Control_4", "Watchdg_tim_val"
+						), 0xFF )
+	REG_VOLATILE[ "Timestp_ctl1" ]	= 0x1F	#	subsecond timestamps
+	REG_VOLATILE[ "Timestp_ctl2" ]	= 0x1F
+	REG_VOLATILE[ "Timestp_ctl3" ]	= 0x1F
+	REG_VOLATILE[ "Timestp_ctl4" ]	= 0x1F
 	INT_MASK		= { "A": ["INT_A_MASK1", "INT_A_MASK2"], "B": [ "INT_B_MASK1", "INT_B_MASK2" ] }
 	REG_ORDER_DT	= ( "subseconds", "seconds", "minutes", "hours", "day", "weekday", "month", "year" )
 	REG_ORDER_ALRM	= ( "seconds", "minutes", "hours", "day", "weekday" )
@@ -502,7 +515,7 @@ class PCF2131_base( RTC_base ):
 	def __set_timestamp_interrupt( self, int_pin, num, last_event ):
 		num		-= 1
 		r_ofst	 = 7
-		r	= self.REG_NAME.index( "Timestp_ctl1" ) + (num * r_ofst)
+		r	= self.reg_addr( "Timestp_ctl1" ) + (num * r_ofst)
 		v	= 0x00 if last_event else 0x80
 		
 		self.bit_operation( r, 0x80, v )
@@ -517,7 +530,7 @@ class PCF2131_base( RTC_base ):
 		num		-= 1
 		r_ofst	 = 7
 		length	= len( self.REG_ORDER_TS )
-		r	= self.REG_NAME.index( "Timestp_ctl1" ) + (num * r_ofst)
+		r	= self.reg_addr( "Timestp_ctl1" ) + (num * r_ofst)
 
 		data	= self.read_registers( r, length )
 		
@@ -536,7 +549,7 @@ class PCF2131_base( RTC_base ):
 		return dt
 
 	def __interrupt_clear( self ):
-		r	= self.REG_NAME.index( "Control_2" )
+		r	= self.reg_addr( "Control_2" )
 		rv	= self.read_registers( "Control_2", 3 )
 		
 		if rv[ 0 ] & 0x90:	# if interrupt flag set in Control_2
@@ -658,6 +671,8 @@ class PCF85063A( RTC_base, I2C_target ):
 						"Second_alarm", "Minute_alarm", "Hour_alarm", "Day_alarm", "Weekday_alarm",
 						"Timer_value", "Timer_mode"
 						)
+	REG_VOLATILE	= dict.fromkeys( ( "Seconds", "Minutes", "Hours", "Days", "Weekdays", "Months", "Years", "Control_2", "Timer_value" ), 0xFF )
+	REG_VOLATILE[ "Control_1" ]	= 0x10	#	SR (software reset) bit
 	INT_MASK		= { "A": ["INT_A_MASK1", "INT_A_MASK2"], "B": [ "INT_B_MASK1", "INT_B_MASK2" ] }
 	REG_ORDER_DT	= ( "seconds", "minutes", "hours", "day", "weekday", "month", "year" )
 	REG_ORDER_ALRM	= ( "seconds", "minutes", "hours", "day", "weekday" )
@@ -776,6 +791,8 @@ class PCF85063TP( PCF85063A ):
 						"RAM_byte",
 						"Seconds", "Minutes", "Hours", "Days", "Weekdays", "Months", "Years"
 						)
+	REG_VOLATILE	= dict.fromkeys( ( "Seconds", "Minutes", "Hours", "Days", "Weekdays", "Months", "Years", "Control_2" ), 0xFF )
+	REG_VOLATILE[ "Control_1" ]	= 0x10	#	SR (software reset) bit
 	
 	def __init__( self, i2c, address = DEFAULT_ADDR ):
 		"""
@@ -830,6 +847,13 @@ class PCF86263A( RTC_base, I2C_target ):
 							"Pin_IO", "Function", "INTA_enable", "INTB_enable", "Flags", 
 							"RAM_byte", "WatchDog", "Stop_enable", "Resets"
 						)
+	REG_VOLATILE	= dict.fromkeys( (
+							"100th_Seconds", "Seconds", "Minutes", "Hours", "Days", "Weekdays", "Months", "Years",
+							"TSR1_seconds", "TSR1_minutes", "TSR1_hours", "TSR1_days", "TSR1_months", "TSR1_years",
+							"TSR2_seconds", "TSR2_minutes", "TSR2_hours", "TSR2_days", "TSR2_months", "TSR2_years",
+							"TSR3_seconds", "TSR3_minutes", "TSR3_hours", "TSR3_days", "TSR3_months", "TSR3_years",
+							"Flags", "WatchDog", "Resets"
+						), 0xFF )
 	INT_MASK		= { "A": ["INTA_enable"], "B": [ "INTB_enable" ] }
 	REG_ORDER_DT	= ( "subseconds", "seconds", "minutes", "hours", "day", "weekday", "month", "year" )
 	#REG_ORDER_ALRM1	= ( "seconds", "minutes", "hours", "day", "month" )
@@ -964,7 +988,7 @@ class PCF86263A( RTC_base, I2C_target ):
 		num		-= 1
 		r_ofst	 = 6
 		length	= len( self.REG_ORDER_TS )
-		r	= self.REG_NAME.index( "TSR1_seconds" ) + (num * r_ofst)
+		r	= self.reg_addr( "TSR1_seconds" ) + (num * r_ofst)
 
 		data	= self.read_registers( r, length )
 		
@@ -1029,6 +1053,8 @@ class PCF85053A( RTC_base, I2C_target ):
 						"Sec_timestp", "Min_timestp", "Hour_timestp", "DayWk_timestp", "DayMon_timestp", "Mon_timestp", "Year_timestp", 
 						"R_code1", "R_code2"
 						)
+	REG_VOLATILE	= dict.fromkeys( ( "Seconds", "Minutes", "Hours", "Day_of_the_Week", "Day_of_the_Month", "Month", "Year", "Status_Register",
+							"Sec_timestp", "Min_timestp", "Hour_timestp", "DayWk_timestp", "DayMon_timestp", "Mon_timestp", "Year_timestp" ), 0xFF )
 	INT_MASK		= { "A": ["INT_A_MASK1", "INT_A_MASK2"], "B": [ "INT_B_MASK1", "INT_B_MASK2" ] }
 	REG_ORDER_DT	= { "seconds": 	"Seconds", 
 						"minutes":	"Minutes", 
@@ -1066,7 +1092,7 @@ class PCF85053A( RTC_base, I2C_target ):
 		data	= self.read_registers( "Seconds", length )
 
 		for k, v in self.REG_ORDER_DT.items():
-			dt[ k ]	= RTC_base.bcd2bin( data[ self.REG_NAME.index( v ) ] )
+			dt[ k ]	= RTC_base.bcd2bin( data[ self.reg_addr( v ) ] )
 
 		dt[ "year" ]		+= 2000	#	PCF2131 can only store lower 2 digit of year
 		dt[ "subseconds" ]	 = 0	#	dummy
@@ -1082,7 +1108,7 @@ class PCF85053A( RTC_base, I2C_target ):
 		dt[ "subseconds" ]	 = 0	#	dummy
 
 		for k, v in self.REG_ORDER_DT.items():
-			data[ self.REG_NAME.index( v ) ]	= dt[ k ]
+			data[ self.reg_addr( v ) ]	= dt[ k ]
 
 		data	= list( map( RTC_base.bin2bcd, data ) )
 
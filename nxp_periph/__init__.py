@@ -1,13 +1,64 @@
-from	nxp_periph.RTC				import	*
-from	nxp_periph.temp_sensor		import	*
-from	nxp_periph.LED_controller	import	*
-from	nxp_periph.GPIO				import	*
-from	nxp_periph.stepper_motor	import	*
-from	nxp_periph.interface		import	*
-from	nxp_periph.protocol_bridge	import	*
-from	nxp_periph.LCD_driver		import	*
-from	nxp_periph.accelerometer	import	*
-from	nxp_periph.afe				import	*
-from	nxp_periph.MikanUtil		import	*
-from	nxp_periph.ard_brd_dev		import	*
-from	nxp_periph.bus_mux_switch	import	*
+"""
+nxp_periph: MicroPython drivers for NXP peripheral devices
+
+Submodules are loaded on first access to a name in them. An application 
+which uses only "P3T1755" loads only "temp_sensor" and "interface". 
+Names are same as those were given by star-importing all submodules. 
+"""
+
+import	sys
+
+#	names given by each submodule
+_SUBMODULES	= {
+				"RTC"				: ( "RTC_base", "PCF2131_base", "PCF2131_I2C", "PCF2131_SPI", "PCF2131", "PCF85063A", "PCF85063TP", "PCF86263A", "PCF85053A", ),
+				"temp_sensor"		: ( "temp_sensor_base", "LM75B", "PCT2075", "P3T1755", "P3T1085", "P3T1035", "P3T2030", ),
+				"LED_controller"	: ( "LED", "LED_controller_base", "gradation_control", "PCA995xB_base", "PCA9955B", "PCA9956B", "PCA96xx_base", "PCA9632", "PCA9957_base", "PCA9957", ),
+				"GPIO"				: ( "GPIO_base", "PCA9555", "PCA9554", "PCAL6xxx_base", "PCAL65xx_base", "PCAL6408", "PCAL6416", "PCAL6524", "PCAL6534", "PCAL97xx_base", "PCAL9722", ),
+				"stepper_motor"		: ( "StepperMotor_base", "PCA9629A", ),
+				"interface"			: ( "Interface", "register_map", "register_fields", "register_batch", "I2C_target_Error", "retry_policy", "I2C_target", "SPI_target", "abstract_target", ),
+				"protocol_bridge"	: ( "SC16IS7xx_base", "SC16IS7xx_I2C", "SC16IS7xx_SPI", "SC16IS7xx", "SC18IS606", "SC18IS606_Error", ),
+				"LCD_driver"		: ( "PCA8561", ),
+				"accelerometer"		: ( "ACCELEROMETER_base", "FXOS8700", "FXLS8974", ),
+				"afe"				: ( "WAIT", "CWAIT", "AFE_base", "NAFE13388", ),
+				"MikanUtil"			: ( "MikanUtil", "BusInOut", ),
+				"ard_brd_dev"		: ( "EEPROM_base", "EEPROM_Error", "M24C02", "Potentiometer_base", "AD5161_I2C", "AD5161_SPI", "AD5161", ),
+				"bus_mux_switch"	: ( "BusMuxSwitch_base", "PCA9846", ),
+				"sampler"			: ( "ring_buffer", "sample_log", "sampler_channel", "Sampler", ),
+				"pipeline"			: ( "stream", ),
+				"bus_access"		: ( "bus_owner_Error", "bus_owner", ),
+				"bus_trace"			: ( "bus_tracer", ),
+				"bus_record"		: ( "bus_recorder", "bus_replayer_Error", "bus_replayer", ),
+				"device_group"		: ( "DeviceGroup", ),
+				"bus_scan"			: ( "bus_scanner", "scan_all", "i2c_fullscan", ),
+				"bus_tune"			: ( "bus_tuner", ),
+				"discovery"			: ( "device_discovery", ),
+				"snapshot"			: ( "snapshot_all", "restore_all", ),
+				}
+
+__all__	= [ n for names in _SUBMODULES.values() for n in names ]
+
+def __getattr__( name ):
+	"""
+	load the submodule which has the name
+	
+	Names of all loaded submodules are bound in this package after 
+	loading. Following accesses to those don't come here. 
+	"""
+	for module, names in _SUBMODULES.items():
+		if name in names:
+			break
+	else:
+		raise AttributeError( "module 'nxp_periph' has no attribute '{}'".format( name ) )
+
+	__import__( "nxp_periph." + module )
+	
+	g	= globals()
+	
+	for module, names in _SUBMODULES.items():
+		m	= sys.modules.get( "nxp_periph." + module )
+
+		if m:	#	including submodules loaded by other submodules
+			for n in names:
+				g[ n ]	= getattr( m, n )
+
+	return g[ name ]
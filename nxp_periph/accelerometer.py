@@ -35,6 +35,25 @@ class ACCELEROMETER_base:
 
 		return self.__xyz()
 
+	def stream( self, interval_ms = 0, count = None ):
+		"""
+		3-axis "g" data stream
+		
+		Parameters
+		----------
+		interval_ms : int, option
+			Read interval (see nxp_periph.pipeline.stream)
+		count : int, option
+			Number of reads. Endless if not given
+
+		Returns
+		-------
+		stream : stream of 3 "g" values
+
+		"""
+		from nxp_periph.pipeline	import	stream
+		return stream( self.__xyz, interval_ms, count )
+
 	def fullscale( self, g ):
 		"""
 		Fullscale setting
@@ -46,16 +65,6 @@ class ACCELEROMETER_base:
 		"""
 		self.__fullscale( g )
 
-	def dump( self ):
-		"""
-		Overriding "dump()" in nxp_periph.interface class
-		"""
-		rtn	= []
-		for r in self.REG_NAME:
-			rtn	+= [ self.read_registers( r, 1 ) ]
-		
-		return rtn
-
 class FXOS8700( ACCELEROMETER_base,I2C_target ):
 	"""
 	FXOS8700: 6-axis accerelometer and magnetometer
@@ -65,6 +74,7 @@ class FXOS8700( ACCELEROMETER_base,I2C_target ):
 	
 	"""
 	DEFAULT_ADDR		= 0x1F
+	DUMP_SPLIT			= ( 0x07, )		#	hybrid auto-increment goes from OUT_Z_LSB to M_OUT_X_MSB
 
 	REG_NAME	= ( "STATUS", 
 					"OUT_X_MSB", "OUT_X_LSB", "OUT_Y_MSB", "OUT_Y_LSB", "OUT_Z_MSB", "OUT_Z_LSB", 
@@ -93,6 +103,22 @@ class FXOS8700( ACCELEROMETER_base,I2C_target ):
 					"M_VECM_CNT", "M_VECM_INITX_MSB", "M_VECM_INITX_LSB", "M_VECM_INITY_MSB", "M_VECM_INITY_LSB", "M_VECM_INITZ_MSB", "M_VECM_INITZ_LSB", "A_FFMT_THS_X_MSB", "A_FFMT_THS_X_LSB", "A_FFMT_THS_Y_MSB", "A_FFMT_THS_Y_LSB", "A_FFMT_THS_Z_MSB", "A_FFMT_THS_Z_LSB", 
 					"Reserved"
 					)
+	REG_VOLATILE	= dict.fromkeys( REG_NAME[ 0 : 7 ] + REG_NAME[ 0x32 : 0x3F ] + REG_NAME[ 0x45 : 0x52 ] + 
+									( "SYSMOD", "INT_SOURCE", "PL_STATUS", "A_FFMT_SRC", "TRANSIENT_SRC", "PULSE_SRC", "M_THS_SRC", "M_INT_SRC" ), 0xFF )
+	REG_VOLATILE[ "CTRL_REG2" ]		= 0x40	#	RST bit
+	REG_VOLATILE[ "M_CTRL_REG2" ]	= 0x40	#	M_RST bit
+	SNAPSHOT_LAST	= ( "CTRL_REG1", )	#	ACTIVE bit. other registers are written in standby
+	BATCH_ORDERED	= True				#	same for batched writes
+
+	FIELDS		= {	"ACTIVE"		: ( "CTRL_REG1", 0, 1 ),
+					"F_READ"		: ( "CTRL_REG1", 1, 1 ),
+					"LNOISE"		: ( "CTRL_REG1", 2, 1 ),
+					"DR"			: ( "CTRL_REG1", 3, 3 ),
+					"FS"			: ( "XYZ_DATA_CFG", 0, 2, { 2: 0, 4: 1, 8: 2 } ),
+					"HPF_OUT"		: ( "XYZ_DATA_CFG", 4, 1 ),
+					"M_HMS"			: ( "M_CTRL_REG1", 0, 2 ),
+					"HYB_AUTOINC"	: ( "M_CTRL_REG2", 5, 1 ),
+					}
 
 	def __init__( self, i2c, address = DEFAULT_ADDR ):
 		"""
@@ -106,14 +132,15 @@ class FXOS8700( ACCELEROMETER_base,I2C_target ):
 		"""
 		super().__init__( i2c, address )
 		
-		self.write_registers( "F_SETUP",     0x00 )	# FIFO is disabled
-		self.write_registers( "CTRL_REG1",   0x01 )	# active
-		self.write_registers( "M_CTRL_REG1", 0x03 )	# hybrid mode, both accelerometer and magnetometer sensors are active
-		self.write_registers( "M_CTRL_REG2", 0x20 )	# can be read xyz and mag together in 12 bytes
-
 		self.fs_range	= 2
 		self.fullscale( self.fs_range )
 
+		with self.batch():	#	BATCH_ORDERED: settings are written in standby, CTRL_REG1 (active) at last
+			self.write_registers( "F_SETUP",     0x00 )	# FIFO is disabled
+			self.write_registers( "M_CTRL_REG1", 0x03 )	# hybrid mode, both accelerometer and magnetometer sensors are active
+			self.write_registers( "M_CTRL_REG2", 0x20 )	# can be read xyz and mag together in 12 bytes
+			self.write_registers( "CTRL_REG1",   0x01 )	# active
+
 	def __three_axis( self, reg ):
 		return unpack( ">hhh", self.read_registers( reg, 6, barray = True ) )
 	
@@ -122,13 +149,13 @@ class FXOS8700( ACCELEROMETER_base,I2C_target ):
 
 	def __fullscale( self, v ):
 		if 8 <= v:
-			setting	= 0x2
+			setting	= 8
 		elif 4 <= v:
-			setting	= 0x1
+			setting	= 4
 		else:
-			setting	= 0x0
+			setting	= 2
 		
-		self.bit_operation( "XYZ_DATA_CFG", 0x03, setting )
+		self.fields.update( FS = setting )
 
 	def mag( self ):
 		"""
@@ -191,6 +218,15 @@ class FXLS8974( ACCELEROMETER_base, I2C_target ):
 					"SDCD_UTHS_LSB", "SDCD_UTHS_MSB",
 					"SELF_TEST_CONFIG1", "SELF_TEST_CONFIG2",
 					)
+	REG_VOLATILE	= dict.fromkeys( REG_NAME[ 0 : 18 ] + ( "SYS_MODE", "ORIENT_STATUS", "SDCD_INT_SRC1", "SDCD_INT_SRC2" ), 0xFF )
+	REG_VOLATILE[ "SENS_CONFIG1" ]	= 0x80	#	RST bit
+	SNAPSHOT_LAST	= ( "SENS_CONFIG1", )	#	ACTIVE bit. other registers are written in standby
+
+	FIELDS		= {	"ACTIVE"		: ( "SENS_CONFIG1", 0, 1 ),
+					"FSR"			: ( "SENS_CONFIG1", 1, 2, { 2: 0, 4: 1, 8: 2, 16: 3 } ),
+					"WAKE_ODR"		: ( "SENS_CONFIG3", 4, 4 ),
+					"SLEEP_ODR"		: ( "SENS_CONFIG3", 0, 4 ),
+					}
 
 	def __init__( self, i2c, address = DEFAULT_ADDR ):
 		"""
@@ -205,8 +241,7 @@ class FXLS8974( ACCELEROMETER_base, I2C_target ):
 		super().__init__( i2c, address )
 
 		self.fs_range	= 2
-		self.fullscale( self.fs_range )
-		self.bit_operation( "SENS_CONFIG1", 0x01, 0x01 )
+		self.fields.update( FSR = self.fs_range, ACTIVE = 1 )
 
 	def __three_axis( self, reg ):
 		return unpack( "<hhh", self.read_registers( reg, 6, barray = True ) )
@@ -216,15 +251,15 @@ class FXLS8974( ACCELEROMETER_base, I2C_target ):
 
 	def __fullscale( self, v ):
 		if 16 <= v:
-			setting	= 0x3
+			setting	= 16
 		elif 8 <= v:
-			setting	= 0x2
+			setting	= 8
 		elif 4 <= v:
-			setting	= 0x1
+			setting	= 4
 		else:
-			setting	= 0x0
+			setting	= 2
 		
-		self.bit_operation( "SENS_CONFIG1", 0x06, setting << 1 )
+		self.fields.update( FSR = setting )
 
 
 from machine	import	Pin, I2C
@@ -1,9 +1,7 @@
 from	machine		import	SPI, Pin, Timer
 from	utime		import	sleep, sleep_ms, sleep_us
-from	struct		import	unpack
-from	micropython	import	schedule
+from	struct		import	pack, unpack
 from nxp_periph.interface	import	SPI_target
-from nxp_periph.MikanUtil	import	MikanUtil
 
 WAIT	= 0.001
 #WAIT	= 0
@@ -24,6 +22,7 @@ class NAFE13388( AFE_base, SPI_target ):
 	
 	"""
 	ch_cnfg_reg	= [ 0x0020, 0x0021, 0x0022, 0x0023 ]
+	sys_cnfg_reg	= [ 0x0029, 0x002A, 0x002B, 0x002C, 0x002F, 0x0030 ]	#	registers set in boot()
 
 	def __init__( self, spi, cs = None ):
 		"""
@@ -66,37 +65,71 @@ class NAFE13388( AFE_base, SPI_target ):
 		self.ch		= [ 0 ] * self.num_logcal_ch
 		self.done	= False
 		
-	def periodic_measurement_start( self ):
+	def periodic_measurement_start( self, interval_ms = 100, sampler = None ):
 		"""
 		AFE periodic operation starter
+		
+		The operation is done on "afe" channel of a Sampler. Measured 
+		values are in self.ch and the channel data. 
+
+		Parameters
+		----------
+		interval_ms : int, option
+			Interval of the operation. Each channel is measured in 
+			every 2 intervals
+		sampler : Sampler, option
+			Sampler to add the channel. A new Sampler is made and started 
+			if not given. The given sampler is not started by this method. 
+
+		Returns
+		-------
+		Sampler : the sampler
 		"""
-		tim0 = Timer( MikanUtil.get_timer_id( 0 ) )
-		tim0.init( period= 100, callback = self.tim_cb )
+		if sampler is None:
+			from nxp_periph.sampler	import	Sampler
+
+			sampler	= Sampler( owner = self.owner )
+			sampler.add( "afe", self.__periodic, interval_ms )
+			sampler.start()
+		else:
+			sampler.add( "afe", self.__periodic, interval_ms )
+
+		return sampler
+
+	def __periodic( self ):
+		return self.sch_cb( 0 )
 
 	def sch_cb( self, _ ):
 		"""
 		AFE periodic operation callback via tim_cb()
+
+		Returns
+		-------
+		float : measured value in microvolt
 		"""
 		ch_start	= (self.cb_count + 1) % 2
 		ch_read		= self.cb_count % 2
 
-		# read data
-		self.ch[ ch_read ]	= self.read_r24( 0x2040 + ch_read )	* self.coeff_microvolt
+		with self.hold():
+			# read data
+			self.ch[ ch_read ]	= self.read_r24( 0x2040 + ch_read )	* self.coeff_microvolt
 
-		# start ADC operation
-		self.write_r16( 0x0000 + ch_start )
-		self.write_r16( 0x2000 )
+			# start ADC operation
+			self.write_r16( 0x0000 + ch_start )
+			self.write_r16( 0x2000 )
 		
 		self.cb_count	+= 1
 		
 		if self.cb_count % 2:
 			self.done	= True
+
+		return self.ch[ ch_read ]
 	
 	def tim_cb( self, tim_obj ):
 		"""
 		timer callback
 		"""
-		schedule( self.sch_cb, 0 )
+		self.defer( self.sch_cb, 0, priority = 0 )	#	bus_owner.REALTIME
 
 	def	write_r16( self, reg, val = None ):
 		"""
@@ -218,6 +251,55 @@ class NAFE13388( AFE_base, SPI_target ):
 			else:
 				print( "" )
 
+	def integrity_sample( self ):
+		"""
+		register values to check bus integrity (used by bus_tuner)
+		
+		Part number and serial number registers are read. 
+		"""
+		return [ self.read_r16( r ) for r in ( 0x7C, 0x7D, 0x7E, 0xAE, 0xAF ) ]
+
+	def snapshot_data( self ):
+		"""
+		register values for snapshot()
+		
+		System configuration registers, channel enable bits (0x24) and 
+		configuration registers (0x20-0x23) of enabled logical channels 
+		as 16 bit values. 
+		"""
+		enabled	= self.read_r16( 0x24 )
+		values	= [ self.read_r16( r ) for r in self.sys_cnfg_reg ] + [ enabled ]
+		
+		for ch in range( 16 ):
+			if enabled & (1 << ch):
+				self.write_r16( 0x0000 + ch )
+				values	+= [ self.read_r16( r ) for r in self.ch_cnfg_reg ]
+
+		return pack( ">{}H".format( len( values ) ), *values )
+
+	def restore_data( self, data ):
+		"""
+		write register values taken by snapshot_data()
+		"""
+		values	= unpack( ">{}H".format( len( data ) // 2 ), data )
+		n		= len( self.sys_cnfg_reg )
+		enabled	= values[ n ]
+		
+		for r, v in zip( self.sys_cnfg_reg, values ):
+			self.write_r16( r, v )
+
+		k	= n + 1
+		for ch in range( 16 ):
+			if enabled & (1 << ch):
+				self.write_r16( 0x0000 + ch )
+				
+				for r in self.ch_cnfg_reg:
+					self.write_r16( r, values[ k ] )
+					k	+= 1
+
+		self.write_r16( 0x24, enabled )
+		self.num_logcal_ch	= bin( enabled ).count( "1" )
+
 	def logical_ch_config( self, logical_channel, list ):
 		"""
 		Logical channel configuration
@@ -271,8 +353,10 @@ class NAFE13388( AFE_base, SPI_target ):
 
 		"""
 		if ch is not None:
-			self.write_r16( 0x0000 + ch )
-			self.write_r16( 0x2000 )
+			with self.hold():	#	channel select and start. bus is released during conversion
+				self.write_r16( 0x0000 + ch )
+				self.write_r16( 0x2000 )
+
 			sleep_ms( 100 )
 			return self.read_r24( 0x2040 + ch ) * self.coeff_microvolt
 		
@@ -282,17 +366,48 @@ class NAFE13388( AFE_base, SPI_target ):
 
 		for i in range( self.num_logcal_ch ):
 			self.write_r16( command )
-			"""
-			print( f"after command" )
-			for i in range( 100 ):
-				print( f"0x31 = {self.read_r16( 0x31 ):04X}" )
-				sleep_us( 10 )
-			"""
 			sleep_ms( 10 )
 			values	+= [ self.read_r24( 0x2040 + i ) ]
 		
-		print( values )
+		return values
+		
+	async def ameasure( self, ch = None ):
+		"""
+		Measure input voltage (async version)
+
+		Same as measure() but waits for conversion are done by 
+		uasyncio.sleep_ms(). Other tasks can run during the conversion. 
 
+		Parameters
+		----------
+		ch : int
+			Logical input channel number or None
+			
+		Returns
+		-------
+		float in voltage (microvolt) if "ch" was given
+		list of raw measured values if "ch" was not given
+
+		"""
+		import	uasyncio
+
+		if ch is not None:
+			with self.hold():	#	channel select and start. bus is released during conversion
+				self.write_r16( 0x0000 + ch )
+				self.write_r16( 0x2000 )
+
+			await uasyncio.sleep_ms( 100 )
+			return self.read_r24( 0x2040 + ch ) * self.coeff_microvolt
+		
+		values	= []
+
+		command	= 0x2004
+
+		for i in range( self.num_logcal_ch ):
+			self.write_r16( command )
+			await uasyncio.sleep_ms( 10 )
+			values	+= [ self.read_r24( 0x2040 + i ) ]
+		
 		return values
 		
 	def read( self, ch = None ):
@@ -319,6 +434,25 @@ class NAFE13388( AFE_base, SPI_target ):
 
 		return values
 	
+	def stream( self, interval_ms = 0, count = None ):
+		"""
+		Input value stream
+
+		Parameters
+		----------
+		interval_ms : int, option
+			Read interval (see nxp_periph.pipeline.stream)
+		count : int, option
+			Number of reads. Endless if not given
+			
+		Returns
+		-------
+		stream : stream of raw measured values of all logical channels
+
+		"""
+		from nxp_periph.pipeline	import	stream
+		return stream( self.read, interval_ms, count )
+	
 	def die_temp( self ):
 		"""
 		Die temperature
@@ -26,6 +26,29 @@ class EEPROM_base():
 			
 		return self.__write( byte_addr, data )
 		
+	async def awrite( self, byte_addr, data ):
+		"""
+		write data (async version)
+		
+		Same as write() but waits for write cycle completion are done 
+		by uasyncio.sleep_ms(). Other tasks can run during the waits. 
+		
+		Parameters
+		----------
+		byte_addr : int
+			Start byte address for EEPROM data writing
+		data : list or str
+				
+		Returns
+		-------
+		int : Written data length
+
+		"""
+		if isinstance( data, str ):
+			data	= [ ord( i ) for i in data ]
+			
+		return await self.__awrite( byte_addr, data )
+		
 	def wait_write_complete( self, times = 10 ):
 		"""
 		wait loop until write complete
@@ -101,7 +124,7 @@ class M24C02( EEPROM_base, I2C_target ):
 
 		self.wait_write_complete()
 		
-		while length:
+		while length:	#	bus is not held. other devices can be accessed during write cycles
 			w_size	= page_size if page_size < length else length
 			self.write_registers( byte_addr + written, data[ written : written + w_size ] )
 			written	+= w_size
@@ -111,14 +134,51 @@ class M24C02( EEPROM_base, I2C_target ):
 
 		return written
 		
+	def batch( self ):
+		"""
+		register write batching is not supported because page writes need 
+		to wait its write cycle completion
+		"""
+		raise EEPROM_Error( "EEPROM doesn't support register write batching" )
+
+	async def __awrite( self, byte_addr, data ):
+		page_size	= 16
+		written		= 0
+
+		length	= 1 if type(data) == int else len( data )
+
+		await self.__await_write_complete()
+		
+		while length:
+			w_size	= page_size if page_size < length else length
+			self.write_registers( byte_addr + written, data[ written : written + w_size ] )
+			written	+= w_size
+			length	-= w_size
+			
+			await self.__await_write_complete()
+
+		return written
+		
+	async def __await_write_complete( self, times = 10 ):
+		import	uasyncio
+
+		while not self.acked():
+			if not times:
+				raise EEPROM_Error( "EEPROM write couldn't be completed" )
+			
+			times	-= 1
+			await uasyncio.sleep_ms( 4 )
+		
+		return times
+
 	def __wait_write_complete( self, times ):
-		while (not self.ping()) and times:
+		while not self.acked():
+			if not times:
+				raise EEPROM_Error( "EEPROM write couldn't be complete" )
+			
 			times	-= 1
 			sleep_ms( 1 )
 		
-		if not times:
-			raise EEPROM_Error( "EEPROM write couldn't be complete" )
-		
 		return times
 		
 	def __read( self, byte_addr, length = None ):
@@ -141,7 +201,7 @@ class M24C02( EEPROM_base, I2C_target ):
 		while times:
 			sleep_ms( 4 )
 			times	-= 1
-			if self.ping():
+			if self.acked():
 				break
 		
 		if not times:
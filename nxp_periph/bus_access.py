@@ -0,0 +1,252 @@
+from	machine		import	disable_irq, enable_irq
+from	micropython	import	schedule
+from	utime		import	ticks_us, ticks_diff
+
+class bus_owner_Error( Exception ):
+	"""
+	Just a class for bus_owner exception handling
+	"""
+	pass
+
+class bus_owner:
+	"""
+	An owner of an I2C or SPI bus. 
+	
+	All I2C_target/SPI_target instances on a bus can go through this 
+	object by giving it instead of machine.I2C/SPI instance. 
+	Each bus transaction (like a register read with repeated-START) is 
+	done exclusively. 
+	Timer callbacks and interrupt handlers should not access devices 
+	directly. Those can use request() (or Interface.defer()) to queue 
+	functions. The queued functions are run in priority order by 
+	micropython.schedule() when the bus is free. They are not run in 
+	a driver call. A sequence of transactions which must not be broken 
+	(like read-modify-write) can be kept together in "with" block of 
+	this object (or Interface.hold()). Queued functions are scheduled 
+	at the end of the outermost block. 
+	Latency from request to run is measured for each priority class. 
+
+	Other attributes (methods of machine.I2C/SPI) are taken from the bus. 
+
+	Examples
+	--------
+	>>> i2c		= bus_owner( I2C( 0, freq = (400 * 1000) ) )
+	>>> led_c	= PCA9955B( i2c )
+	>>> temp	= PCT2075( i2c )
+	>>> i2c.request( sampling, 0, bus_owner.REALTIME )	# in a timer callback
+	>>> print( i2c.metrics() )
+
+	"""
+	REALTIME		= 0
+	NORMAL			= 1
+	UI				= 2
+	PRIORITY_NAME	= ( "realtime", "normal", "ui" )
+	QUEUE_DEPTH		= 8
+
+	def __init__( self, bus ):
+		"""
+		bus_owner initializer
+	
+		Parameters
+		----------
+		bus : obj
+			machine.I2C or machine.SPI instance
+
+		"""
+		n	= self.QUEUE_DEPTH
+		p	= len( self.PRIORITY_NAME )
+
+		self.bus		= bus
+		self.busy		= False
+		self.__running	= False
+		self.__hold		= 0
+
+		#	queues are pre-allocated rings to be used in interrupt handlers
+		self.__func		= [ [ None ] * n for i in range( p ) ]
+		self.__arg		= [ [ None ] * n for i in range( p ) ]
+		self.__time		= [ [ 0 ] * n for i in range( p ) ]
+		self.__head		= [ 0 ] * p
+		self.__count	= [ 0 ] * p
+
+		self.__dispatch_ref	= self.__dispatch	#	bound method made once, to avoid allocation in handlers
+		self.metrics_clear()
+
+	def __getattr__( self, name ):
+		return getattr( self.bus, name )
+
+	def __enter__( self ):
+		self.__hold	+= 1
+		return self
+
+	def __exit__( self, exc_type, exc_value, traceback ):
+		self.__hold	-= 1
+
+		if not self.__hold:
+			self.__schedule()
+
+		return False
+
+	def run( self, func, *args ):
+		"""
+		run a bus transaction exclusively
+		
+		Queued requests are scheduled after the transaction. 
+	
+		Parameters
+		----------
+		func : callable
+			Function to perform the transaction
+		args : 
+			Arguments for the func
+
+		Returns
+		-------
+		Return value of the func
+
+		"""
+		if self.busy:
+			raise bus_owner_Error( "bus access during a transaction. use request() in callbacks" )
+
+		self.busy	= True
+		try:
+			return func( *args )
+		finally:
+			self.busy	= False
+			
+			if not self.__hold:
+				self.__schedule()
+
+	def request( self, func, arg = 0, priority = NORMAL ):
+		"""
+		queue a function to be run when the bus is free
+		
+		This method can be called from interrupt handlers. 
+		No heap allocation is done in this method. 
+	
+		Parameters
+		----------
+		func : callable
+			Function to be called with an argument
+		arg : any, option
+			Argument for the func
+		priority : int, option
+			REALTIME, NORMAL or UI
+
+		Returns
+		-------
+		bool : False if the queue was full and the request was dropped
+
+		"""
+		n			= self.QUEUE_DEPTH
+		irq_state	= disable_irq()
+
+		c	= self.__count[ priority ]
+
+		if n <= c:
+			self.__dropped[ priority ]	+= 1
+			enable_irq( irq_state )
+			return False
+
+		i	= (self.__head[ priority ] + c) % n
+		self.__func[ priority ][ i ]	= func
+		self.__arg[ priority ][ i ]		= arg
+		self.__time[ priority ][ i ]	= ticks_us()
+		self.__count[ priority ]		= c + 1
+
+		enable_irq( irq_state )
+
+		if not (self.busy or self.__hold):
+			self.__schedule()
+		
+		return True
+
+	def dispatch( self ):
+		"""
+		run queued functions now
+		
+		Call this from outermost code (like main loop) when requests 
+		may be left in the queue because micropython.schedule() queue 
+		was full. Nothing is done in a transaction or a "with" block. 
+		"""
+		self.__dispatch( 0 )
+
+	def __schedule( self ):
+		if not any( self.__count ):
+			return
+
+		try:
+			schedule( self.__dispatch_ref, 0 )
+		except RuntimeError:	#	schedule queue full. it will be scheduled after next transaction
+			pass
+
+	def __dispatch( self, _ ):
+		"""
+		run queued functions in priority order (instance internal use)
+		"""
+		if self.busy or self.__hold or self.__running:
+			return
+
+		self.__running	= True
+		try:
+			while True:
+				for p, c in enumerate( self.__count ):
+					if c:
+						break
+				else:
+					break
+				
+				irq_state	= disable_irq()
+
+				i		= self.__head[ p ]
+				func	= self.__func[ p ][ i ]
+				arg		= self.__arg[ p ][ i ]
+				t		= self.__time[ p ][ i ]
+				self.__func[ p ][ i ]	= None
+				self.__arg[ p ][ i ]	= None
+				self.__head[ p ]		= (i + 1) % self.QUEUE_DEPTH
+				self.__count[ p ]		-= 1
+
+				enable_irq( irq_state )
+
+				latency	= ticks_diff( ticks_us(), t )
+				self.__n_run[ p ]	+= 1
+				self.__total[ p ]	+= latency
+				self.__max[ p ]		 = max( self.__max[ p ], latency )
+
+				func( arg )
+		finally:
+			self.__running	= False
+
+	def metrics( self ):
+		"""
+		queue latency metrics
+	
+		Returns
+		-------
+		dict : metrics for each priority class
+			Keys are PRIORITY_NAME. Each value is a dict of "count", 
+			"avg_us", "max_us" and "dropped". 
+
+		"""
+		m	= {}
+
+		for i, name in enumerate( self.PRIORITY_NAME ):
+			n	= self.__n_run[ i ]
+			m[ name ]	= { "count"		: n,
+							"avg_us"	: self.__total[ i ] / n if n else 0,
+							"max_us"	: self.__max[ i ],
+							"dropped"	: self.__dropped[ i ]
+							}
+
+		return m
+
+	def metrics_clear( self ):
+		"""
+		clear queue latency metrics
+		"""
+		p	= len( self.PRIORITY_NAME )
+
+		self.__n_run	= [ 0 ] * p
+		self.__total	= [ 0 ] * p
+		self.__max		= [ 0 ] * p
+		self.__dropped	= [ 0 ] * p
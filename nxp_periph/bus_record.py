@@ -0,0 +1,257 @@
+from	ustruct		import	pack, unpack
+
+class bus_recorder:
+	"""
+	Bus transaction recorder
+	
+	A wrapper of machine.I2C or machine.SPI instance. Give this object 
+	to device classes instead of the bus. All transfers are done on the 
+	bus and recorded into a binary trace stream. 
+	The trace can be replayed by bus_replayer without hardware. 
+
+	Trace format: 4 bytes header b"BTR1", then records. Each record has 
+	6 bytes header of op (1 byte, 0x80 bit set if the transfer raised 
+	OSError), target address (1 byte), aux (2 bytes: STOP flag, memory 
+	address or SPI write value) and length (2 bytes), in little endian. 
+	It is followed by the data (written bytes for write, read bytes for 
+	read) or 1 byte errno for failed transfer. 
+
+	Examples
+	--------
+	>>> f		= open( "trace.bin", "wb" )
+	>>> i2c		= bus_recorder( I2C( 0, freq = (400 * 1000) ), f )
+	>>> temp	= PCT2075( i2c )
+	>>> print( temp.temp )
+	>>> f.close()
+
+	"""
+	MAGIC	= b"BTR1"
+	HEADER	= "<BBHH"
+	FAIL	= 0x80
+
+	def __init__( self, bus, stream ):
+		"""
+		bus_recorder initializer
+	
+		Parameters
+		----------
+		bus : obj
+			machine.I2C or machine.SPI instance
+		stream : obj
+			Stream to write the trace (a file opened in "wb" mode or io.BytesIO)
+
+		"""
+		self.bus		= bus
+		self.stream		= stream
+		self.records	= 0
+		
+		stream.write( self.MAGIC )
+
+	def __getattr__( self, name ):
+		return getattr( self.bus, name )
+
+	def __record( self, op, addr, aux, data ):
+		self.stream.write( pack( self.HEADER, op, addr, aux, len( data ) ) )
+		self.stream.write( data )
+		self.records	+= 1
+
+	def __call( self, op, addr, aux, length, func, *args ):
+		try:
+			func( *args )
+		except OSError as e:
+			self.stream.write( pack( self.HEADER, op | self.FAIL, addr, aux, length ) )
+			self.stream.write( bytes( [ e.args[ 0 ] & 0xFF if e.args else 0 ] ) )
+			self.records	+= 1
+			raise
+
+	def scan( self ):
+		r	= self.bus.scan()
+		self.__record( ord( "C" ), 0, 0, bytes( r ) )
+		return r
+
+	def writeto( self, addr, buf, stop = True ):
+		self.__call( ord( "W" ), addr, stop, len( buf ), self.bus.writeto, addr, buf, stop )
+		self.__record( ord( "W" ), addr, stop, bytes( buf ) )
+		return len( buf )
+
+	def writevto( self, addr, vector, stop = True ):
+		data	= b"".join( bytes( b ) for b in vector )
+		self.__call( ord( "V" ), addr, stop, len( data ), self.bus.writevto, addr, vector, stop )
+		self.__record( ord( "V" ), addr, stop, data )
+		return len( data )
+
+	def readfrom_into( self, addr, buf, stop = True ):
+		self.__call( ord( "R" ), addr, stop, len( buf ), self.bus.readfrom_into, addr, buf, stop )
+		self.__record( ord( "R" ), addr, stop, bytes( buf ) )
+
+	def readfrom( self, addr, nbytes, stop = True ):
+		buf	= bytearray( nbytes )
+		self.readfrom_into( addr, buf, stop )
+		return bytes( buf )
+
+	def readfrom_mem_into( self, addr, memaddr, buf, *, addrsize = 8 ):
+		self.__call( ord( "M" ), addr, memaddr, len( buf ), self.bus.readfrom_mem_into, addr, memaddr, buf )
+		self.__record( ord( "M" ), addr, memaddr, bytes( buf ) )
+
+	def readfrom_mem( self, addr, memaddr, nbytes, *, addrsize = 8 ):
+		buf	= bytearray( nbytes )
+		self.readfrom_mem_into( addr, memaddr, buf )
+		return bytes( buf )
+
+	def writeto_mem( self, addr, memaddr, buf, *, addrsize = 8 ):
+		self.__call( ord( "N" ), addr, memaddr, len( buf ), self.bus.writeto_mem, addr, memaddr, buf )
+		self.__record( ord( "N" ), addr, memaddr, bytes( buf ) )
+
+	def write( self, buf ):
+		self.__call( ord( "S" ), 0, 0, len( buf ), self.bus.write, buf )
+		self.__record( ord( "S" ), 0, 0, bytes( buf ) )
+
+	def readinto( self, buf, write = 0x00 ):
+		self.__call( ord( "I" ), 0, write, len( buf ), self.bus.readinto, buf, write )
+		self.__record( ord( "I" ), 0, write, bytes( buf ) )
+
+	def read( self, nbytes, write = 0x00 ):
+		buf	= bytearray( nbytes )
+		self.readinto( buf, write )
+		return bytes( buf )
+
+	def write_readinto( self, write_buf, read_buf ):
+		wd	= bytes( write_buf )	#	write_buf can be same as read_buf
+		self.__call( ord( "X" ), 0, 0, len( wd ) * 2, self.bus.write_readinto, write_buf, read_buf )
+		self.__record( ord( "X" ), 0, 0, wd + bytes( read_buf ) )
+
+class bus_replayer_Error( Exception ):
+	"""
+	Just a class for bus_replayer exception handling
+	"""
+	pass
+
+class bus_replayer:
+	"""
+	Bus replayer
+	
+	A stand-in of machine.I2C or machine.SPI which feeds responses 
+	recorded by bus_recorder back to device classes. No hardware is 
+	needed. Whole trace is loaded at initialization. Each transfer is checked against the record. Different 
+	transfer method, target address, STOP/memory address, length or 
+	written data raises bus_replayer_Error. So a modified driver can be 
+	checked that it makes byte-for-byte same traffic. 
+	Recorded bus errors are raised as OSError with recorded errno. 
+
+	Examples
+	--------
+	>>> i2c		= bus_replayer( open( "trace.bin", "rb" ) )
+	>>> temp	= PCT2075( i2c )
+	>>> print( temp.temp )
+	>>> print( i2c.remaining() )	# 0 if all records have been replayed
+
+	"""
+	def __init__( self, stream ):
+		"""
+		bus_replayer initializer
+	
+		Parameters
+		----------
+		stream : obj
+			Stream of a trace (a file opened in "rb" mode or io.BytesIO)
+
+		"""
+		self.index		= 0
+		self.freq		= 400_000
+		self.records	= []
+
+		trace	= stream.read()
+		
+		if trace[ : len( bus_recorder.MAGIC ) ] != bus_recorder.MAGIC:
+			raise bus_replayer_Error( "not a bus trace" )
+
+		i	= len( bus_recorder.MAGIC )
+
+		while i < len( trace ):
+			op, addr, aux, length	= unpack( bus_recorder.HEADER, trace[ i : i + 6 ] )
+			n	= 1 if op & bus_recorder.FAIL else length
+			self.records	+= [ ( op, addr, aux, length, trace[ i + 6 : i + 6 + n ] ) ]
+			i	+= 6 + n
+
+	def init( self, *args, **kwargs ):
+		pass
+
+	def deinit( self ):
+		pass
+
+	def __take( self, op, addr, aux, length, wdata = None ):
+		"""
+		take next record and check it (instance internal use)
+		"""
+		if len( self.records ) <= self.index:
+			raise bus_replayer_Error( "record #{}: end of trace, but {} to 0x{:02X} requested".format( self.index, chr( op ), addr ) )
+
+		r_op, r_addr, r_aux, r_length, data	= self.records[ self.index ]
+		fail	= r_op & bus_recorder.FAIL
+		length	= r_length if length is None else length
+		aux		= int( aux )		#	STOP flag can be bool
+
+		if ( r_op & ~bus_recorder.FAIL, r_addr, r_aux, r_length ) != ( op, addr, aux, length ):
+			raise bus_replayer_Error( "record #{}: {} to 0x{:02X} (aux {}, {} bytes) requested, but recorded {} to 0x{:02X} (aux {}, {} bytes)".format( self.index, chr( op ), addr, aux, length, chr( r_op & ~bus_recorder.FAIL ), r_addr, r_aux, r_length ) )
+
+		if wdata is not None and not fail and data[ : len( wdata ) ] != wdata:
+			raise bus_replayer_Error( "record #{}: written data differ: {} recorded {}".format( self.index, list( wdata ), list( data[ : len( wdata ) ] ) ) )
+
+		self.index	+= 1
+
+		if fail:
+			raise OSError( data[ 0 ] )
+
+		return data
+
+	def remaining( self ):
+		"""
+		number of records not replayed yet
+
+		Returns
+		-------
+		int : number of remaining records
+
+		"""
+		return len( self.records ) - self.index
+
+	def scan( self ):
+		return list( self.__take( ord( "C" ), 0, 0, None ) )
+
+	def writeto( self, addr, buf, stop = True ):
+		self.__take( ord( "W" ), addr, stop, len( buf ), bytes( buf ) )
+		return len( buf )
+
+	def writevto( self, addr, vector, stop = True ):
+		data	= b"".join( bytes( b ) for b in vector )
+		self.__take( ord( "V" ), addr, stop, len( data ), data )
+		return len( data )
+
+	def readfrom_into( self, addr, buf, stop = True ):
+		buf[ : ]	= self.__take( ord( "R" ), addr, stop, len( buf ) )
+
+	def readfrom( self, addr, nbytes, stop = True ):
+		return self.__take( ord( "R" ), addr, stop, nbytes )
+
+	def readfrom_mem_into( self, addr, memaddr, buf, *, addrsize = 8 ):
+		buf[ : ]	= self.__take( ord( "M" ), addr, memaddr, len( buf ) )
+
+	def readfrom_mem( self, addr, memaddr, nbytes, *, addrsize = 8 ):
+		return self.__take( ord( "M" ), addr, memaddr, nbytes )
+
+	def writeto_mem( self, addr, memaddr, buf, *, addrsize = 8 ):
+		self.__take( ord( "N" ), addr, memaddr, len( buf ), bytes( buf ) )
+
+	def write( self, buf ):
+		self.__take( ord( "S" ), 0, 0, len( buf ), bytes( buf ) )
+
+	def readinto( self, buf, write = 0x00 ):
+		buf[ : ]	= self.__take( ord( "I" ), 0, write, len( buf ) )
+
+	def read( self, nbytes, write = 0x00 ):
+		return self.__take( ord( "I" ), 0, write, nbytes )
+
+	def write_readinto( self, write_buf, read_buf ):
+		wd			= bytes( write_buf )
+		data		= self.__take( ord( "X" ), 0, 0, len( wd ) * 2, wd )
+		read_buf[ : ]	= data[ len( wd ) : ]
@@ -0,0 +1,219 @@
+from	utime		import	ticks_us, ticks_ms, ticks_diff
+from	nxp_periph.interface	import	I2C_target, _owner
+
+class bus_scanner:
+	"""
+	Cached and incremental I2C bus scanner
+	
+	scan() uses machine.I2C.scan() for the range of 0x08 to 0x77 and 
+	probes only the reserved addresses (0x00-0x07 and 0x78-0x7F) one 
+	by one. The result is kept for "ttl_ms" and returned without bus 
+	access while it is fresh. 
+	update() re-probes only the addresses which were found in last scan 
+	and the "expect"ed addresses (addresses the drivers are using) to 
+	detect devices plugged/unplugged. Newly plugged devices on other 
+	addresses are found by a full scan which update() does in every 
+	"full_scan_ms". 
+	Time of last scan is in "elapsed_us". 
+
+	Examples
+	--------
+	>>> scanner	= bus_scanner( i2c, ttl_ms = 10000, expect = [ temp, led_c ] )
+	>>> scanner.scan()
+	[ 0, 54, 72 ]
+	>>> scanner.update()		# after a device is unplugged
+	( [], [ 72 ] )
+
+	"""
+	RESERVED	= tuple( range( 0x00, 0x08 ) ) + tuple( range( 0x78, 0x80 ) )
+
+	def __init__( self, i2c, ttl_ms = 5000, expect = (), full_scan_ms = 30000 ):
+		"""
+		bus_scanner initializer
+	
+		Parameters
+		----------
+		i2c : obj
+			machine.I2C or bus_owner instance
+		ttl_ms : int, option
+			Time to keep the scan result. 0 to scan always
+		expect : list, option
+			Addresses (int) or I2C_target instances to be re-probed in 
+			update(). Other objects in the list are ignored. 
+		full_scan_ms : int, option
+			Interval of full scan in update(). 0 to do full scan always
+
+		"""
+		self.i2c			= i2c
+		self.ttl_ms			= ttl_ms
+		self.full_scan_ms	= full_scan_ms
+		self.expect			= set()
+		self.found			= []
+		self.elapsed_us		= 0
+		self.probed			= 0
+		self.__at			= None
+		self.__full_at		= None
+
+		for d in expect:
+			if isinstance( d, int ):
+				self.expect.add( d )
+			elif isinstance( d, I2C_target ):
+				self.expect.add( d.__adr )
+
+	def fresh( self ):
+		"""
+		check the cached result is in TTL
+
+		Returns
+		-------
+		bool : True if the cached result can be used
+
+		"""
+		return self.__at is not None and ticks_diff( ticks_ms(), self.__at ) < self.ttl_ms
+
+	def scan( self, force = False ):
+		"""
+		full range scan (0x00 to 0x7F)
+	
+		Parameters
+		----------
+		force : bool, option
+			Ignore cached result
+			
+		Returns
+		-------
+		list : Responding target address list
+
+		"""
+		if force or not self.fresh():
+			self.__run( self.__scan )
+			
+		return self.found
+
+	def update( self ):
+		"""
+		incremental scan
+	
+		Re-probes addresses found in last scan and expected addresses. 
+		A full scan is done instead if no scan has been done yet or 
+		last full scan is older than "full_scan_ms". 
+			
+		Returns
+		-------
+		tuple : lists of added and removed addresses
+
+		"""
+		if self.__at is None:
+			return self.scan(), []
+			
+		prev	= self.found
+		
+		if ticks_diff( ticks_ms(), self.__full_at ) < self.full_scan_ms:
+			self.__run( self.__update )
+		else:
+			self.__run( self.__scan )
+		
+		return [ a for a in self.found if a not in prev ], [ a for a in prev if a not in self.found ]
+
+	def __run( self, func ):
+		start	= ticks_us()
+		
+		if _owner( self.i2c ):
+			self.i2c.run( func, self.i2c.bus )
+		else:
+			func( self.i2c )
+		
+		self.elapsed_us	= ticks_diff( ticks_us(), start )
+		self.__at		= ticks_ms()
+
+	def __scan( self, i2c ):
+		found	= i2c.scan() + [ a for a in self.RESERVED if self.__probe( i2c, a ) ]
+		self.found		= sorted( set( found ) )
+		self.probed		= len( self.RESERVED )
+		self.__full_at	= ticks_ms()
+
+	def __update( self, i2c ):
+		targets		= set( self.found ) | self.expect
+		self.found	= sorted( a for a in targets if self.__probe( i2c, a ) )
+		self.probed	= len( targets )
+
+	def __probe( self, i2c, address ):
+		try:
+			i2c.writeto( address, b"" )
+		except OSError:
+			return False
+		
+		return True
+
+def scan_all( scanners, force = False ):
+	"""
+	scan multiple buses
+	
+	Buses are scanned concurrently in threads if the port supports 
+	"_thread" module. Otherwise they are scanned one by one. 
+	An exception in a scan is raised after all scans are finished. 
+	
+	Parameters
+	----------
+	scanners : list
+		bus_scanner instances
+	force : bool, option
+		Ignore cached results
+		
+	Returns
+	-------
+	list : scan results (lists of addresses) in order of scanners
+
+	"""
+	try:
+		import	_thread
+	except ImportError:
+		return [ s.scan( force ) for s in scanners ]
+
+	results	= [ None ] * len( scanners )
+	errors	= [ None ] * len( scanners )
+	locks	= [ _thread.allocate_lock() for s in scanners ]	#	held while the scan is running
+
+	def worker( i ):
+		try:
+			results[ i ]	= scanners[ i ].scan( force )
+		except Exception as e:
+			errors[ i ]		= e
+		finally:
+			locks[ i ].release()
+
+	for i in range( 1, len( scanners ) ):
+		locks[ i ].acquire()
+		_thread.start_new_thread( worker, ( i, ) )
+
+	if scanners:
+		locks[ 0 ].acquire()
+		worker( 0 )
+
+	for lock in locks:		#	wait for the threads to finish
+		lock.acquire()
+		lock.release()
+	
+	for e in errors:
+		if e is not None:
+			raise e
+
+	return results
+
+def i2c_fullscan( i2c ):
+	"""
+	I2C scan for full range of target addresses. 
+	Because the machine.I2C.scan() does scan is limited in range of 0x08(0x10) 
+	to 0x77(0xEE). 
+	
+	Parameters
+	----------
+	i2c : obj
+		machine.I2C instance
+		
+	Returns
+	-------
+	list : Responding target ddress list
+
+	"""
+	return bus_scanner( i2c, ttl_ms = 0 ).scan()
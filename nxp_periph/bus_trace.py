@@ -0,0 +1,139 @@
+class bus_tracer:
+	"""
+	Bus transaction tracer
+	
+	Counts transactions, bytes, retries, bus errors and elapsed time of 
+	bus transactions for each device instance and each register. Bus 
+	errors are classified as NACK, timeout or other error by the 
+	retry_policy of the device (same as its error_count). 
+	Tracing is enabled by setting this object to "tracer" attribute of 
+	a device instance, or of Interface class to trace all devices. 
+	When the "tracer" is None, the cost is only a check of the attribute. 
+
+	The register is not known for transfers done by send()/receive() 
+	unless it is given by the caller (like write_registers() of SPI 
+	devices). Those are recorded with register None. 
+
+	Examples
+	--------
+	>>> tracer				= bus_tracer()
+	>>> Interface.tracer	= tracer	# trace all devices
+	>>> gpio.dump()
+	>>> tracer.report()
+	>>> Interface.tracer	= None		# stop tracing
+
+	"""
+	KEYS	= ( "transactions", "bytes", "retries", "nacks", "timeouts", "errors", "us" )
+
+	def __init__( self ):
+		"""
+		bus_tracer initializer
+		"""
+		self.clear()
+
+	def clear( self ):
+		"""
+		clear records
+		"""
+		self.devices	= {}
+		self.registers	= {}
+
+	def record( self, dev, reg, buf, us, done = True, failed = 0, nacks = 0, timeouts = 0 ):
+		"""
+		record a transaction
+		
+		Called from I2C_target and SPI_target after each transaction. 
+	
+		Parameters
+		----------
+		dev : obj
+			Device instance
+		reg : int or None
+			Register address/pointer
+		buf : bytearray, memoryview or list
+			Transferred data. List of buffers for writevto() transfer. 
+		us : int
+			Elapsed time in microseconds
+		done : bool, option
+			False if the transaction couldn't be completed
+		failed : int, option
+			Number of failed tries
+		nacks : int, option
+			Number of tries failed by NACK
+		timeouts : int, option
+			Number of tries failed by timeout. Other failed tries are 
+			counted as "errors"
+
+		"""
+		n		= sum( len( b ) for b in buf ) if type( buf ) == list else len( buf )
+		retries	= failed if done or not failed else failed - 1
+
+		for table, key in ( ( self.devices, dev ), ( self.registers, ( dev, reg ) ) ):
+			s	= table.get( key )
+
+			if s is None:
+				s				= [ 0 ] * len( self.KEYS )
+				table[ key ]	= s
+
+			s[ 0 ]	+= 1
+			s[ 1 ]	+= n
+			s[ 2 ]	+= retries
+			s[ 3 ]	+= nacks
+			s[ 4 ]	+= timeouts
+			s[ 5 ]	+= failed - nacks - timeouts
+			s[ 6 ]	+= us
+
+	def report( self, n = 10, key = "us", show = True ):
+		"""
+		ranking of heaviest devices and registers
+	
+		Parameters
+		----------
+		n : int, option
+			Number of entries in each ranking
+		key : str, option
+			Sort key. One of KEYS
+		show : bool, option
+			Print the ranking
+
+		Returns
+		-------
+		list : device ranking
+			List of dict which has "device" and KEYS
+		list : register ranking
+			List of dict which has "device", "register" and KEYS
+
+		"""
+		k		= self.KEYS.index( key )
+		devs	= sorted( self.devices.items(),   key = lambda i: i[ 1 ][ k ], reverse = True )[ : n ]
+		regs	= sorted( self.registers.items(), key = lambda i: i[ 1 ][ k ], reverse = True )[ : n ]
+
+		devs	= [ dict( zip( ( "device", ) + self.KEYS, ( self.__dev_name( d ), ) + tuple( s ) ) ) for d, s in devs ]
+		regs	= [ dict( zip( ( "device", "register" ) + self.KEYS, ( self.__dev_name( d ), self.__reg_name( d, r ) ) + tuple( s ) ) ) for ( d, r ), s in regs ]
+
+		if show:
+			fmt	= "    {:48} {:>12} {:>8} {:>7} {:>5} {:>8} {:>6} {:>10}"
+
+			print( "bus trace: heaviest devices (by {})".format( key ) )
+			print( fmt.format( "", *self.KEYS ) )
+			for d in devs:
+				print( fmt.format( d[ "device" ], *[ d[ i ] for i in self.KEYS ] ) )
+
+			print( "bus trace: heaviest registers (by {})".format( key ) )
+			print( fmt.format( "", *self.KEYS ) )
+			for r in regs:
+				print( fmt.format( r[ "device" ] + " " + r[ "register" ], *[ r[ i ] for i in self.KEYS ] ) )
+
+		return devs, regs
+
+	def __dev_name( self, dev ):
+		return "{}({})".format( dev.__class__.__name__, dev.dev_access() )
+
+	def __reg_name( self, dev, reg ):
+		if reg is None:
+			return "-"
+
+		try:
+			return dev.reg_map()[ 1 ][ reg ]
+		except ( AttributeError, LookupError ):
+			return "0x{:02X}".format( reg )
@@ -0,0 +1,200 @@
+from	nxp_periph.interface	import	I2C_target, SPI_target, retry_policy, _owner
+
+class bus_tuner:
+	"""
+	Bus clock tuner
+	
+	Steps the bus clock up while checking read-back integrity on the 
+	devices on the bus. Register values (integrity_sample()) are read 
+	at the lowest frequency as reference and compared with the values 
+	read at each frequency "tries" times. I2C retries are disabled 
+	while the check to count all errors. 
+	The stepping stops at the first frequency which has error rate 
+	more than "max_error_rate". The fastest reliable frequency is set 
+	on the bus and can be saved to a file to be restored in next boot. 
+	Error rates are in "error_rate" (dict of frequency and rate). 
+
+	Examples
+	--------
+	>>> tuner	= bus_tuner( i2c, [ temp, led_c ], name = "i2c0" )
+	>>> tuner.tune()
+	1000000
+	>>> tuner.save()
+	
+	In next boot: 
+	
+	>>> bus_tuner.restore( i2c, "i2c0" )
+	1000000
+
+	"""
+	FILE		= "bus_tune.json"
+	I2C_FREQS	= ( 100_000, 400_000, 1_000_000 )
+	SPI_FREQS	= ( 1_000_000, 2_000_000, 5_000_000, 10_000_000, 20_000_000 )
+
+	def __init__( self, bus, devices, name = "bus", freqs = None, tries = 10, max_error_rate = 0, set_freq = None ):
+		"""
+		bus_tuner initializer
+	
+		Parameters
+		----------
+		bus : obj
+			machine.I2C, machine.SPI or bus_owner instance
+		devices : list
+			I2C_target or SPI_target instances on the bus
+		name : str, option
+			Name of the bus as the key in the saved file
+		freqs : tuple, option
+			Frequencies to try in ascending order. I2C_FREQS or SPI_FREQS 
+			if not given
+		tries : int, option
+			Number of checks on each frequency
+		max_error_rate : float, option
+			Error rate (errors/checks) to be taken as reliable
+		set_freq : callable, option
+			Function to change the bus clock, called with frequency. 
+			init( freq = f ) or init( baudrate = f ) of the bus is used 
+			if not given. 
+
+		"""
+		spi	= any( isinstance( d, SPI_target ) for d in devices )
+
+		self.bus			= bus.bus if _owner( bus ) else bus
+		self.devices		= devices
+		self.name			= name
+		self.freqs			= freqs if freqs else (self.SPI_FREQS if spi else self.I2C_FREQS)
+		self.tries			= tries
+		self.max_error_rate	= max_error_rate
+		self.error_rate		= {}
+		self.freq			= None
+		self.__set			= set_freq if set_freq else (self.__baudrate if spi else self.__i2c_freq)
+
+	def __i2c_freq( self, f ):
+		self.bus.init( freq = f )
+
+	def __baudrate( self, f ):
+		self.bus.init( baudrate = f )
+
+	def tune( self ):
+		"""
+		find the fastest reliable frequency and set it on the bus
+	
+		Returns
+		-------
+		int : frequency. None if the bus was not reliable on the lowest 
+			frequency (the bus is left on the lowest frequency)
+
+		"""
+		policy	= [ d.retry if isinstance( d, I2C_target ) else None for d in self.devices ]
+		single	= retry_policy( tries = 1, probe_ms = 0 )
+
+		for d, p in zip( self.devices, policy ):
+			if p:
+				d.retry	= single
+
+		try:
+			self.__set( self.freqs[ 0 ] )
+			ref		= [ self.__sample( d ) for d in self.devices ]
+			best	= None
+			
+			self.error_rate	= {}
+
+			for f in self.freqs:
+				self.__set( f )
+				errors	= 0
+
+				for i in range( self.tries ):
+					for d, r in zip( self.devices, ref ):
+						errors	+= 0 if r is not None and r == self.__sample( d ) else 1
+
+				rate				= errors / (self.tries * len( self.devices ))
+				self.error_rate[ f ]	= rate
+
+				if self.max_error_rate < rate:
+					break
+
+				best	= f
+		finally:
+			for d, p in zip( self.devices, policy ):
+				if p:
+					d.retry	= p
+				d.live	= True
+
+		self.freq	= best
+		self.__set( self.freqs[ 0 ] if best is None else best )
+
+		return best
+
+	def __sample( self, dev ):
+		dev.live	= True
+		
+		try:
+			return dev.integrity_sample()
+		except Exception:	#	a failed read may end in any exception in device class
+			return None
+
+	def save( self, path = None ):
+		"""
+		save the tuned frequency
+		
+		The file keeps frequencies of buses by name. Other buses in the 
+		file are kept. 
+	
+		Parameters
+		----------
+		path : str, option
+			File name. FILE if not given
+
+		"""
+		import	ujson
+		
+		path	= path if path else self.FILE
+		
+		try:
+			with open( path ) as f:
+				saved	= ujson.load( f )
+		except ( OSError, ValueError ):
+			saved	= {}
+
+		saved[ self.name ]	= self.freq
+		
+		with open( path, "w" ) as f:
+			ujson.dump( saved, f )
+
+	@classmethod
+	def restore( cls, bus, name = "bus", path = None, spi = False ):
+		"""
+		set saved frequency on a bus
+	
+		Parameters
+		----------
+		bus : obj
+			machine.I2C, machine.SPI or bus_owner instance
+		name : str, option
+			Name of the bus given to bus_tuner
+		path : str, option
+			File name. FILE if not given
+		spi : bool, option
+			True for SPI bus
+			
+		Returns
+		-------
+		int : frequency. None if no frequency is saved for the bus
+
+		"""
+		import	ujson
+		
+		try:
+			with open( path if path else cls.FILE ) as f:
+				freq	= ujson.load( f ).get( name )
+		except ( OSError, ValueError ):
+			return None
+
+		if freq:
+			bus	= bus.bus if _owner( bus ) else bus
+			
+			if spi:
+				bus.init( baudrate = freq )
+			else:
+				bus.init( freq = freq )
+		
+		return freq
@@ -0,0 +1,127 @@
+from	nxp_periph.interface	import	I2C_target
+
+class DeviceGroup:
+	"""
+	Group of I2C devices written through a shared address
+	
+	Devices like LED controllers (PCA9955B, PCA9956B, PCA9632) and 
+	stepper motor controller (PCA9629A) have ALLCALLADR and SUBADR1-3 
+	registers. Writes to the address reach all devices which have it. 
+	This class programs the address on the members and makes a 
+	"target" device instance on the address. Methods of the target can 
+	be called through the group (like group.pwm( 0, 0.5 )), those writes 
+	are done in one transaction for all members. 
+	Reading through the group address is not recommended because all 
+	members respond. 
+	
+	write_each() writes different values for each member. The most 
+	common value is sent once through the group address and others are 
+	written to each device. 
+
+	Register shadows of the members are updated by writes through the 
+	group. 
+
+	Examples
+	--------
+	>>> mtrs	= [ PCA9629A( i2c, address = a >> 1 ) for a in ( 0x40, 0x42, 0x44 ) ]
+	>>> all_mtr	= DeviceGroup( mtrs, 0xE0 >> 1, sub = 0 )	# ALLCALLADR
+	>>> all_mtr.stop()										# one transaction for all
+	>>> all_mtr.write_each( "CWSCOUNTL", [ 48, 48, 96 ] )	# 2 transactions
+
+	"""
+	ADDR_REG	= ( "ALLCALLADR", "SUBADR1", "SUBADR2", "SUBADR3" )
+	MODE_BIT	= ( 0x01, 0x08, 0x04, 0x02 )	#	ALLCALL, SUB1, SUB2 and SUB3 bits in MODE/MODE1 register
+
+	def __init__( self, members, address, sub = 1, program = True ):
+		"""
+		DeviceGroup initializer
+	
+		Parameters
+		----------
+		members : list
+			I2C_target instances of a device class on same bus
+		address : int
+			Group address (7 bit)
+		sub : int, option
+			0 for ALLCALLADR, 1 to 3 for SUBADR1 to SUBADR3
+		program : bool, option
+			Write the address and enable it in members' MODE/MODE1 register. 
+			False if the devices have been set already (like default 
+			ALLCALLADR). 
+
+		"""
+		self.members	= members
+		self.address	= address
+
+		m	= members[ 0 ]
+
+		if program:
+			mode	= "MODE1" if "MODE1" in m.REG_NAME else "MODE"
+			bit		= self.MODE_BIT[ sub ]
+
+			for d in members:
+				d.write_registers( self.ADDR_REG[ sub ], address << 1 )
+				d.bit_operation( mode, bit, bit )
+
+		#	target is a copy of a member with the group address. 
+		#	its initializer is not called to avoid writing initial settings
+		t	= object.__new__( m.__class__ )
+		
+		for k, v in m.__dict__.items():
+			setattr( t, k, v[ : ] if type( v ) in ( list, bytearray ) else v )
+			
+		I2C_target.__init__( t, m.__if, address, auto_increment_flag = m.__ai, ignore_fail = m.ignore_fail, mem_access = m.mem_access )
+		
+		t.shadow_enable( True )
+		t.shadow_update		= self.__shadow_update
+		t.shadow_invalidate	= self.__shadow_invalidate
+		
+		self.target	= t
+
+	def __getattr__( self, name ):
+		return getattr( self.target, name )
+
+	def __shadow_update( self, reg, data ):
+		for d in ( self.target, ) + tuple( self.members ):
+			d.__class__.shadow_update( d, reg, data )
+
+	def __shadow_invalidate( self, reg = None, length = 1 ):
+		for d in ( self.target, ) + tuple( self.members ):
+			d.__class__.shadow_invalidate( d, reg, length )
+
+	def write_each( self, reg, values ):
+		"""
+		write registers with a value for each member
+		
+		The most common value is written once through the group address 
+		(if 2 or more members have it) and other values are written to 
+		each device. 
+	
+		Parameters
+		----------
+		reg : string or int
+			Register name or register address/pointer.
+		values : list
+			Data for each member (int or list for multiple bytes)
+
+		Returns
+		-------
+		int : number of transactions
+
+		"""
+		keys	= [ v if type( v ) == int else tuple( v ) for v in values ]
+		common	= max( keys, key = keys.count )
+		n		= 0
+
+		if 1 < keys.count( common ):
+			self.target.write_registers( reg, values[ keys.index( common ) ] )
+			n	+= 1
+		else:
+			common	= None
+
+		for d, k, v in zip( self.members, keys, values ):
+			if k != common:
+				d.write_registers( reg, v )
+				n	+= 1
+		
+		return n
@@ -0,0 +1,294 @@
+from	utime					import	sleep_ms
+from	nxp_periph.interface	import	_owner
+from	nxp_periph.bus_scan	import	bus_scanner
+
+def _reg_match( i2c, address, *checks ):
+	"""
+	identity probe by register values
+	
+	checks : tuples of ( register, bytes, mask, value ). Register value 
+	is read as big-endian integer. 
+	"""
+	for reg, n, mask, value in checks:
+		if int.from_bytes( i2c.readfrom_mem( address, reg, n ), "big" ) & mask != value:
+			return False
+
+	return True
+
+def _version_match( i2c, address, command, prefix ):
+	"""
+	identity probe by a version string read after a command
+	"""
+	i2c.writeto( address, bytes( [ command ] ) )
+	sleep_ms( 1 )
+
+	return i2c.readfrom( address, len( prefix ) ) == prefix
+
+class device_discovery:
+	"""
+	Device discovery and driver instantiation
+	
+	Finds devices by a bus scan and identifies them by identity probes 
+	in SIGNATURES: ID registers ("WHO_AM_I") or register signatures 
+	(reset values of registers). The probes only read registers and 
+	each entry is tried only in documented address range of the part. 
+	First matching entry for the address is taken. 
+	Parts which need a command write to be identified (VERSION_PROBES, 
+	like SC18IS606) are probed only if the class is in "options" and 
+	the address didn't match any register signature. 
+	Parts which cannot be told apart by registers (like LM75B and 
+	PCT2075 after their settings are changed) can be given by "hints". 
+	Only matching driver classes are loaded and instantiated. The 
+	topology (address and class name) can be saved to a file. In next 
+	boot, discover() checks only the saved addresses and skips the 
+	probes if all of those respond. 
+	Responding addresses which were not identified are in "unknown". 
+	Devices which failed in instantiation (bus error or invalid 
+	setting) are in "failed" with the exception. 
+
+	Examples
+	--------
+	>>> dd		= device_discovery( i2c, hints = { 0x48: "PCT2075" } )
+	>>> devices	= dd.discover( "i2c0" )
+	>>> dd.topology
+	[ ( 0x1F, "FXOS8700" ), ( 0x48, "PCT2075" ) ]
+
+	"""
+	FILE		= "devices.json"
+
+	#	PCA9955B/PCA9956B addresses set by AD0-AD2 pins on NXP boards (OM13321: 0x01 and 
+	#	0x02, PCA9955BTW-ARD: 0x5E) and in examples (0x03). Other settings are given by hints
+	PCA995xB_ADDRS	= ( 0x01, 0x02, 0x03, 0x5E )
+
+	#	class name, addresses and register checks ( register, bytes, mask, value ). in order of probing
+	SIGNATURES	= (
+					( "FXOS8700",	range( 0x1C, 0x20 ),	( ( 0x0D, 1, 0xFF, 0xC7 ), ) ),	#	WHO_AM_I
+					( "FXLS8974",	( 0x18, 0x19 ),			( ( 0x13, 1, 0xFF, 0x86 ), ) ),	#	WHO_AM_I
+					( "PCAL6534",	( 0x22, 0x23 ),			( ( 0x08, 1, 0xFF, 0xFF ), ( 0x0F, 1, 0xFF, 0xFF ), ( 0x0A, 1, 0xFF, 0x00 ) ) ),
+					( "PCAL6524",	( 0x22, 0x23 ),			( ( 0x08, 1, 0xFF, 0x00 ), ( 0x0C, 1, 0xFF, 0xFF ), ( 0x40, 1, 0xFF, 0xFF ) ) ),
+					( "PCAL6416",	( 0x20, 0x21 ),			( ( 0x02, 1, 0xFF, 0xFF ), ( 0x04, 1, 0xFF, 0x00 ), ( 0x06, 1, 0xFF, 0xFF ), ( 0x40, 1, 0xFF, 0xFF ) ) ),
+					( "PCAL6408",	( 0x20, 0x21 ),			( ( 0x02, 1, 0xFF, 0x00 ), ( 0x03, 1, 0xFF, 0xFF ), ( 0x40, 1, 0xFF, 0xFF ) ) ),
+					( "P3T1755",	range( 0x48, 0x50 ),	( ( 0x01, 1, 0xFF, 0x28 ), ( 0x02, 2, 0xFFFF, 0x4B00 ), ( 0x03, 2, 0xFFFF, 0x5000 ) ) ),
+					( "PCT2075",	range( 0x48, 0x50 ),	( ( 0x01, 1, 0xFF, 0x00 ), ( 0x02, 2, 0xFFFF, 0x4B00 ), ( 0x03, 2, 0xFFFF, 0x5000 ), ( 0x04, 1, 0xFF, 0x00 ) ) ),
+					( "LM75B",		range( 0x48, 0x50 ),	( ( 0x01, 1, 0xFF, 0x00 ), ( 0x02, 2, 0xFFFF, 0x4B00 ), ( 0x03, 2, 0xFFFF, 0x5000 ) ) ),
+					( "PCF2131",	( 0x53, ),				( ( 0x05, 1, 0xFF, 0x24 ), ( 0x31, 1, 0xFF, 0x3F ), ( 0x32, 1, 0xFF, 0x07 ), ( 0x33, 1, 0xFF, 0x3F ), ( 0x34, 1, 0xFF, 0x07 ) ) ),	#	SR_Reset, INT masks
+					( "PCA9632",	( 0x62, ),				( ( 0x09, 1, 0xFF, 0xE2 ), ( 0x0A, 1, 0xFF, 0xE4 ), ( 0x0B, 1, 0xFF, 0xE8 ), ( 0x0C, 1, 0xFF, 0xE0 ) ) ),	#	SUBADR1-3, ALLCALLADR
+					( "PCA9955B",	PCA995xB_ADDRS,			( ( 0x00, 1, 0x80, 0x80 ), ( 0x01, 1, 0x07, 0x05 ), ( 0x3F, 1, 0xFF, 0x08 ) ) ),	#	MODE1 AIF, MODE2, OFFSET
+					( "PCA9956B",	PCA995xB_ADDRS,			( ( 0x00, 1, 0x80, 0x80 ), ( 0x01, 1, 0x07, 0x05 ), ( 0x3A, 1, 0xFF, 0x08 ) ) ),	#	MODE1 AIF, MODE2, OFFSET
+					)
+
+	#	class name, addresses, command and version string prefix. probed only if the class is in "options"
+	VERSION_PROBES	= (
+					( "SC18IS606",	range( 0x28, 0x30 ),	0xFE, b"SC18IS60" ),	#	Read Version
+					)
+
+	def __init__( self, i2c, hints = None, options = None, signatures = None ):
+		"""
+		device_discovery initializer
+	
+		Parameters
+		----------
+		i2c : obj
+			machine.I2C or bus_owner instance. The instances are made 
+			on this
+		hints : dict, option
+			Address and class name for the parts which are not found 
+			by the probes. The address is not probed
+		options : dict, option
+			Class name and keyword arguments for its initializer (like 
+			{ "PCAL6416": { "setup_EVB": True } }). Classes in 
+			VERSION_PROBES are probed only if those are given here
+		signatures : tuple, option
+			Probe table. SIGNATURES if not given
+
+		"""
+		self.i2c		= i2c
+		self.hints		= hints if hints else {}
+		self.options	= options if options else {}
+		self.signatures	= signatures if signatures else self.SIGNATURES
+		self.topology	= []
+		self.devices	= []
+		self.unknown	= []
+		self.failed		= []
+
+	def probe( self ):
+		"""
+		scan the bus and identify the devices
+		
+		Returns
+		-------
+		list : topology. tuples of address and class name
+
+		"""
+		found	= bus_scanner( self.i2c, ttl_ms = 0 ).scan()
+		
+		if _owner( self.i2c ):
+			self.i2c.run( self.__identify_all, self.i2c.bus, found )
+		else:
+			self.__identify_all( self.i2c, found )
+		
+		return self.topology
+
+	def __identify_all( self, i2c, found ):
+		self.topology	= []
+		self.unknown	= []
+		
+		for a in found:
+			name	= self.hints.get( a ) or self.__identify( i2c, a )
+			
+			if name:
+				self.topology	+= [ ( a, name ) ]
+			else:
+				self.unknown	+= [ a ]
+
+	def __identify( self, i2c, address ):
+		for name, addresses, checks in self.signatures:
+			if address not in addresses:
+				continue
+			
+			try:
+				if _reg_match( i2c, address, *checks ):
+					return name
+			except OSError:
+				pass
+		
+		for name, addresses, command, prefix in self.VERSION_PROBES:
+			if name not in self.options or address not in addresses:
+				continue
+			
+			try:
+				if _version_match( i2c, address, command, prefix ):
+					return name
+			except OSError:
+				pass
+
+		return None
+
+	def instantiate( self ):
+		"""
+		make driver instances of the topology
+		
+		Returns
+		-------
+		list : driver instances
+
+		"""
+		import	nxp_periph
+
+		self.devices	= []
+		self.failed		= []
+		
+		for a, name in self.topology:
+			try:
+				cls				= getattr( nxp_periph, name )
+				self.devices   += [ cls( self.i2c, address = a, **self.options.get( name, {} ) ) ]
+			except ( OSError, ValueError ) as e:
+				self.failed	   += [ ( a, name, e ) ]
+		
+		return self.devices
+
+	def discover( self, name = None, path = None ):
+		"""
+		find devices and make the driver instances
+		
+		If "name" is given, saved topology is used when all of its 
+		devices respond. Otherwise probe() is done and the result is 
+		saved. 
+	
+		Parameters
+		----------
+		name : str, option
+			Name of the bus as the key in the saved file. The topology 
+			is not saved if not given
+		path : str, option
+			File name. FILE if not given
+
+		Returns
+		-------
+		list : driver instances
+
+		"""
+		if not (name and self.restore( name, path )):
+			self.probe()
+
+			if name:
+				self.save( name, path )
+			
+		return self.instantiate()
+
+	def save( self, name, path = None ):
+		"""
+		save the topology
+		
+		The file keeps topologies of buses by name. Other buses in the 
+		file are kept. 
+	
+		Parameters
+		----------
+		name : str
+			Name of the bus
+		path : str, option
+			File name. FILE if not given
+
+		"""
+		import	ujson
+		
+		path	= path if path else self.FILE
+		
+		try:
+			with open( path ) as f:
+				saved	= ujson.load( f )
+		except ( OSError, ValueError ):
+			saved	= {}
+
+		saved[ name ]	= self.topology
+		
+		with open( path, "w" ) as f:
+			ujson.dump( saved, f )
+
+	def restore( self, name, path = None ):
+		"""
+		take saved topology if all of its devices respond
+	
+		Parameters
+		----------
+		name : str
+			Name of the bus
+		path : str, option
+			File name. FILE if not given
+
+		Returns
+		-------
+		bool : True if the saved topology is taken
+
+		"""
+		import	ujson
+		
+		try:
+			with open( path if path else self.FILE ) as f:
+				topology	= ujson.load( f ).get( name )
+		except ( OSError, ValueError ):
+			return False
+
+		if not topology:
+			return False
+
+		if _owner( self.i2c ):
+			present	= self.i2c.run( self.__present, self.i2c.bus, topology )
+		else:
+			present	= self.__present( self.i2c, topology )
+
+		if present:
+			self.topology	= [ ( a, n ) for a, n in topology ]
+			self.unknown	= []
+
+		return present
+
+	def __present( self, i2c, topology ):
+		for a, n in topology:
+			try:
+				i2c.writeto( a, b"" )
+			except OSError:
+				return False
+
+		return True
@@ -1,9 +1,383 @@
+import	sys
+from	utime		import	ticks_us, ticks_ms, ticks_add, ticks_diff, sleep_us
+
+class _null_context:
+	"""
+	Interface.hold() context for devices not on a bus_owner
+	"""
+	def __enter__( self ):
+		return self
+
+	def __exit__( self, exc_type, exc_value, traceback ):
+		return False
+
+_no_hold	= _null_context()
+
+def _owner( bus ):
+	"""
+	bus_owner given as a bus, or None
+	
+	bus_owner is not imported here. No instance of it can exist while 
+	"bus_access" module is not loaded. 
+	"""
+	m	= sys.modules.get( "nxp_periph.bus_access" )
+	
+	return bus if m and isinstance( bus, m.bus_owner ) else None
+
 class Interface:
 	"""
 	An abstraction class to provide common methods for devices
 	"""
+	_reg_map	= ( None, None, None )
+
+	REG_VOLATILE	= {}
+	shadow_regs		= None
+
+	BURST_WRITE		= True
+	BATCH_ORDERED	= False
+
+	FIELDS			= {}		#	bit-fields: name and ( register, shift, width[, enum] )
+	_fields_reverse	= ( None, None )
+
+	DUMP_GAP		= 8			#	reserved holes up to this length are read in a burst
+	DUMP_SPLIT		= ()		#	addresses which auto-increment doesn't reach from previous address
+	AI_BLOCK		= 0			#	auto-increment wraps in aligned blocks of this length (BURST_WRITE = False)
+	AI_END			= None		#	auto-increment doesn't reach this register and following
+	WRITE_ONLY		= ()		#	registers not to be read in dump
+	SNAPSHOT_SKIP	= ()		#	registers not to be restored
+	SNAPSHOT_LAST	= ()		#	registers to be restored after others, in this order
+	_dump_plan		= ( None, None )
+	_snapshot_plan	= ( None, None )
+	batching		= None
+
+	owner			= None
+	tracer			= None
+
+	@classmethod
+	def reg_map( cls ):
+		"""
+		register name/address lookup tables of the class
+		
+		The tables are built from REG_NAME at first use and kept in the 
+		class. So all instances of a class share them and the build is 
+		done only once. If a sub-class defines its own REG_NAME, its own 
+		tables are built for it. 
+		When a name appears multiple times in REG_NAME (like "reserved"), 
+		the first address is taken as same as REG_NAME.index() does. 
+		If the REG_NAME is a register_map, its own lookup is used. 
+
+		Returns
+		-------
+		dict : register name to address/pointer
+		dict : register address/pointer to name
+
+		"""
+		rm	= cls._reg_map
+
+		if rm[ 0 ] is not cls.REG_NAME:
+			if isinstance( cls.REG_NAME, register_map ):
+				rm	= ( cls.REG_NAME, cls.REG_NAME.addresses(), cls.REG_NAME )
+			else:
+				n2a	= {}
+				a2n	= {}
+				for i, name in enumerate( cls.REG_NAME ):
+					if name not in n2a:
+						n2a[ name ]	= i
+					a2n[ i ]	= name
+
+				rm	= ( cls.REG_NAME, n2a, a2n )
+
+			cls._reg_map	= rm
+		
+		return rm[ 1 ], rm[ 2 ]
+
+	def reg_addr( self, reg ):
+		"""
+		register address/pointer from register name
+	
+		Parameters
+		----------
+		reg : string or int
+			Register name or register address/pointer.
+			
+		Returns
+		-------
+		int : register address/pointer
+
+		"""
+		if type( reg ) == int:
+			return reg
+
+		rm	= self._reg_map
+		if rm[ 0 ] is not self.REG_NAME:
+			return self.reg_map()[ 0 ][ reg ]
+
+		return rm[ 1 ][ reg ]
+
+	def shadow_enable( self, enable = True ):
+		"""
+		enable/disable register shadow
+		
+		When the shadow is enabled, last written value of each register is 
+		kept in the instance and read-modify-write by bit_operation() is done 
+		with single write (no bus read). 
+		Volatile registers declared in REG_VOLATILE are not kept in the 
+		shadow. The REG_VOLATILE is a dict of register name and bit mask. 
+		A mask of 0xFF means whole register is volatile (always read from 
+		device). Other mask value means the bits are volatile (read-only 
+		or self-clearing) and those bits are written as 0 in read-modify-write. 
+
+		Parameters
+		----------
+		enable : bool, option
+			True to enable, False to disable and discard the shadow.
+
+		"""
+		if enable:
+			self.shadow_volatile	= { self.reg_addr( r ): m for r, m in self.REG_VOLATILE.items() }
+			self.shadow_regs		= {}
+		else:
+			self.shadow_regs		= None
+
+	def shadow_update( self, reg, data ):
+		"""
+		record written value in shadow
+		
+		Called from register writing methods after the transfer. 
+		Nothing done if the shadow is disabled. 
+
+		Parameters
+		----------
+		reg : int
+			Register address/pointer.
+		data : int, list, bytearray or memoryview
+			Written data. Multiple bytes are recorded for consecutive 
+			register addresses.
+
+		"""
+		sr	= self.shadow_regs
+
+		if sr is None:
+			return
+
+		if type( data ) == int:
+			data	= ( data, )
+
+		for v in data:
+			m	= self.shadow_volatile.get( reg, 0x00 )
+			if 0xFF != m:
+				sr[ reg ]	= v & ~m & 0xFF
+			reg	+= 1
+
+	def shadow_invalidate( self, reg = None, length = 1 ):
+		"""
+		invalidate shadow
+		
+		Call this after events which change the register values without 
+		driver access, like device reset or general-call. 
+		Next read-modify-write on invalidated registers are done with bus read. 
+
+		Parameters
+		----------
+		reg : string, int or None, option
+			Register name or register address/pointer. 
+			If None, whole shadow is invalidated. 
+		length : int, option
+			Number of registers to be invalidated from the reg.
+
+		"""
+		sr	= self.shadow_regs
+
+		if sr is None:
+			return
+
+		if reg is None:
+			sr.clear()
+			return
+
+		reg	= self.reg_addr( reg )
+		for r in range( reg, reg + length ):
+			sr.pop( r, None )
+
+	def shadow_resync( self ):
+		"""
+		update shadow by reading registers from device
+		
+		All registers kept in the shadow are read and updated.
+
+		"""
+		sr	= self.shadow_regs
+
+		if sr is None:
+			return
+
+		for r in list( sr ):
+			v	= self.read_registers( r, 1 )
+			if v is None:
+				sr.pop( r )
+			else:
+				sr[ r ]	= v & ~self.shadow_volatile.get( r, 0x00 ) & 0xFF
+
+	def batch( self ):
+		"""
+		register write batching context
+		
+		In the "with" block, write_registers() calls are queued and not 
+		performed. At the end of the block, the queued writes are sorted by 
+		register address and adjacent registers are merged into single 
+		multi-byte transfers (using auto increment). If a register is 
+		written multiple times, only last value is written. Merging 
+		doesn't go over the auto-increment limits (see ai_reach()) and 
+		WRITE_ONLY registers are written separately. 
+
+		Devices which cannot do multi-byte register writing have 
+		BURST_WRITE = False. Their queued writes are done one by one. 
+		If a list is written to those, all queued writes are done in 
+		queued order because the list may cover following registers. 
+		Devices which need the writing order kept have BATCH_ORDERED = True. 
+		Their queued writes are not sorted and only consecutive addresses 
+		in queued order are merged. 
+		
+		Register reads in the block are done immediately. So don't put 
+		writes which need to be done before reads in the block. 
+		If an exception is raised in the block, queued writes are discarded. 
+
+		Returns
+		-------
+		register_batch : context manager
+		
+		Examples
+		--------
+		with led_c.batch():
+			led_c.write_registers( "PWM0", 0x10 )
+			led_c.write_registers( "PWM1", 0x20 )	# PWM0 and PWM1 written in one transfer
+
+		"""
+		return register_batch( self )
+
+	def hold( self ):
+		"""
+		context to keep a sequence of transactions together
+		
+		If the device is on a bus_owner, requests queued by defer() are 
+		not run until the end of the "with" block. Nothing is done if 
+		not on a bus_owner. 
+
+		Returns
+		-------
+		obj : context manager
+
+		Examples
+		--------
+		with afe.hold():
+			afe.write_r16( 0x2000 )
+			v	= afe.read_r24( 0x2040 )
+
+		"""
+		return self.owner if self.owner else _no_hold
+
+	def defer( self, func, arg = 0, priority = 1 ):
+		"""
+		run a function later, when the bus is free
+		
+		Use this in timer callbacks or interrupt handlers instead of 
+		micropython.schedule(). If the device is on a bus_owner, the 
+		function is queued with priority and run when current bus 
+		transaction is finished. If not, micropython.schedule() is used. 
+
+		Parameters
+		----------
+		func : callable
+			Function to be called with an argument
+		arg : any, option
+			Argument for the func
+		priority : int, option
+			bus_owner.REALTIME, bus_owner.NORMAL or bus_owner.UI
+
+		"""
+		if self.owner:
+			self.owner.request( func, arg, priority )
+		else:
+			from micropython	import	schedule
+			schedule( func, arg )
+
+	async def awrite_registers( self, reg, data ):
+		"""
+		writing registers (async version)
+		
+		Other tasks in the event loop are run before the transfer. 
+		The transfer itself is done by write_registers() and blocks the 
+		event loop while the bus is busy (bus time is not overlapped 
+		with other tasks). 
+		
+		Parameters
+		----------
+		reg : string or int
+			Register name or register address/pointer.
+		data : list or int
+			Data for sending.
+
+		Examples
+		--------
+		await led_c.awrite_registers( "PWM0", 0xFF )
+
+		"""
+		import	uasyncio
+
+		await uasyncio.sleep_ms( 0 )
+		self.write_registers( reg, data )
+
+	async def aread_registers( self, reg, length, *args, **kwargs ):
+		"""
+		reading registers (async version)
+		
+		Other tasks in the event loop are run before the transfer. 
+		The transfer itself is done by read_registers() and blocks the 
+		event loop while the bus is busy (bus time is not overlapped 
+		with other tasks). Additional arguments are passed to 
+		read_registers(). 
+		
+		Parameters
+		----------
+		reg : string or int
+			Register name or register address/pointer.
+		length : int
+			Number of bytes for receiveing.
+
+		Returns
+		-------
+		int or list : same as read_registers()
+
+		Examples
+		--------
+		data = await accel.aread_registers( "OUT_X_MSB", 6 )
+
+		"""
+		import	uasyncio
+
+		await uasyncio.sleep_ms( 0 )
+		return self.read_registers( reg, length, *args, **kwargs )
+
+	@property
+	def fields( self ):
+		"""
+		bit-field access by the names in FIELDS
+
+		Returns
+		-------
+		obj : register_fields instance
+
+		Examples
+		--------
+		>>> accel.fields.update( FSR = 8, ACTIVE = 1 )
+		>>> accel.fields[ "FSR" ]
+		8
+
+		"""
+		return register_fields( self )
+
 #	@classmethod
-	def bit_operation( self, reg, target_bits, value ):
+	def bit_operation( self, reg, target_bits, value, skip_same = False ):
 		"""
 		register bit set/clear
 	
@@ -17,29 +391,46 @@ class Interface:
 			set/clear value.
 			The bits only set/cleared with same position at
 			1 in target_bits.
+		skip_same : bool, option
+			If True, the write is skipped when the value is not changed. 
+			Don't use this for self-clearing or write-1-to-clear bits. 
 			
 		Returns
 		-------
 		int : register value before modifying
 		int : register value after modifying
 
+		If the register is kept in the shadow, the register value before 
+		modifying is taken from the shadow (volatile bits are 0). 
+		None is returned if the device doesn't respond. Accesses to a 
+		dead device go through same probe as other register accesses 
+		(see retry_policy). 
+
 		"""
+		with self.hold():	#	queued requests don't run between the read and write
+			reg	= self.reg_addr( reg )
+			sr	= self.shadow_regs
 
-		if not self.live:
-			return
+			bt	= self.batching
+			rv	= None if bt is None else bt.pending( reg )
+
+			if rv is not None:
+				pass
+			elif sr is not None and reg in sr:
+				rv	= sr[ reg ]
+			else:
+				rv	= self.read_registers( reg, 1 )
+
+				if rv is None:
+					return None
 
-		try:
-			reg	= self.REG_NAME.index( reg ) if type( reg ) != int else reg
-			rv	= self.read_registers( reg, 1 )
 			wv	= rv
 			
 			wv	&= ~(target_bits & ~value)
 			wv	|=  (target_bits &  value)
 
-			self.write_registers( reg, wv )
-		except Exception as e:
-			self.live	= False
-			rv, wv		= 0, 0
+			if not (skip_same and wv == rv):
+				self.write_registers( reg, wv )
 		
 		return rv, wv
 
@@ -53,10 +444,115 @@ class Interface:
 			Register name
 
 		"""
-		r	= self.REG_NAME.index( reg_name )
+		r	= self.reg_addr( reg_name )
 		rv	= self.read_registers( r, 1 )
 		print( "{:16} (0x{:02X}) : 0x{:02X}".format( reg_name, r, rv ) )
 
+	@classmethod
+	def ai_reach( cls, start, end, adr ):
+		"""
+		check if auto-increment reaches an address
+		
+		A burst from "start" which reached "end" can be continued to 
+		"adr" if the device has auto-increment and no DUMP_SPLIT address, 
+		AI_BLOCK boundary or AI_END is in between. 
+
+		Parameters
+		----------
+		start : int
+			Start address of the burst
+		end : int
+			Next address of the burst
+		adr : int
+			Address to be reached
+
+		Returns
+		-------
+		bool : True if the burst can be continued to adr
+
+		"""
+		if not (cls.BURST_WRITE or cls.AI_BLOCK):
+			return False
+
+		if cls.AI_END is not None and cls.reg_map()[ 0 ].get( cls.AI_END, cls.AI_END ) <= adr:
+			return False
+
+		if any( end <= s <= adr for s in cls.DUMP_SPLIT ):
+			return False
+
+		return cls.BURST_WRITE or start // cls.AI_BLOCK == adr // cls.AI_BLOCK
+
+	@classmethod
+	def dump_plan( cls ):
+		"""
+		register reads to cover all readable registers
+		
+		Bursts are planned from REG_NAME and the class settings: 
+		reserved addresses, WRITE_ONLY registers and registers without 
+		READ access in a register_map are not read. Small reserved holes 
+		(up to DUMP_GAP) are read in a burst. A burst doesn't go over 
+		DUMP_SPLIT addresses, AI_BLOCK boundaries or AI_END. Devices 
+		without auto-increment (BURST_WRITE = False and no AI_BLOCK) 
+		are read one register by one. 
+		The plan is made at first use and kept in the class. 
+
+		Returns
+		-------
+		list : tuples of start address and length
+
+		"""
+		plan	= cls._dump_plan
+
+		if plan[ 0 ] is cls:
+			return plan[ 1 ]
+
+		rn		= cls.REG_NAME
+		n2a		= cls.reg_map()[ 0 ]
+		acc		= rn.access if isinstance( rn, register_map ) else None
+		skip	= [ n2a[ r ] for r in cls.WRITE_ONLY ]
+		plan	= []
+
+		for adr, name in enumerate( rn ):
+			if name.lower().startswith( "reserved" ) or adr in skip or (acc and not acc( adr ) & register_map.READ):
+				continue
+
+			if plan:
+				start, length	= plan[ -1 ]
+				end				= start + length
+
+				if adr - end <= cls.DUMP_GAP and cls.ai_reach( start, end, adr ):
+					plan[ -1 ]	= ( start, adr + 1 - start )
+					continue
+
+			plan	+= [ ( adr, 1 ) ]
+
+		cls._dump_plan	= ( cls, plan )
+		return plan
+
+	def dump_all( self ):
+		"""
+		read all readable registers following dump_plan()
+	
+		Returns
+		-------
+		list : register data
+			List of integers indexed by register address. 0 for 
+			addresses which are not read. 
+			None if the device doesn't respond. 
+
+		"""
+		rv	= [ 0 ] * len( self.REG_NAME )
+
+		for start, length in self.dump_plan():
+			data	= self.read_registers( start, length )
+
+			if data is None:
+				return None
+
+			rv[ start : start + length ]	= [ data ] if type( data ) == int else data
+
+		return rv
+
 	def dump( self ):
 		"""
 		dump register values
@@ -64,16 +560,192 @@ class Interface:
 		Returns
 		-------
 		list : register data
-			List of integers
+			List of integers indexed by register address
+
+		"""
+		return self.dump_all()
+
+	def integrity_sample( self ):
+		"""
+		register values to check bus integrity (used by bus_tuner)
+		
+		Registers are read by dump_all(). Bits declared in REG_VOLATILE 
+		are masked as 0 because those can change between reads. 
+	
+		Returns
+		-------
+		list : register data or None if the device doesn't respond
+
+		"""
+		rv	= self.dump_all()
+		
+		if rv is None:
+			return None
+		
+		for r, m in self.REG_VOLATILE.items():
+			a		= self.reg_addr( r )
+			rv[ a ]	&= ~m
+		
+		return rv
+
+	def snapshot_plan( self ):
+		"""
+		register writes to restore writable register state
+		
+		Registers in dump_plan() are taken except reserved, volatile 
+		(REG_VOLATILE mask 0xFF), SNAPSHOT_SKIP registers and registers 
+		without WRITE access in a register_map. Consecutive registers 
+		are written in a burst within the auto-increment limits (same 
+		as dump_plan()). SNAPSHOT_LAST registers are written after 
+		those, one by one in its order (like a register to start the 
+		operation). 
+		The plan is made at first use and kept in the class. 
+
+		Returns
+		-------
+		list : tuples of start address and length
+
+		"""
+		cls		= self.__class__
+		plan	= cls._snapshot_plan
+
+		if plan[ 0 ] is cls:
+			return plan[ 1 ]
+
+		rn		= cls.REG_NAME
+		acc		= rn.access if isinstance( rn, register_map ) else None
+		last	= [ self.reg_addr( r ) for r in cls.SNAPSHOT_LAST ]
+		skip	= [ self.reg_addr( r ) for r, m in self.REG_VOLATILE.items() if 0xFF == m ]
+		skip   += [ self.reg_addr( r ) for r in cls.SNAPSHOT_SKIP ] + last
+		plan	= []
+
+		for start, length in self.dump_plan():
+			for adr in range( start, start + length ):
+				if rn[ adr ].lower().startswith( "reserved" ) or adr in skip or (acc and not acc( adr ) & register_map.WRITE):
+					continue
+
+				if plan:
+					s, n	= plan[ -1 ]
+
+					if adr == s + n and cls.ai_reach( s, adr, adr ):
+						plan[ -1 ]	= ( s, n + 1 )
+						continue
+
+				plan	+= [ ( adr, 1 ) ]
+
+		plan	+= [ ( adr, 1 ) for adr in last ]
+
+		cls._snapshot_plan	= ( cls, plan )
+		return plan
+
+	def snapshot( self ):
+		"""
+		capture writable register state
+		
+		The snapshot is a compact binary: class name (1 byte length and 
+		the name), 2 bytes data length and data (register values by 
+		snapshot_data()). 
+		It can be saved on flash or in an EEPROM and written back by 
+		restore() after reset. See also snapshot_all(). 
+	
+		Returns
+		-------
+		bytes : snapshot. Data is empty if the device doesn't respond
+
+		"""
+		from ustruct	import	pack
+
+		data	= self.snapshot_data()
+		data	= data if data else b""
+		
+		name	= self.__class__.__name__.encode()
+		
+		return pack( "<B", len( name ) ) + name + pack( "<H", len( data ) ) + data
+
+	def snapshot_data( self ):
+		"""
+		register values for snapshot()
+		
+		Registers in snapshot_plan() are read by dump_all(). Volatile 
+		bits are masked as 0. 
+	
+		Returns
+		-------
+		bytes : register values or None if the device doesn't respond
+
+		"""
+		rv	= self.dump_all()
+		
+		if rv is None:
+			return None
+
+		vm		= { self.reg_addr( r ): m for r, m in self.REG_VOLATILE.items() }
+		data	= bytearray()
+
+		for start, length in self.snapshot_plan():
+			for adr in range( start, start + length ):
+				data.append( rv[ adr ] & ~vm.get( adr, 0x00 ) & 0xFF )
+
+		return bytes( data )
+
+	def restore( self, blob ):
+		"""
+		write back a snapshot
+	
+		Parameters
+		----------
+		blob : bytes, bytearray or memoryview
+			Snapshot made by snapshot(). Data following the snapshot is 
+			ignored
+
+		Returns
+		-------
+		int : length of the snapshot in the blob
+
+		"""
+		from ustruct	import	unpack
+
+		name	= self.__class__.__name__.encode()
+		n		= blob[ 0 ] + 1
+		
+		if bytes( blob[ 1 : n ] ) != name:
+			raise ValueError( "snapshot is not for {}".format( self.__class__.__name__ ) )
+		
+		length	= unpack( "<H", blob[ n : n + 2 ] )[ 0 ]
+		n	   += 2
+		
+		if length:
+			self.restore_data( blob[ n : n + length ] )
+		
+		return n + length
+
+	def restore_data( self, data ):
+		"""
+		write register values taken by snapshot_data()
+		
+		Registers are written following snapshot_plan(). 
+	
+		Parameters
+		----------
+		data : bytes, bytearray or memoryview
+			Register values
 
 		"""
-		return self.read_registers( 0, len( self.REG_NAME ) )
+		plan	= self.snapshot_plan()
+		
+		if len( data ) != sum( n for s, n in plan ):
+			raise ValueError( "snapshot doesn't match registers of {}".format( self.__class__.__name__ ) )
+
+		p	= 0
+		for start, length in plan:
+			self.write_registers( start, data[ p ] if 1 == length else data[ p : p + length ] )
+			p	+= length
 
 	def dump_reg( self ):
 		"""
 		showing all register name, address/pointer and value
 		"""
-		rv		= self.dump()
+		rv		= self.dump_all()
 		length	= len( rv )
 
 		index	= [ (i // 2) if 0 == i % 2 else (i // 2) + ((length + 1) // 2) for i in range( length ) ]
@@ -96,24 +768,499 @@ class Interface:
 		"""
 		device information
 
-		Returns
-		-------
-		string : device information
+		Returns
+		-------
+		string : device information
+		"""
+		return "an instance of {}, {}".format( self.__class__.__name__, self.dev_access() )
+	
+	def dev_access( self ):
+		"""
+		device access information
+
+		Returns
+		-------
+		string : device access information
+		"""
+		if hasattr( self, "__adr" ):
+			return "target address 0x{:02X} (0x{:02X})".format( self.__adr, self.__adr << 1 )
+		elif hasattr( self, "__cs" ):
+			return "cs_pin@{}".format( self.__cs )
+
+class register_map:
+	"""
+	Compact register map for devices with sparse register addresses
+	
+	Register names are kept in blocks of consecutive addresses. No 
+	"reserved" padding is needed between blocks. Access flags and 
+	widths are packed in bytes. An instance is made as REG_NAME in 
+	class definition and shared by all instances of the device class. 
+
+	It works as a sequence of register names indexed by address 
+	(like REG_NAME tuple). Addresses without register return "reserved". 
+
+	Examples
+	--------
+	>>> REG_NAME	= register_map( { 0x00: ( "Input Port", "Output Port" ), 0x40: ( "Input latch", ) },
+	...								access = { "Input Port": register_map.READ } )
+	>>> REG_NAME.index( "Input latch" )
+	64
+	>>> REG_NAME[ 0x01 ], REG_NAME[ 0x02 ]
+	( "Output Port", "reserved" )
+	>>> REG_NAME.ranges()
+	[ ( 0, 2 ), ( 64, 1 ) ]
+
+	"""
+	RESERVED	= "reserved"
+	READ		= 0x01
+	WRITE		= 0x02
+	READ_WRITE	= READ | WRITE
+
+	def __init__( self, blocks, access = None, width = None ):
+		"""
+		register_map initializer
+	
+		Parameters
+		----------
+		blocks : dict
+			Start address and tuple of register names of each block. 
+			"reserved" in the names is taken as a hole. 
+		access : dict, option
+			Register name and access flags (READ and/or WRITE) for 
+			registers which are not READ_WRITE
+		width : dict, option
+			Register name and width in bytes for registers which are 
+			not 1 byte
+
+		"""
+		start	= sorted( blocks )
+		names	= [ blocks[ a ] for a in start ]
+		names	= tuple( n if type( n ) == tuple else tuple( n ) for n in names )
+		
+		self.__start	= tuple( start )
+		self.__names	= names
+		self.__len		= start[ -1 ] + len( names[ -1 ] ) if start else 0
+		self.__n2a		= None
+		self.__acc		= bytes( access.get( n, self.READ_WRITE ) for b in names for n in b ) if access else None
+		self.__wid		= bytes( width.get( n, 1 ) for b in names for n in b ) if width else None
+
+	def __locate( self, addr ):
+		"""
+		position of register in concatenated blocks, or -1
+		"""
+		pos	= 0
+		for s, n in zip( self.__start, self.__names ):
+			if s <= addr < s + len( n ):
+				return pos + addr - s if n[ addr - s ] != self.RESERVED else -1
+			pos	+= len( n )
+		
+		return -1
+
+	def __len__( self ):
+		return self.__len
+
+	def __getitem__( self, addr ):
+		if not 0 <= addr < self.__len:
+			raise IndexError( "register address out of range" )
+
+		for s, n in zip( self.__start, self.__names ):
+			if s <= addr < s + len( n ):
+				return n[ addr - s ]
+		
+		return self.RESERVED
+
+	def __iter__( self ):
+		addr	= 0
+		for s, n in zip( self.__start, self.__names ):
+			while addr < s:
+				yield self.RESERVED
+				addr	+= 1
+
+			for name in n:
+				yield name
+
+			addr	= s + len( n )
+
+	def __contains__( self, name ):
+		return name in self.addresses()
+
+	def addresses( self ):
+		"""
+		register name to address table
+		
+		The dict is built at first call and kept. 
+
+		Returns
+		-------
+		dict : register name to address/pointer
+
+		"""
+		if self.__n2a is None:
+			self.__n2a	= { name: addr for addr, name in self.items() }
+			
+		return self.__n2a
+
+	def index( self, name ):
+		"""
+		register address from register name
+		
+		Parameters
+		----------
+		name : string
+			Register name
+		
+		Returns
+		-------
+		int : register address/pointer
+
+		"""
+		try:
+			return self.addresses()[ name ]
+		except KeyError:
+			raise ValueError( "no register named {}".format( name ) )
+
+	def items( self ):
+		"""
+		iterate registers (holes are skipped)
+		
+		Returns
+		-------
+		iterator : tuple of address and name of each register
+
+		"""
+		for s, n in zip( self.__start, self.__names ):
+			for i, name in enumerate( n ):
+				if name != self.RESERVED:
+					yield s + i, name
+
+	def access( self, reg ):
+		"""
+		access flags of a register
+		
+		Parameters
+		----------
+		reg : string or int
+			Register name or register address/pointer
+
+		Returns
+		-------
+		int : READ and/or WRITE flags. 0 for address without register
+
+		"""
+		pos	= self.__locate( self.index( reg ) if type( reg ) != int else reg )
+		
+		if pos < 0:
+			return 0
+		
+		return self.__acc[ pos ] if self.__acc else self.READ_WRITE
+
+	def width( self, reg ):
+		"""
+		width of a register in bytes
+		
+		Parameters
+		----------
+		reg : string or int
+			Register name or register address/pointer
+
+		Returns
+		-------
+		int : width in bytes
+
+		"""
+		pos	= self.__locate( self.index( reg ) if type( reg ) != int else reg )
+		
+		return self.__wid[ pos ] if self.__wid and 0 <= pos else 1
+
+	def ranges( self, gap = 0, flags = 0 ):
+		"""
+		address ranges to be dumped
+		
+		Parameters
+		----------
+		gap : int, option
+			Ranges separated by holes of this size or smaller are merged 
+			into one range (the holes are read with the registers). 
+		flags : int, option
+			Registers which don't have all of the access flags are taken 
+			as holes. register_map.READ to skip write-only registers. 
+
+		Returns
+		-------
+		list : tuples of start address and length
+
+		"""
+		r	= []
+		pos	= 0
+		
+		for s, n in zip( self.__start, self.__names ):
+			for i, name in enumerate( n ):
+				f	= self.__acc[ pos + i ] if self.__acc else self.READ_WRITE
+
+				if name == self.RESERVED or (f & flags) != flags:
+					continue
+
+				a	= s + i
+				if r and a - (r[ -1 ][ 0 ] + r[ -1 ][ 1 ]) <= gap:
+					r[ -1 ]	= ( r[ -1 ][ 0 ], a - r[ -1 ][ 0 ] + 1 )
+				else:
+					r	+= [ ( a, 1 ) ]
+
+			pos	+= len( n )
+		
+		return r
+
+class register_fields:
+	"""
+	Bit-field access of a device
+	
+	Fields are defined in FIELDS of device class as a dict of field name 
+	and tuple of register, shift, width and optional enum. The enum is a 
+	dict of value and field setting (like { 2: 0, 4: 1, 8: 2 } for full 
+	scale ranges). 
+	Instance of this class is made by Interface.fields. 
+
+	Examples
+	--------
+	>>> FIELDS	= {	"ACTIVE"	: ( "SENS_CONFIG1", 0, 1 ),
+	...				"FSR"		: ( "SENS_CONFIG1", 1, 2, { 2: 0, 4: 1, 8: 2, 16: 3 } ),
+	...				}
+
+	"""
+
+	def __init__( self, target ):
+		"""
+		register_fields initializer
+	
+		Parameters
+		----------
+		target : obj
+			Interface instance
+
+		"""
+		self.__target	= target
+
+	def __field( self, name ):
+		try:
+			f	= self.__target.FIELDS[ name ]
+		except KeyError:
+			raise KeyError( "no field \"{}\" in {}".format( name, self.__target.__class__.__name__ ) )
+		
+		return f[ 0 ], f[ 1 ], (1 << f[ 2 ]) - 1, f[ 3 ] if 3 < len( f ) else None
+
+	def __reverse( self, name ):
+		"""
+		field setting to value maps of enum fields, kept in the class
+		"""
+		cls	= self.__target.__class__
+		rm	= cls._fields_reverse
+
+		if rm[ 0 ] is not cls:
+			rm	= ( cls, { n: { e: k for k, e in f[ 3 ].items() } for n, f in cls.FIELDS.items() if 3 < len( f ) } )
+			cls._fields_reverse	= rm
+
+		return rm[ 1 ][ name ]
+
+	def update( self, **kwargs ):
+		"""
+		set fields
+		
+		Fields are grouped by register. Each register is updated by one 
+		read-modify-write (bit_operation()). The write is skipped if the 
+		register value is not changed. Writes are done in a batch, so 
+		adjacent registers are written in one transfer. 
+	
+		Parameters
+		----------
+		kwargs : 
+			Field names and values
+
+		Returns
+		-------
+		int : number of registers modified
+
+		"""
+		t		= self.__target
+		regs	= {}
+
+		for name, v in kwargs.items():
+			reg, shift, mask, enum	= self.__field( name )
+			
+			if enum is not None:
+				if v not in enum:
+					raise ValueError( "{} is not a value of field \"{}\"".format( v, name ) )
+				v	= enum[ v ]
+			elif v & ~mask:
+				raise ValueError( "{} is out of range of field \"{}\"".format( v, name ) )
+			
+			reg			= t.reg_addr( reg )
+			bits, value	= regs.get( reg, ( 0, 0 ) )
+			regs[ reg ]	= ( bits | mask << shift, (value & ~(mask << shift)) | v << shift )
+
+		n	= 0
+		
+		with t.batch():
+			for reg, ( bits, value ) in regs.items():
+				rv	= t.bit_operation( reg, bits, value, skip_same = True )
+				n  += 1 if rv and rv[ 0 ] != rv[ 1 ] else 0
+
+		return n
+
+	def read( self, *names ):
+		"""
+		get fields
+		
+		Each register is read once for the fields in it. 
+		ValueError is raised if an enum field has a setting which is 
+		not in its enum (reserved setting). 
+	
+		Parameters
+		----------
+		names : 
+			Field names
+
+		Returns
+		-------
+		dict : field names and values. Values are None if the device 
+			doesn't respond
+
+		"""
+		t		= self.__target
+		regs	= {}
+		rtn		= {}
+
+		for name in names:
+			reg, shift, mask, enum	= self.__field( name )
+			reg	= t.reg_addr( reg )
+			
+			if reg not in regs:
+				regs[ reg ]	= t.read_registers( reg, 1 )
+			
+			if regs[ reg ] is None:
+				rtn[ name ]	= None
+				continue
+
+			v	= (regs[ reg ] >> shift) & mask
+			
+			if enum is not None:
+				try:
+					v	= self.__reverse( name )[ v ]
+				except KeyError:
+					raise ValueError( "field \"{}\" has setting {} which is not in its enum".format( name, v ) )
+				
+			rtn[ name ]	= v
+
+		return rtn
+
+	def __getitem__( self, name ):
+		return self.read( name )[ name ]
+
+	def __setitem__( self, name, value ):
+		self.update( **{ name: value } )
+
+class register_batch:
+	"""
+	A context manager class for register write batching. 
+	Instance of this class is made by Interface.batch(). 
+	"""
+
+	def __init__( self, target ):
+		"""
+		register_batch initializer
+	
+		Parameters
+		----------
+		target : obj
+			Interface instance
+
+		"""
+		self.__target	= target
+		self.__queue	= None
+		self.__nested	= False
+
+	def __enter__( self ):
+		t	= self.__target
+
+		if t.batching is not None:		#	nested batch joins to outer one
+			self.__nested	= True
+			return self
+		
+		self.__queue		= []
+		t.batching			= self
+		t.write_registers	= self.__enqueue
+
+		return self
+
+	def __exit__( self, exc_type, exc_value, traceback ):
+		if self.__nested:
+			return False
+		
+		t	= self.__target
+		del t.write_registers
+		t.batching	= None
+
+		if exc_type is None:
+			self.__flush()
+
+		self.__queue	= None
+		return False
+
+	def pending( self, reg ):
 		"""
-		return "an instance of {}, {}".format( self.__class__.__name__, self.dev_access() )
+		queued value of a register
 	
-	def dev_access( self ):
-		"""
-		device access information
-
+		Parameters
+		----------
+		reg : int
+			Register address/pointer.
+		
 		Returns
 		-------
-		string : device access information
+		int or None : last queued value. None if not queued.
+
 		"""
-		if hasattr( self, "__adr" ):
-			return "target address 0x{:02X} (0x{:02X})".format( self.__adr, self.__adr << 1 )
-		elif hasattr( self, "__cs" ):
-			return "cs_pin@{}".format( self.__cs )
+		for r, v in reversed( self.__queue ):
+			if r == reg:
+				return v if type( v ) == int else None
+		
+		return None
+
+	def __enqueue( self, reg, data ):
+		t	= self.__target
+		reg	= t.reg_addr( reg )
+
+		if type( data ) == int:
+			self.__queue.append( ( reg, data ) )
+		elif t.BURST_WRITE:
+			for i, v in enumerate( data ):
+				self.__queue.append( ( reg + i, v ) )
+		else:
+			self.__queue.append( ( reg, list( data ) ) )
+
+	def __flush( self ):
+		t	= self.__target
+		q	= self.__queue
+
+		if not (t.BATCH_ORDERED or any( type( v ) != int for r, v in q )):
+			q	= sorted( dict( q ).items() )	#	last write wins. list writes may cover following registers: kept in order
+
+		wo		= [ t.reg_addr( r ) for r in t.WRITE_ONLY ]
+		start	= 0
+		data	= []
+
+		for reg, v in q:	#	merged within same auto-increment limits as dump_plan()
+			if (t.BURST_WRITE and data and reg == start + len( data ) and t.ai_reach( start, reg, reg )
+					and reg not in wo and start not in wo):
+				data.append( v )
+				continue
+
+			if data:
+				t.write_registers( start, data if 1 < len( data ) else data[ 0 ] )
+			
+			start, data	= reg, [ v ]
+
+		if data:
+			t.write_registers( start, data if 1 < len( data ) else data[ 0 ] )
 
 class I2C_target_Error( Exception ):
 	"""
@@ -121,6 +1268,58 @@ class I2C_target_Error( Exception ):
 	"""
 	pass
 
+class retry_policy:
+	"""
+	Retry and circuit breaker setting for I2C_target
+	
+	A transaction is tried "tries" times when the bus error is a NACK 
+	or a timeout. Other OSErrors are not retried. Exceptions other than 
+	OSError are not caught (those are not bus errors). 
+	
+	If all tries failed on a device with ignore_fail=True, the device 
+	is marked as dead (live=False). Transactions to the dead device are 
+	skipped without bus access. After "probe_ms", next transaction is 
+	tried once as a probe (half-open). If the probe succeeded, the 
+	device is back to live. If not, the probe interval is doubled up 
+	to "probe_max_ms". 
+
+	Examples
+	--------
+	>>> temp.retry	= retry_policy( tries = 5, backoff_us = ( 0, 100, 1000 ) )
+
+	"""
+	NACK_ERRORS		= ( 19, 5 )		#	ENODEV, EIO
+	TIMEOUT_ERRORS	= ( 110, )		#	ETIMEDOUT
+
+	def __init__( self, tries = 3, backoff_us = ( 0, ), probe_ms = 1000, probe_max_ms = 60000, nack_errors = None, timeout_errors = None ):
+		"""
+		retry_policy initializer
+	
+		Parameters
+		----------
+		tries : int, option
+			Number of tries for a transaction
+		backoff_us : tuple, option
+			Wait time in microseconds before each retry. Last value is 
+			used for further retries. 
+		probe_ms : int, option
+			Interval to probe a dead device. 0 to disable the probe 
+			(device stays dead until ping() or setting live=True). 
+		probe_max_ms : int, option
+			Maximum probe interval
+		nack_errors : tuple, option
+			OSError numbers taken as NACK. NACK_ERRORS if None
+		timeout_errors : tuple, option
+			OSError numbers taken as timeout. TIMEOUT_ERRORS if None
+
+		"""
+		self.tries			= tries
+		self.backoff_us		= backoff_us
+		self.probe_ms		= probe_ms
+		self.probe_max_ms	= probe_max_ms
+		self.nack_errors	= self.NACK_ERRORS if nack_errors is None else nack_errors
+		self.timeout_errors	= self.TIMEOUT_ERRORS if timeout_errors is None else timeout_errors
+
 class I2C_target( Interface ):
 	"""
 	An abstraction class to provide I2C device access.
@@ -130,10 +1329,16 @@ class I2C_target( Interface ):
 	by its name or register address/pointer. 
 	The name of registers may needed to be defined as REG_NAME 
 	in inherited class (device class).
+
+	Bus errors are counted in self.error_count (dict of "nack", 
+	"timeout", "other", "retry", "trip" and "probe"). Retry and 
+	dead device handling are set by self.retry (retry_policy). 
 	
 	"""
+	retry		= retry_policy()
+	ERROR_KEYS	= ( "nack", "timeout", "other", "retry", "trip", "probe" )
 
-	def __init__( self, i2c, address, auto_increment_flag = 0x00, ignore_fail = True ):
+	def __init__( self, i2c, address, auto_increment_flag = 0x00, ignore_fail = True, mem_access = False ):
 		"""
 		I2C_target initializer
 	
@@ -149,14 +1354,33 @@ class I2C_target( Interface ):
 			multiple data sending. 
 		ignore_fail : bool
 			Supress raising exception when transfer error (NACK) happned
+		mem_access : bool
+			Use machine.I2C.readfrom_mem_into() and writeto_mem() for 
+			register access. The register pointer and data are transferred 
+			in single native call. 
+			This setting can be changed later by self.mem_access. 
 			
 		"""
+		if _owner( i2c ):
+			self.owner	= i2c
+			i2c			= i2c.bus
+
 		self.__adr	= address
 		self.__if	= i2c
 		self.__ai	= auto_increment_flag
 
 		self.ignore_fail	= ignore_fail
 		self.live			= True
+		self.mem_access		= mem_access
+		self.error_count	= dict.fromkeys( self.ERROR_KEYS, 0 )
+
+		self.__probe_at	= None		#	time to probe the dead device
+		self.__trips	= 0			#	number of consecutive trips
+
+		self.__rb	= bytearray( 1 )			#	register pointer
+		self.__wb	= bytearray( 1 )			#	single byte write data
+		self.__db	= bytearray( 1 )			#	single byte read data
+		self.__wv	= [ self.__rb, None ]		#	vector for writevto()
 
 	def ping( self ):
 		"""
@@ -176,14 +1400,162 @@ class I2C_target( Interface ):
 		
 		return self.live
 
-	def send( self, tsfr, stop = True, retry = 3 ):
+	def acked( self ):
+		"""
+		check ACK from the device
+		
+		Access to the device with just its target address without data. 
+		Unlike ping(), it is tried once and a NACK is not counted in 
+		error_count. self.live is not changed. 
+		For polling a device which returns NACK while it is busy 
+		(like EEPROM in its write cycle). 
+	
+		Returns
+		-------
+		bool : True if the device returned ACK
+
+		"""
+		if self.owner:
+			return self.owner.run( self.__ack )
+
+		return self.__ack()
+
+	def __ack( self ):
+		try:
+			self.__if.writeto( self.__adr, b"" )
+		except OSError:
+			return False
+
+		return True
+
+	def __transfer( self, read, buf, stop = True, retry = None, mem = None, reg = None ):
+		"""
+		bus transaction with retry (instance internal use)
+
+		Parameters
+		----------
+		read : bool
+			True for read transaction into buf. 
+			False for write transaction from buf.
+		buf : bytearray, memoryview or list
+			Data buffer. If a list of buffers is given for write, 
+			those are sent in one transaction by writevto().
+		stop : bool
+			STOP-condition generated after the transaction.
+		retry : int or None
+			Number of tries. self.retry.tries if None. 
+		mem : int or None
+			Register address/pointer. If this is given, the transaction 
+			is done by readfrom_mem_into() or writeto_mem(). 
+		reg : int or None
+			Register address/pointer for the tracer record. 
+
+		Returns
+		-------
+		bool : True if the transaction was completed
+
+		"""
+		policy	= self.retry
+
+		if self.live:
+			tries	= policy.tries if retry is None else retry
+		elif self.__probe_at is not None and 0 <= ticks_diff( ticks_ms(), self.__probe_at ):
+			tries	= 1		#	half-open: single try to probe the device
+			self.error_count[ "probe" ]	+= 1
+		else:
+			return False
+
+		if self.tracer:
+			start	= ticks_us()
+
+		failed		= 0
+		nacks		= 0
+		timeouts	= 0
+		done		= False
+
+		while failed < tries:
+			try:
+				if mem is not None:
+					if read:
+						self.__if.readfrom_mem_into( self.__adr, mem, buf )
+					else:
+						self.__if.writeto_mem( self.__adr, mem, buf )
+				elif read:
+					self.__if.readfrom_into( self.__adr, buf, stop )
+				elif type( buf ) == list:
+					self.__if.writevto( self.__adr, buf, stop )
+				else:
+					self.__if.writeto( self.__adr, buf, stop )
+			except OSError as e:
+				failed	+= 1
+				err		 = e.args[ 0 ] if e.args else 0
+
+				if err in policy.nack_errors:
+					self.error_count[ "nack" ]		+= 1
+					nacks							+= 1
+				elif err in policy.timeout_errors:
+					self.error_count[ "timeout" ]	+= 1
+					timeouts						+= 1
+				else:
+					self.error_count[ "other" ]		+= 1
+					break
+
+				if failed < tries:
+					self.error_count[ "retry" ]	+= 1
+					wait	= policy.backoff_us[ min( failed, len( policy.backoff_us ) ) - 1 ]
+					if wait:
+						sleep_us( wait )
+			else:
+				done	= True
+				break
+
+		if self.tracer:
+			self.tracer.record( self, reg, buf, ticks_diff( ticks_us(), start ), done, failed, nacks, timeouts )
+
+		if done:
+			if self.__probe_at is not None:	#	probe succeeded or forced to live
+				self.live		= True
+				self.__probe_at	= None
+				self.__trips	= 0
+			return True
+
+		if not self.live:		#	probe failed
+			self.__trip()
+			return False
+
+		self.error_count[ "trip" ]	+= 1
+
+		if not self.ignore_fail:
+			raise I2C_target_Error( "I2C error: {} tries failed on {}, address 0x{:02X} (0x{:02X})".format( failed, self.__class__.__name__, self.__adr, self.__adr << 1 ) )
+
+		self.live	= False		#	the device goes dead. following accesses are skipped quietly
+		self.__trip()
+		
+		return False
+
+	def __trip( self ):
+		"""
+		schedule next probe of dead device (instance internal use)
+		"""
+		policy	= self.retry
+
+		if policy.probe_ms:
+			interval		= min( policy.probe_ms << self.__trips, policy.probe_max_ms )
+			self.__probe_at	= ticks_add( ticks_ms(), interval )
+			self.__trips	= min( self.__trips + 1, 16 )
+		else:
+			self.__probe_at	= None
+
+	def send( self, tsfr, stop = True, retry = None ):
 		"""
 		send data (generate write transaction)
 
 		Sending list-data to the device. 
-		It trys sending 3 times if the device respond NACK. 
+		It retries sending if the device respond NACK (see retry_policy). 
 		If the device is kept not responding, the self.live is set to 
 		False to prevent further access to the failed device. 
+		The dead device is probed periodically and back to live if 
+		it responds. 
 
 		Forcing self.live=True can re-live the device. 
 	
@@ -198,37 +1570,21 @@ class I2C_target( Interface ):
 			transaction.
 			
 		"""
-		
-		if not self.live:
-			return
-			
-		retry_setting	= retry
-
-		while retry:
-			err	= False
-			try:
-				self.__if.writeto( self.__adr, bytearray( tsfr ), stop )
-			except Exception as e:
-				err		 = True
-				retry	-= 1
-			else:
-				retry	= 0
-			
-		if ( err ):
-			if self.ignore_fail:
-				print( "I2C error: NACK returned {} times from {}, address 0x{:02X} (0x{:02X})".format( retry_setting, self.__class__.__name__, self.__adr, self.__adr << 1 ) )
-				self.live	= False
-			else:
-				raise I2C_target_Error( "I2C error: NACK returned {} times from {}, address 0x{:02X} (0x{:02X})".format( retry_setting, self.__class__.__name__, self.__adr, self.__adr << 1 ) )
+		if self.owner:
+			self.owner.run( self.__transfer, False, bytearray( tsfr ), stop, retry )
+		else:
+			self.__transfer( False, bytearray( tsfr ), stop, retry )
 
-	def receive( self, length, retry = 3, barray = False ):
+	def receive( self, length, retry = None, barray = False ):
 		"""
 		receive data (generate read transaction)
 	
 		Receiving list-data from the device. 
-		It trys receiving 3 times if the device respond NACK. 
+		It retries receiving if the device respond NACK (see retry_policy). 
 		If the device is kept not responding, the self.live is set to 
 		False to prevent further access to the failed device. 
+		The dead device is probed periodically and back to live if 
+		it responds. 
 
 		Forcing self.live=True can re-live the device. 
 	
@@ -243,34 +1599,129 @@ class I2C_target( Interface ):
 			List of integers which was converted from bytearray.
 
 		"""
-		if not self.live:
-			return
-			
-		retry_setting	= retry
+		rtn	= bytearray( length )
 
-		while retry:
-			err	= False
-			try:
-				rtn	= self.__if.readfrom( self.__adr, length )
-			except Exception as e:
-				err		 = True
-				retry	-= 1
-			else:
-				retry	= 0
-			
-		if ( err ):
-			if self.ignore_fail:
-				print( "I2C error: NACK returned {} times from {}, address 0x{:02X} (0x{:02X})".format( retry_setting, self.__class__.__name__, self.__adr, self.__adr << 1 ) )
-				self.live	= False
-				rtn			= None
-			else:
-				raise I2C_target_Error( "I2C error: NACK returned {} times from {}, address 0x{:02X} (0x{:02X})".format( retry_setting, self.__class__.__name__, self.__adr, self.__adr << 1 ) )
+		if self.owner:
+			done	= self.owner.run( self.__transfer, True, rtn, True, retry )
+		else:
+			done	= self.__transfer( True, rtn, retry = retry )
+
+		if not done:
+			return None
 
 		if barray:
 			return rtn
 		else:
 			return list( rtn )
 
+	def write_from( self, reg, buf ):
+		"""
+		writing registers from a buffer
+	
+		The register pointer and the buffer are sent in one transaction 
+		without copying the data. No heap allocation is done in this method. 
+		If self.mem_access is True, the transfer is done by a 
+		writeto_mem() call. 
+
+		Parameters
+		----------
+		reg : string or int
+			Register name or register address/pointer.
+		buf : bytearray, bytes or memoryview
+			Data for sending.
+
+		Returns
+		-------
+		bool : True if the transfer was completed
+
+		Examples
+		--------
+		self.write_from( "PWM0", buf )				# len( buf ) bytes writing
+		self.write_from( 10, memoryview( buf )[ 4: ] )	# register specified by address
+			
+		"""
+		if self.owner:
+			return self.owner.run( self.__write_from, reg, buf )
+
+		return self.__write_from( reg, buf )
+
+	def __write_from( self, reg, buf ):
+		"""
+		writing registers from a buffer (instance internal use)
+		"""
+		reg		= self.reg_addr( reg )
+		ptr		= reg if 1 == len( buf ) else reg | self.__ai
+		
+		if self.mem_access:
+			done	= self.__transfer( False, buf, mem = ptr, reg = reg )
+		else:
+			self.__rb[ 0 ]	= ptr
+			self.__wv[ 1 ]	= buf
+			done			= self.__transfer( False, self.__wv, reg = reg )
+			self.__wv[ 1 ]	= None
+		
+		if self.shadow_regs is not None:
+			if done:
+				self.shadow_update( reg, buf )
+			else:
+				self.shadow_invalidate( reg, len( buf ) )
+
+		return done
+
+	def read_into( self, reg, buf, repeated_start = True ):
+		"""
+		reading registers into a buffer
+	
+		Received data is stored into given buffer. 
+		No heap allocation is done in this method. 
+		If self.mem_access is True, the transfer is done by a 
+		readfrom_mem_into() call (only when repeated_start is True). 
+
+		Parameters
+		----------
+		reg : string or int
+			Register name or register address/pointer.
+		buf : bytearray or memoryview
+			Buffer to store received data. Its length is number of 
+			bytes for receiving. 
+		repeated_start : bool, option
+			If True, a Repeated-START-condition generated between
+			write and read transactions.
+			If False, a STOP-condition and START-condition are
+			generated between write and read transactions.
+
+		Returns
+		-------
+		bool : True if the transfer was completed
+
+		Examples
+		--------
+		buf	= bytearray( 6 )
+		self.read_into( "OUT_X_MSB", buf )		# 6 bytes reading into buf
+
+		"""
+		if self.owner:
+			return self.owner.run( self.__read_into, reg, buf, repeated_start )
+
+		return self.__read_into( reg, buf, repeated_start )
+
+	def __read_into( self, reg, buf, repeated_start ):
+		"""
+		reading registers into a buffer (instance internal use)
+		"""
+		reg	= self.reg_addr( reg )
+		ptr	= reg if 1 == len( buf ) else reg | self.__ai
+		
+		if self.mem_access and repeated_start:
+			return self.__transfer( True, buf, mem = ptr, reg = reg )
+
+		self.__rb[ 0 ]	= ptr
+
+		if not self.__transfer( False, self.__rb, stop = not repeated_start, reg = reg ):
+			return False
+
+		return self.__transfer( True, buf, reg = reg )
+
 	def write_registers( self, reg, data ):
 		"""
 		writing registers
@@ -294,15 +1745,13 @@ class I2C_target( Interface ):
 		"""
 		#print( "I2C write_registers: {}, {}".format( reg, data ) )
 		
-		reg		= self.REG_NAME.index( reg ) if type( reg ) != int else reg
-		
-		if ( type(data) == int ) or ( 1 == len( data ) ):
-			pass
+		if type( data ) == int:
+			self.__wb[ 0 ]	= data
+			data			= self.__wb
 		else:
-			reg	   |= self.__ai
-		
-		data	= [ reg, data ] if type(data) == int else [ reg ] + data
-		self.send( data, stop = True )
+			data	= bytearray( data )
+
+		self.write_from( reg, data )
 		
 	def read_registers( self, reg, length, repeated_start = True, barray = False  ):
 		"""
@@ -319,6 +1768,8 @@ class I2C_target( Interface ):
 			write and read transactions.
 			If False, a STOP-condition and START-condition are
 			generated between write and read transactions.
+		barray : bool, option
+			If True, received data is returned in bytearray
 
 		Examples
 		--------
@@ -329,15 +1780,18 @@ class I2C_target( Interface ):
 		"""
 		#print( "I2C read_registers: {}, {}".format( reg, data ) )
 
-		reg	= self.REG_NAME.index( reg ) if type( reg ) != int else reg
+		if barray or 1 != length:
+			r	= bytearray( length )
+		else:
+			r	= self.__db
 
-		if length != 1:
-			reg	   |= self.__ai
-		
-		self.send( [ reg ], stop = not repeated_start )
-		r	= self.receive( length, barray = barray )
+		if not self.read_into( reg, r, repeated_start ):
+			return None
 		
-		return	r[ 0 ] if length is 1 else r
+		if barray:
+			return r
+
+		return	r[ 0 ] if 1 == length else list( r )
 
 class SPI_target( Interface ):
 	"""
@@ -365,13 +1819,22 @@ class SPI_target( Interface ):
 			controlledChipSelect signal
 		
 		"""
+		if _owner( spi ):
+			self.owner	= spi
+			spi			= spi.bus
+
 		self.__cs	= cs
 		self.__if	= spi
 		self.live	= True
 		
 		self.chip_select	= 1
 
-	def send( self, data ):
+		self.__wb		= bytearray( 1 )	#	single byte write data
+		self.__db		= bytearray( 1 )	#	single byte read data
+		self.__fb		= bytearray( 0 )	#	transfer frame buffer
+		self.__frames	= {}				#	memoryviews on the frame buffer
+
+	def send( self, data, reg = None ):
 		"""
 		send data (generate write transaction)
 	
@@ -380,13 +1843,16 @@ class SPI_target( Interface ):
 		tsfr : list
 			Data for sending. List of integers will be converted to
 			bytearray before sending.
+		reg : int, option
+			Register address/pointer for the tracer record
 			
 		"""
-		self.chip_select	= 0
-		self.__if.write( bytearray( data ) )
-		self.chip_select	= 1
+		if self.owner:
+			self.owner.run( self.__write, bytearray( data ), reg )
+		else:
+			self.__write( bytearray( data ), reg )
 
-	def receive( self, tsfr ):
+	def receive( self, tsfr, reg = None ):
 		"""
 		receive data (generate write & read transaction)
 	
@@ -395,6 +1861,8 @@ class SPI_target( Interface ):
 		tsfr : list
 			Data for sending. List of integers will be converted to
 			bytearray before sending.
+		reg : int, option
+			Register address/pointer for the tracer record
 
 		Returns
 		-------
@@ -403,12 +1871,42 @@ class SPI_target( Interface ):
 
 		"""
 		tsfr	= bytearray( tsfr )
-		self.chip_select	= 0
-		self.__if.write_readinto( tsfr, tsfr )
-		self.chip_select	= 1
+
+		if self.owner:
+			self.owner.run( self.__write_readinto, tsfr, reg )
+		else:
+			self.__write_readinto( tsfr, reg )
 		
 		return list( tsfr )
 
+	def __write( self, buf, reg = None ):
+		"""
+		SPI write with CS control (instance internal use)
+		"""
+		if self.tracer:
+			start	= ticks_us()
+
+		self.chip_select	= 0
+		self.__if.write( buf )
+		self.chip_select	= 1
+
+		if self.tracer:
+			self.tracer.record( self, reg, buf, ticks_diff( ticks_us(), start ) )
+
+	def __write_readinto( self, buf, reg = None ):
+		"""
+		SPI write and read with CS control (instance internal use)
+		"""
+		if self.tracer:
+			start	= ticks_us()
+
+		self.chip_select	= 0
+		self.__if.write_readinto( buf, buf )
+		self.chip_select	= 1
+
+		if self.tracer:
+			self.tracer.record( self, reg, buf, ticks_diff( ticks_us(), start ) )
+
 	@property
 	def chip_select( self ):
 		pass
@@ -421,6 +1919,94 @@ class SPI_target( Interface ):
 		if self.__cs:
 			self.__cs.value( v )
 
+	def __frame( self, length ):
+		"""
+		transfer frame for register access (instance internal use)
+
+		Frames are memoryviews on a buffer which is kept in the instance. 
+		Those are made once for each payload length and reused. 
+		
+		Parameters
+		----------
+		length : int
+			Payload length (excluding register address byte)
+
+		Returns
+		-------
+		memoryview : whole frame
+		memoryview : payload part of the frame
+
+		"""
+		f	= self.__frames.get( length )
+
+		if f is None:
+			if len( self.__fb ) < length + 1:
+				self.__fb		= bytearray( length + 1 )
+				self.__frames	= {}
+
+			mv	= memoryview( self.__fb )
+			f	= ( mv[ : length + 1 ], mv[ 1 : length + 1 ] )
+			self.__frames[ length ]	= f
+
+		return f
+
+	def write_from( self, reg, buf ):
+		"""
+		writing registers from a buffer
+
+		No heap allocation is done in this method once the frame for the 
+		length was prepared. 
+	
+		Parameters
+		----------
+		reg : string or int
+			Register name or register address/pointer.
+		buf : bytearray, bytes or memoryview
+			Data for sending.
+			
+		"""
+		reg				= self.reg_addr( reg )
+		frame, payload	= self.__frame( len( buf ) )
+		frame[ 0 ]		= reg
+		payload[ : ]	= buf
+
+		if self.owner:
+			self.owner.run( self.__write, frame, reg )
+		else:
+			self.__write( frame, reg )
+
+		self.shadow_update( reg, buf )
+		
+	def read_into( self, reg, buf ):
+		"""
+		reading registers into a buffer
+	
+		No heap allocation is done in this method once the frame for the 
+		length was prepared. 
+
+		Parameters
+		----------
+		reg : string or int
+			Register name or register address/pointer.
+		buf : bytearray or memoryview
+			Buffer to store received data. Its length is number of 
+			bytes for receiving. 
+
+		"""
+		reg				= self.reg_addr( reg )
+		frame, payload	= self.__frame( len( buf ) )
+		frame[ 0 ]		= reg | 0x80
+
+		for i in range( 1, len( frame ) ):
+			frame[ i ]	= 0x00
+
+		if self.owner:
+			self.owner.run( self.__write_readinto, frame, reg )
+		else:
+			self.__write_readinto( frame, reg )
+
+		buf[ : ]	= payload
+
 	def write_registers( self, reg, data ):
 		"""
 		writing registers
@@ -438,10 +2024,13 @@ class SPI_target( Interface ):
 		"""
 		#print( "SPI write_registers: {}, {}".format( reg, data ) )
 		
-		reg		= self.REG_NAME.index( reg ) if type( reg ) != int else reg
-		data	= [ reg, data ] if type(data) == int else [ reg ] + data
+		if type( data ) == int:
+			self.__wb[ 0 ]	= data
+			data			= self.__wb
+		else:
+			data	= bytearray( data )
 
-		self.send( data )
+		self.write_from( reg, data )
 		
 	def read_registers( self, reg, length ):
 		"""
@@ -453,41 +2042,37 @@ class SPI_target( Interface ):
 			Register name or register address/pointer.
 		length : int
 			Number of bytes for receiveing.
-		repeated_start : bool, option
-			If True, a Repeated-START-condition generated between
-			write and read transactions.
-			If False, a STOP-condition and START-condition are
-			generated between write and read transactions.
 		"""
 		#print( "SPI read_registers: {}, {}".format( reg, length ) )
 		
-		reg		 = self.REG_NAME.index( reg ) if type( reg ) != int else reg
-		data	 = [reg | 0x80 ] + [ 0x00 ] * length
-
-		r	= self.receive( data )
+		r	= self.__db if 1 == length else bytearray( length )
+		self.read_into( reg, r )
 
-		return r[ 1 ] if 1 == length else r[ 1: ]
+		return r[ 0 ] if 1 == length else list( r )
 
 class abstract_target( Interface ):
 	"""
 	An abstraction class for off-line test.
 	No physical access will be performed with this class. 
+	Received data are all 0. 
+	To run drivers with responses from real device, use bus_replayer 
+	instead of machine.I2C/SPI. 
 	"""
 
-	def send( self, tsfr ):
+	def send( self, tsfr, stop = True ):
 		print( "send: ", tsfr )
 
 	def receive( self, length ):
 		print( "receive: ", length )
-		return 0
+		return [ 0 ] * length
 
 	def write_registers( self, reg, data ):
-		reg		= self.REG_NAME.index( reg ) if type( reg ) != int else reg
+		reg		= self.reg_addr( reg )
 		data	= [ reg, data ] if type(data) == int else [ reg ] + data
 		self.send( data )
 		
 	def read_registers( self, reg, length, repeated_start = True ):
-		reg	= self.REG_NAME.index( reg ) if type( reg ) != int else reg
+		reg	= self.reg_addr( reg )
 		self.send( [ reg ], stop = not repeated_start )
 		r	= self.receive( length )
 		
@@ -499,6 +2084,9 @@ def i2c_fullscan( i2c ):
 	Because the machine.I2C.scan() does scan is limited in range of 0x08(0x10) 
 	to 0x77(0xEE). 
 	
+	Kept here for "from nxp_periph.interface import i2c_fullscan". 
+	The scan is done by bus_scan.i2c_fullscan(). 
+	
 	Parameters
 	----------
 	i2c : obj
@@ -509,16 +2097,5 @@ def i2c_fullscan( i2c ):
 	list : Responding target ddress list
 
 	"""
-
-	list	= []
-	data	= []
-	
-	for i in range( 128 ):
-		try:
-			i2c.writeto( i, bytearray( data ) )
-		except Exception as e:
-			pass
-		else:
-			list	+= [ i ]
-			
-	return list
+	from nxp_periph.bus_scan	import	i2c_fullscan
+	return i2c_fullscan( i2c )
@@ -0,0 +1,377 @@
+from	array		import	array
+from	utime		import	ticks_ms, ticks_add, ticks_diff, sleep_ms
+
+def _source( read, interval_ms, count ):
+	due	= ticks_ms()
+	n	= 0
+
+	while count is None or n < count:
+		if interval_ms:
+			w	= ticks_diff( due, ticks_ms() )
+
+			if 0 < w:
+				sleep_ms( w )
+			elif w <= -interval_ms:		#	consumer was too slow. restart timing
+				due	= ticks_ms()
+
+			due	= ticks_add( due, interval_ms )
+
+		yield read()
+		n	+= 1
+
+def _values( v ):
+	"""
+	a sample as tuple and its width (0 for a number)
+	"""
+	if isinstance( v, ( tuple, list ) ):
+		return tuple( v ), len( v )
+
+	return ( v, ), 0
+
+def _moving_average( src, n ):
+	buf		= None
+	k		= 0
+
+	for v in src:
+		vs, w	= _values( v )
+		m		= len( vs )
+
+		if buf is None:
+			buf		= array( "f", [ 0 ] * (n * m) )
+			sums	= [ 0.0 ] * m
+
+		p	= (k % n) * m
+
+		for i in range( m ):
+			old				= buf[ p + i ]
+			buf[ p + i ]	= vs[ i ]
+			sums[ i ]	   += buf[ p + i ] - old	#	same rounding as kept value to avoid drift
+
+		k	+= 1
+		c	= min( k, n )
+		r	= tuple( s / c for s in sums )
+
+		yield r if w else r[ 0 ]
+
+def _ema( src, alpha ):
+	y	= None
+
+	for v in src:
+		vs, w	= _values( v )
+
+		if y is None:
+			y	= list( vs )
+		else:
+			for i in range( len( vs ) ):
+				y[ i ]	+= alpha * (vs[ i ] - y[ i ])
+
+		yield tuple( y ) if w else y[ 0 ]
+
+def _median( src, n ):
+	buf	= None
+	k	= 0
+
+	for v in src:
+		vs, w	= _values( v )
+		m		= len( vs )
+
+		if buf is None:
+			buf	= array( "f", [ 0 ] * (n * m) )
+
+		p	= (k % n) * m
+
+		for i in range( m ):
+			buf[ p + i ]	= vs[ i ]
+
+		k	+= 1
+		c	= min( k, n )
+		r	= []
+
+		for i in range( m ):
+			s	= sorted( buf[ j * m + i ] for j in range( c ) )
+			r	+= [ s[ c // 2 ] if c & 1 else (s[ c // 2 - 1 ] + s[ c // 2 ]) / 2 ]
+
+		yield tuple( r ) if w else r[ 0 ]
+
+def _decimate( src, n ):
+	k	= 0
+
+	for v in src:
+		if 0 == k % n:
+			yield v
+		k	+= 1
+
+def _scale( src, gain, offset ):
+	for v in src:
+		vs, w	= _values( v )
+		r		= tuple( x * gain + offset for x in vs )
+
+		yield r if w else r[ 0 ]
+
+def _convert( src, func ):
+	for v in src:
+		yield func( v )
+
+def _threshold( src, high, low, callback, key ):
+	state	= 0
+
+	for v in src:
+		x	= key( v ) if key else v
+		s	= 1 if high <= x else 0 if x < low else state
+
+		if s != state:
+			state	= s
+
+			if callback:
+				callback( v, state )
+
+		yield v
+
+def _tap( src, funcs ):
+	for v in src:
+		for f in funcs:
+			f( v )
+
+		yield v
+
+class stream:
+	"""
+	Streaming pipeline of sensor data
+
+	A source (read function) and stages are chained by methods. Each
+	stage is a generator which pulls a value from previous stage only
+	when next value is asked. Nothing is read from the device until a
+	consumer asks a value (by iteration, read() or run()). Stages keep
+	fixed size state (windows in array), so memory doesn't grow while
+	streaming.
+
+	Values can be numbers or tuples (like accelerometer.xyz()). Filters
+	and scale() work on each element of tuples.
+
+	One pipeline can feed several consumers with one read of the bus:
+	put tap() with ring_buffer.append, logger or any function in the
+	chain and drive it from one loop (or from a Sampler channel with
+	read()).
+
+	Examples
+	--------
+	>>> s	= temp_sensor.stream( interval_ms = 100 ).median( 5 ).decimate( 10 )
+	>>> for v in s:
+	...		print( v )
+
+	>>> buf	= ring_buffer( 60, width = 3 )
+	>>> s	= accel.stream().ema( 0.2 ).scale( 9.80665 ).tap( buf.append )
+	>>> s.threshold( 12.0, 10.0, alarm, key = lambda v: abs( v[ 2 ] ) )
+	>>> sampler.add( "accel", s.read, 100 )
+
+	"""
+	def __init__( self, read, interval_ms = 0, count = None ):
+		"""
+		stream initializer
+
+		Parameters
+		----------
+		read : callable or iterable
+			Function which returns a value (like lambda: sensor.temp) or
+			an iterable of values
+		interval_ms : int, option
+			Interval of reads. The source waits until next read time
+			when the consumer asks faster. Reads are done at each ask if
+			0 (for pipelines driven by Sampler or other timing)
+		count : int, option
+			Number of values. Endless if not given
+
+		"""
+		if callable( read ):
+			self.__gen	= _source( read, interval_ms, count )
+		else:
+			self.__gen	= iter( read )
+
+	def __iter__( self ):
+		return self.__gen
+
+	def __chain( self, gen ):
+		self.__gen	= gen
+		return self
+
+	def moving_average( self, n ):
+		"""
+		moving average filter
+
+		Parameters
+		----------
+		n : int
+			Window size. Average of fewer values is given until n values
+
+		Returns
+		-------
+		stream : this stream
+
+		"""
+		return self.__chain( _moving_average( self.__gen, n ) )
+
+	def ema( self, alpha ):
+		"""
+		exponential moving average filter
+
+		Parameters
+		----------
+		alpha : float
+			Weight of new value (0 < alpha <= 1). Smaller is smoother
+
+		Returns
+		-------
+		stream : this stream
+
+		"""
+		return self.__chain( _ema( self.__gen, alpha ) )
+
+	def median( self, n ):
+		"""
+		median filter (removing spikes)
+
+		Parameters
+		----------
+		n : int
+			Window size
+
+		Returns
+		-------
+		stream : this stream
+
+		"""
+		return self.__chain( _median( self.__gen, n ) )
+
+	def decimate( self, n ):
+		"""
+		pass one value in every n values
+
+		Parameters
+		----------
+		n : int
+			Decimation ratio. Put moving_average( n ) before to average
+			the values instead of picking
+
+		Returns
+		-------
+		stream : this stream
+
+		"""
+		return self.__chain( _decimate( self.__gen, n ) )
+
+	def scale( self, gain = 1, offset = 0 ):
+		"""
+		unit conversion by linear function: value * gain + offset
+
+		Parameters
+		----------
+		gain : float, option
+			Multiplier (like 9.80665 for "g" to m/s^2)
+		offset : float, option
+			Offset (like 32 with gain 1.8 for Celsius to Fahrenheit)
+
+		Returns
+		-------
+		stream : this stream
+
+		"""
+		return self.__chain( _scale( self.__gen, gain, offset ) )
+
+	def convert( self, func ):
+		"""
+		convert values by a function
+
+		Parameters
+		----------
+		func : callable
+			Function which takes a value and returns converted value
+
+		Returns
+		-------
+		stream : this stream
+
+		"""
+		return self.__chain( _convert( self.__gen, func ) )
+
+	def threshold( self, high, low = None, callback = None, key = None ):
+		"""
+		threshold detection with hysteresis
+
+		Values are passed through. The callback is called when the value
+		goes to "high" or over (state 1) and goes back under "low"
+		(state 0).
+
+		Parameters
+		----------
+		high : float
+			Threshold to detect
+		low : float, option
+			Threshold to release. Same as "high" if not given
+		callback : callable, option
+			Function called with value and new state
+		key : callable, option
+			Function to take a number to compare from the value (like
+			lambda v: v[ 2 ] for z-axis of xyz)
+
+		Returns
+		-------
+		stream : this stream
+
+		"""
+		low	= high if low is None else low
+		return self.__chain( _threshold( self.__gen, high, low, callback, key ) )
+
+	def tap( self, *funcs ):
+		"""
+		sinks in the middle of the pipeline
+
+		Parameters
+		----------
+		funcs : callables
+			Functions called with each value (like ring_buffer.append,
+			logger or HTTP UI update). Values are passed through
+
+		Returns
+		-------
+		stream : this stream
+
+		"""
+		return self.__chain( _tap( self.__gen, funcs ) )
+
+	def read( self ):
+		"""
+		pull a value through the pipeline
+
+		Can be given to Sampler.add() as read function.
+
+		Returns
+		-------
+		any : value. None if the stream ended
+
+		"""
+		try:
+			return next( self.__gen )
+		except StopIteration:
+			return None
+
+	def run( self, n = None ):
+		"""
+		drive the pipeline
+
+		Parameters
+		----------
+		n : int, option
+			Number of values to pull. Until the source ends if not given
+
+		Returns
+		-------
+		any : last value
+
+		"""
+		v	= None
+
+		for k, v in enumerate( self.__gen ):
+			if n is not None and n <= k + 1:
+				break
+
+		return v
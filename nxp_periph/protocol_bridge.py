@@ -2,6 +2,7 @@ from	machine	import	Pin, I2C, SPI
 from	utime	import	sleep
 
 from	nxp_periph	import	I2C_target, SPI_target
+from	nxp_periph.interface	import	_owner
 
 
 class SC16IS7xx_base():
@@ -22,6 +23,10 @@ class SC16IS7xx_base():
 					"XOFF1"   : 0x06, "XOFF2"    : 0x07
 					}
 
+	BURST_WRITE		= False		#	no auto increment on register access
+	BATCH_ORDERED	= True		#	register mapping depends on LCR setting
+	SNAPSHOT_REGS	= ( "IER", "MCR", "SPR", "IODir", "IOState", "IOIntEna", "IOControl", "EFCR" )
+
 	def __init__( self, channel = 0, osc = 14746500, baud = 9600, bits = 8, parity = None, stop = 1 ):
 		"""
 		A base class to abstract behavior of SC16IS7xx
@@ -163,6 +168,53 @@ class SC16IS7xx_base():
 		else:
 			print( "reg_access error" )
 
+	def snapshot_data( self ):
+		"""
+		register values for snapshot()
+		
+		Special registers are read by switching LCR: DLL and DLH (LCR = 
+		0x80) and EFR (LCR = 0xBF). FCR is write-only and set to FIFO 
+		enabled (same as initializer) in restore. 
+		"""
+		lcr		= self.reg_access( "LCR" )
+		
+		if lcr is None:
+			return None
+		
+		self.reg_access( "LCR", 0xBF )
+		data	= [ self.reg_access( "EFR" ) ]
+		self.reg_access( "LCR", 0x80 )
+		data   += [ self.reg_access( r ) for r in ( "DLL", "DLH" ) ]
+		self.reg_access( "LCR", lcr & 0x7F )
+		data   += [ self.reg_access( r ) for r in self.SNAPSHOT_REGS ]
+		self.reg_access( "LCR", lcr )
+		
+		if None in data:
+			return None
+		
+		return bytes( data + [ lcr ] )
+
+	def restore_data( self, data ):
+		"""
+		write register values taken by snapshot_data()
+		"""
+		if len( data ) != len( self.SNAPSHOT_REGS ) + 4:
+			raise ValueError( "snapshot doesn't match registers of {}".format( self.__class__.__name__ ) )
+
+		self.reg_access( "LCR", 0xBF )
+		self.reg_access( "EFR", data[ 0 ] )
+		self.reg_access( "LCR", 0x80 )
+		self.reg_access( "DLL", data[ 1 ] )
+		self.reg_access( "DLH", data[ 2 ] )
+		self.reg_access( "LCR", data[ -1 ] & 0x7F )
+
+		for r, v in zip( self.SNAPSHOT_REGS, data[ 3 : ] ):
+			self.reg_access( r, v )
+
+		self.reg_access( "FCR", 0x06 )	# reset TXFIFO, reset RXFIFO, non FIFO mode
+		self.reg_access( "FCR", 0x01 )	# enable FIFO mode
+		self.reg_access( "LCR", data[ -1 ] )
+
 	def thr_ready( self ):
 		"""
 		retruns True when THR register is ready to be written
@@ -235,6 +287,48 @@ class SC16IS7xx_base():
 		
 		return data
 
+	async def aread( self, n, timeout = None, poll = 5 ):
+		"""
+		get received data (async version)
+		
+		Waits until "n" bytes received. While no data is available, 
+		the receiver is checked every "poll" milliseconds by 
+		uasyncio.sleep_ms() and other tasks can run. 
+		
+		Parameters
+		----------
+		n : int
+			length of receiving data
+		timeout : int or None, option
+			Timeout in milliseconds. If None, waits forever. 
+			Received data until the timeout is returned. 
+		poll : int, option
+			Polling interval in milliseconds
+			
+		Returns
+		-------
+		list
+			received data
+			
+		"""
+		import	uasyncio
+
+		data	= []
+		
+		while len( data ) < n:
+			if self.any():
+				data	+= [ self.reg_access( "RHR" ) ]
+				continue
+
+			if timeout is not None:
+				if timeout <= 0:
+					break
+				timeout	-= poll
+
+			await uasyncio.sleep_ms( poll )
+		
+		return data
+
 class SC16IS7xx_I2C( SC16IS7xx_base, I2C_target ):
 	"""
 	SC16IS7xx class with I2C interface
@@ -316,10 +410,12 @@ def SC16IS7xx( interface, address = DEFAULT_ADDR, cs = DEFAULT_CS, channel = 0,
 		returns SC16IS7xx_SPI when interface == SPI
 
 	"""
-	if isinstance( interface, I2C ):
+	bus	= interface.bus if _owner( interface ) else interface
+
+	if isinstance( bus, I2C ):
 		return SC16IS7xx_I2C( interface, address, channel = channel, osc = osc, baud = baud, bits = bits, parity = parity, stop = stop )
 
-	if isinstance( interface, SPI ):
+	if isinstance( bus, SPI ):
 		return SC16IS7xx_SPI( interface, cs, channel = channel, osc = osc, baud = baud, bits = bits, parity = parity, stop = stop )
 
 class SC18IS606( I2C_target ):
@@ -384,6 +480,7 @@ class SC18IS606( I2C_target ):
 		self.__int	= int
 		self.__csn	= csn
 		self.__flag	= False
+		self.__tsf	= None
 
 		self.init( baudrate = baudrate, polarity = polarity, phase = phase, firstbit = firstbit )
 		
@@ -397,6 +494,9 @@ class SC18IS606( I2C_target ):
 		"""
 		self.__flag	= True
 
+		if self.__tsf:
+			self.__tsf.set()
+
 	def __wait_tsfr_done( self, read_wait = False ):
 		"""
 		wait for transfer completed
@@ -409,6 +509,18 @@ class SC18IS606( I2C_target ):
 		if read_wait == False:
 			self.__clear_int()
 		
+	async def __await_tsfr_done( self, read_wait = False ):
+		"""
+		wait for transfer completed (async version)
+		"""
+		await self.__tsf.wait()
+
+		self.__tsf	= None
+		self.__flag	= False
+		
+		if read_wait == False:
+			self.__clear_int()
+		
 	def __clear_int( self ):
 		"""
 		interrupt clear
@@ -459,6 +571,48 @@ class SC18IS606( I2C_target ):
 		self.__wait_tsfr_done( read_wait = True )
 		return super().receive( len( data ) )
 
+	async def asend( self, data ):
+		"""
+		send data on SPI (async version)
+		
+		Other tasks can run until the transfer completion interrupt. 
+		
+		Parameters
+		----------
+		data : list
+			send data on SPI
+
+		"""
+		import	uasyncio
+
+		self.__tsf	= uasyncio.ThreadSafeFlag()
+		self.command( [ SC18IS606.FuncID_SPI_read_and_write | 0x01 << self.__csn ] + data )
+		await self.__await_tsfr_done()
+		
+	async def areceive( self, data ):
+		"""
+		send/receive on SPI (async version)
+		
+		Other tasks can run until the transfer completion interrupt. 
+		
+		Parameters
+		----------
+		data : list
+			send data on SPI
+
+		Returns
+		-------
+		list
+			received data
+		
+		"""
+		import	uasyncio
+
+		self.__tsf	= uasyncio.ThreadSafeFlag()
+		self.command( [ SC18IS606.FuncID_SPI_read_and_write | 0x01 << self.__csn ] + data )
+		await self.__await_tsfr_done( read_wait = True )
+		return super().receive( len( data ) )
+
 	def init( self, baudrate = 1875000, polarity = 0, phase = 0, firstbit = SPI.MSB ):
 		"""
 		setting SPI parameters
@@ -0,0 +1,836 @@
+import	os
+from	array		import	array
+from	struct		import	pack_into, unpack_from, calcsize
+from	machine		import	Timer
+from	micropython	import	schedule
+from	utime		import	ticks_ms, ticks_add, ticks_diff, time
+from nxp_periph.MikanUtil	import	MikanUtil
+
+class ring_buffer:
+	"""
+	Fixed capacity ring buffer of samples
+	
+	Samples are kept in array columns: values (typecode "f" by default, 
+	"width" values per sample), ticks (array "l") and flags (array "B"). 
+	No allocation is done in append(). When the buffer is full, oldest 
+	sample is overwritten. 
+	Each sample has an index which counts up from 0 by append(). The 
+	"index" attribute is the index for next sample. since() takes an 
+	index to get samples appended after last query. 
+
+	Examples
+	--------
+	>>> buf	= ring_buffer( 60, width = 3 )
+	>>> buf.append( accel.xyz() )
+	>>> buf.last( 10 )
+	[ ( 123456, ( 0.01, -0.02, 0.98 ), 0 ), ... ]
+	>>> samples	= buf.since( k )
+	>>> k		= buf.index
+
+	"""
+	def __init__( self, capacity, width = 1, typecode = "f" ):
+		"""
+		ring_buffer initializer
+	
+		Parameters
+		----------
+		capacity : int
+			Number of samples to keep
+		width : int, option
+			Number of values in a sample
+		typecode : str, option
+			Array typecode of values ("f" for float, "l" for integer)
+
+		"""
+		self.capacity	= capacity
+		self.width		= width
+		self.values		= array( typecode, [ 0 ] * (capacity * width) )
+		self.ticks		= array( "l", [ 0 ] * capacity )
+		self.flags		= array( "B", [ 0 ] * capacity )
+		self.index		= 0
+		self.__first	= 0		#	samples before this index are discarded by clear()
+
+	def __len__( self ):
+		return self.index - self.oldest()
+
+	def clear( self ):
+		"""
+		discard all samples (index is not reset)
+		"""
+		self.__first	= self.index
+
+	def append( self, value, ticks = None, flags = 0 ):
+		"""
+		add a sample
+	
+		Parameters
+		----------
+		value : number or sequence
+			A value or "width" values
+		ticks : int, option
+			Time of the sample. ticks_ms() if not given
+		flags : int, option
+			Flags of the sample (0-255)
+
+		"""
+		p	= self.index % self.capacity
+		w	= self.width
+
+		if 1 == w:
+			self.values[ p ]	= value
+		else:
+			b	= p * w
+			for i in range( w ):
+				self.values[ b + i ]	= value[ i ]
+
+		self.ticks[ p ]	= ticks_ms() if ticks is None else ticks
+		self.flags[ p ]	= flags
+		self.index	   += 1
+
+	def oldest( self ):
+		"""
+		index of oldest sample kept in the buffer
+		"""
+		return max( self.index - self.capacity, self.__first )
+
+	def get( self, k ):
+		"""
+		get a sample by index
+	
+		Parameters
+		----------
+		k : int
+			Index of the sample. Negative value is taken from newest 
+			(-1 for newest)
+			
+		Returns
+		-------
+		tuple : ticks, value (tuple if width > 1) and flags
+
+		"""
+		k	= self.index + k if k < 0 else k
+		
+		if not self.oldest() <= k < self.index:
+			raise IndexError( "sample {} is not in buffer".format( k ) )
+		
+		p	= k % self.capacity
+		w	= self.width
+		v	= self.values[ p ] if 1 == w else tuple( self.values[ p * w : p * w + w ] )
+
+		return self.ticks[ p ], v, self.flags[ p ]
+
+	def since( self, k ):
+		"""
+		samples appended at index k and after
+	
+		Parameters
+		----------
+		k : int
+			Index. Samples which are already overwritten are not included
+			
+		Returns
+		-------
+		list : tuples of ticks, value and flags, oldest first
+
+		"""
+		return [ self.get( i ) for i in range( max( k, self.oldest() ), self.index ) ]
+
+	def last( self, n = None ):
+		"""
+		latest samples
+	
+		Parameters
+		----------
+		n : int, option
+			Number of samples. All samples in the buffer if not given
+			
+		Returns
+		-------
+		list : tuples of ticks, value and flags, oldest first
+
+		"""
+		return self.since( self.index - n if n else 0 )
+
+class sample_log:
+	"""
+	Binary sample log on filesystem
+
+	Samples are stored as fixed size records packed by struct: device 
+	ID ("B"), ticks_ms() ("I"), time in seconds by utime.time() ("I", 
+	from RTC) and "width" values of "typecode" (like "h" for raw 16 bit 
+	register values). 
+	Records are packed in a RAM block of "batch" records. The flash is 
+	written once per block. Two blocks are used alternately: a full 
+	block is written by micropython.schedule() after the sampling run 
+	while next samples go to the other block. 
+	Files are named "<path>0000.bin", "<path>0001.bin"... A new file is 
+	started when a file reaches "file_size" and oldest file is removed 
+	when there are more than "files". A new file is started at each 
+	instance creation. 
+	Records are in time order and have fixed size, so read() finds the 
+	start of a time range by binary search in files. 
+
+	Examples
+	--------
+	>>> log	= sample_log( "/flash/acc", width = 3, typecode = "h" )
+	>>> sampler.add( "acc", accel.six_axis, 10, log = log, log_id = 1 )
+	>>> stream.tap( log.writer( 2 ) )
+	...
+	>>> for dev_id, ticks, t, values in log.read( t0, t0 + 60 ):
+	...		print( values )
+
+	"""
+	HEAD	= "<BII"	#	device ID, ticks_ms, time
+	TIME	= 5			#	offset of time in a record
+
+	def __init__( self, path = "sample", width = 1, typecode = "f", batch = 32, file_size = 64 * 1024, files = 4 ):
+		"""
+		sample_log initializer
+
+		Parameters
+		----------
+		path : str, option
+			Path and prefix of the log files. Its folder needs to exist
+		width : int, option
+			Number of values in a record
+		typecode : str, option
+			struct format character of values ("h", "i", "f"...)
+		batch : int, option
+			Number of records written at once
+		file_size : int, option
+			File size limit in bytes. Rounded down to whole blocks
+		files : int, option
+			Number of files kept
+
+		"""
+		self.path		= path
+		self.width		= width
+		self.batch		= batch
+		self.files		= files
+		self.fmt		= self.HEAD + typecode * width
+		self.size		= calcsize( self.fmt )
+		self.file_size	= max( 1, file_size // (self.size * batch) ) * self.size * batch
+		self.written	= 0		#	records written to files
+		self.stalls		= 0		#	blocks written in sampling because previous block was not written yet
+
+		self.__bufs		= [ bytearray( self.size * batch ) for i in range( 2 ) ]
+		self.__buf		= 0			#	block being filled
+		self.__n		= 0			#	records in the block
+		self.__pending	= None		#	full block waiting to be written
+		self.__file		= None
+		self.__used		= 0			#	bytes in current file
+		self.__flush_ref	= self.__scheduled_flush	#	bound method is made here, not in sampling
+
+		seq				= self.__seq()
+		self.__num		= seq[ -1 ] + 1 if seq else 0
+
+	def __seq( self ):
+		"""
+		numbers of existing files, oldest first
+		"""
+		d, _, prefix	= self.path.rpartition( "/" )
+		seq				= []
+
+		for name in os.listdir( d if d else "." ):
+			n	= name[ len( prefix ) : -4 ]
+
+			if name.startswith( prefix ) and name.endswith( ".bin" ) and n.isdigit():
+				seq	+= [ int( n ) ]
+
+		return sorted( seq )
+
+	def __name( self, num ):
+		return "{}{:04d}.bin".format( self.path, num )
+
+	def file_names( self ):
+		"""
+		log files
+
+		Returns
+		-------
+		list : file names, oldest first
+
+		"""
+		return [ self.__name( n ) for n in self.__seq() ]
+
+	def append( self, dev_id, value, ticks = None ):
+		"""
+		add a record
+
+		Parameters
+		----------
+		dev_id : int
+			Device ID (0-255)
+		value : number or sequence
+			A value or "width" values
+		ticks : int, option
+			Time of the sample. ticks_ms() if not given
+
+		"""
+		b	= self.__bufs[ self.__buf ]
+		p	= self.__n * self.size
+		t	= ticks_ms() if ticks is None else ticks
+
+		if 1 == self.width:
+			pack_into( self.fmt, b, p, dev_id, t, time(), value )
+		else:
+			pack_into( self.fmt, b, p, dev_id, t, time(), *value )
+
+		self.__n	+= 1
+
+		if self.__n == self.batch:
+			self.__swap()
+
+	def writer( self, dev_id ):
+		"""
+		function to log values of a device
+
+		Parameters
+		----------
+		dev_id : int
+			Device ID (0-255)
+
+		Returns
+		-------
+		callable : function takes a value (for stream.tap() and others)
+
+		"""
+		return lambda v: self.append( dev_id, v )
+
+	def __swap( self ):
+		if self.__pending is not None:
+			self.stalls	+= 1
+			self.__write_pending()
+
+		self.__pending	= ( self.__buf, self.__n )
+		self.__buf	   ^= 1
+		self.__n		= 0
+
+		try:
+			schedule( self.__flush_ref, 0 )
+		except RuntimeError:	#	schedule queue full. written at next swap or flush()
+			pass
+
+	def __scheduled_flush( self, _ ):
+		self.__write_pending()
+
+	def __write_pending( self ):
+		if self.__pending is None:
+			return
+
+		i, n			= self.__pending
+		self.__pending	= None
+		self.__write( memoryview( self.__bufs[ i ] )[ : n * self.size ] )
+
+	def __write( self, data ):
+		if self.__file and self.file_size < self.__used + len( data ):
+			self.__file.close()
+			self.__file	= None
+			self.__num += 1
+
+		if not self.__file:
+			seq	= self.__seq()
+
+			for n in seq[ : max( 0, len( seq ) + 1 - self.files ) ]:
+				os.remove( self.__name( n ) )
+
+			self.__file	= open( self.__name( self.__num ), "wb" )
+			self.__used	= 0
+
+		self.__file.write( data )
+		self.__file.flush()
+		self.__used		+= len( data )
+		self.written	+= len( data ) // self.size
+
+	def flush( self ):
+		"""
+		write all records to file
+		"""
+		self.__write_pending()
+
+		if self.__n:
+			self.__write( memoryview( self.__bufs[ self.__buf ] )[ : self.__n * self.size ] )
+			self.__n	= 0
+
+	def close( self ):
+		"""
+		write all records and close the file
+		"""
+		self.flush()
+
+		if self.__file:
+			self.__file.close()
+			self.__file	= None
+
+	def read( self, start = None, end = None, dev_id = None ):
+		"""
+		read records in a time range
+
+		Parameters
+		----------
+		start : int, option
+			Start time (utime.time() seconds). From oldest if not given
+		end : int, option
+			End time (inclusive). To newest if not given
+		dev_id : int, option
+			Device ID. Records of all devices if not given
+
+		Returns
+		-------
+		generator : tuples of device ID, ticks, time and value (tuple if 
+			width > 1), oldest first
+
+		"""
+		self.flush()
+
+		size	= self.size
+		buf		= bytearray( size * self.batch )
+
+		for name in self.file_names():
+			with open( name, "rb" ) as f:
+				n	= f.seek( 0, 2 ) // size
+
+				if not n or (start is not None and self.__time( f, n - 1 ) < start):
+					continue
+
+				if end is not None and end < self.__time( f, 0 ):
+					return
+
+				lo, hi	= 0, n
+
+				while start is not None and lo < hi:	#	first record at start or later
+					mid	= (lo + hi) // 2
+
+					if self.__time( f, mid ) < start:
+						lo	= mid + 1
+					else:
+						hi	= mid
+
+				f.seek( lo * size )
+
+				while True:
+					m	= f.readinto( buf ) // size
+
+					if not m:
+						break
+
+					for i in range( m ):
+						r	= unpack_from( self.fmt, buf, i * size )
+
+						if end is not None and end < r[ 2 ]:
+							return
+
+						if dev_id is None or dev_id == r[ 0 ]:
+							yield r[ 0 ], r[ 1 ], r[ 2 ], r[ 3 ] if 1 == self.width else r[ 3 : ]
+
+	def __time( self, f, k ):
+		f.seek( k * self.size + self.TIME )
+		return unpack_from( "<I", f.read( 4 ) )[ 0 ]
+
+class sampler_channel:
+	"""
+	A channel of Sampler
+
+	Keeps the read function, sampling interval, sampled data (in a 
+	ring_buffer) and statistics. Instance of this class is made by 
+	Sampler.add(). 
+	Sample flags are LATE (taken late) and GAP (sampling slots were 
+	dropped before the sample). 
+
+	Statistics
+	----------
+	samples : int
+		Number of samples taken
+	dropped : int
+		Number of sampling slots skipped because the read was too late
+		(one or more intervals behind)
+	late : int
+		Number of samples taken later than the sampler period from its
+		scheduled time
+	late_ms : int
+		Total delay from scheduled time (for average)
+	max_late_ms : int
+		Maximum delay from scheduled time (jitter)
+	errors : int
+		Number of reads raised an exception
+	"""
+
+	LATE	= 0x01
+	GAP		= 0x02
+
+	def __init__( self, name, read, interval_ms, length, width = 1, typecode = "f", log = None, log_id = 0 ):
+		self.name			= name
+		self.read			= read
+		self.read_key		= ( getattr( read, "__self__", None ), getattr( read, "__func__", read ) )	#	same for each "obj.method" evaluation
+		self.interval_ms	= interval_ms
+		self.data			= ring_buffer( length, width, typecode )
+		self.log			= log
+		self.log_id			= log_id
+		self.due			= None
+
+		self.clear()
+
+	def clear( self ):
+		"""
+		clear statistics
+		"""
+		self.samples		= 0
+		self.dropped		= 0
+		self.late			= 0
+		self.late_ms		= 0
+		self.max_late_ms	= 0
+		self.errors			= 0
+
+	def stats( self ):
+		"""
+		statistics of the channel
+
+		Returns
+		-------
+		dict : samples, dropped, late, average/maximum delay and errors
+
+		"""
+		return	{
+					"samples"		: self.samples,
+					"dropped"		: self.dropped,
+					"late"			: self.late,
+					"avg_late_ms"	: self.late_ms / self.samples if self.samples else 0,
+					"max_late_ms"	: self.max_late_ms,
+					"errors"		: self.errors,
+				}
+
+class Sampler:
+	"""
+	Timer-driven periodic sampling for multiple devices
+
+	Channels are added with a read function and sampling interval. One
+	timer ticks at "period_ms" (GCD of the channel intervals if not
+	given). Each tick schedules a sampling run out of interrupt context
+	(by bus_owner.request() with REALTIME priority if "owner" is given,
+	micropython.schedule() if not). The run reads all channels which
+	are due. Channels which have the same read function (same function, 
+	or same method of same instance) and are due together are read by 
+	one call.
+
+	Each channel keeps last "length" samples in a ring_buffer. Read 
+	function needs to return a number or "width" numbers. 
+	Timing problems are counted: ticks came while previous run was not
+	done yet are "overruns". Per channel statistics (dropped and late
+	samples, delay) are given by stats().
+
+	Examples
+	--------
+	>>> sampler	= Sampler()
+	>>> sampler.add( "temp", lambda: temp_sensor.temp, 1000 )
+	>>> sampler.add( "xyz",  accel.xyz, 100, length = 100 )
+	>>> sampler.add( "acc",  accel.six_axis, 100, width = 6 )
+	>>> sampler.add( "acc_slow", accel.six_axis, 1000, width = 6 )	# read once with "acc"
+	>>> sampler.start()
+	...
+	>>> sampler.data( "temp", 10 )
+	[ ( 123456, 24.5, 0 ), ... ]
+	>>> sampler.stats()
+	{ "temp": { "samples": 10, "dropped": 0, ... }, ... }
+	>>> sampler.overruns
+	0
+
+	"""
+
+	def __init__( self, period_ms = None, timer = 0, owner = None ):
+		"""
+		Sampler initializer
+
+		Parameters
+		----------
+		period_ms : int, option
+			Timer period. GCD of channel intervals if not given
+		timer : int, option
+			Timer ID candidate (see MikanUtil.get_timer_id())
+		owner : bus_owner, option
+			The sampling run is queued on the bus_owner with REALTIME
+			priority
+
+		"""
+		self.period_ms	= period_ms
+		self.timer		= timer
+		self.owner		= owner
+		self.channels	= {}
+		self.overruns	= 0
+		self.running	= False
+
+		self.__tim		= None
+		self.__pending	= False
+		self.__run_ref	= self.__run	#	bound method is made here, not in interrupt
+		self.__tick_ref	= self.__tick
+
+	def add( self, name, read, interval_ms, length = 60, width = 1, typecode = "f", log = None, log_id = 0 ):
+		"""
+		add a channel
+
+		Parameters
+		----------
+		name : str
+			Channel name
+		read : callable
+			Function which returns a sample. Channels given same 
+			function or same method of same instance (like 
+			accel.six_axis) share a read when those are due together
+		interval_ms : int
+			Sampling interval in milliseconds
+		length : int, option
+			Number of samples kept in the channel
+		width : int, option
+			Number of values the read function returns
+		typecode : str, option
+			Array typecode of values ("f" for float, "l" for integer)
+		log : sample_log, option
+			Samples are also recorded in the log
+		log_id : int, option
+			Device ID in the log records
+
+		Returns
+		-------
+		sampler_channel : the channel
+
+		"""
+		ch	= sampler_channel( name, read, interval_ms, length, width, typecode, log, log_id )
+		self.channels[ name ]	= ch
+
+		if self.running:
+			ch.due	= ticks_ms()
+
+		return ch
+
+	def remove( self, name ):
+		"""
+		remove a channel
+
+		Parameters
+		----------
+		name : str
+			Channel name
+
+		"""
+		del self.channels[ name ]
+
+	def start( self ):
+		"""
+		start sampling
+
+		All channels are sampled at first tick.
+		"""
+		if not self.period_ms:
+			p	= 0
+			for ch in self.channels.values():
+				a, b	= p, ch.interval_ms
+				while b:
+					a, b	= b, a % b
+				p	= a
+			self.period_ms	= p if p else 1000
+
+		now	= ticks_ms()
+		for ch in self.channels.values():
+			ch.due	= now
+
+		self.__pending	= False
+		self.running	= True
+		self.__tim		= Timer( MikanUtil.get_timer_id( self.timer ) )
+		self.__tim.init( period = self.period_ms, callback = self.__tick_ref )
+
+	def stop( self ):
+		"""
+		stop sampling
+		"""
+		if self.__tim:
+			self.__tim.deinit()
+
+		self.__tim		= None
+		self.running	= False
+
+	def __tick( self, _ ):
+		if self.__pending:
+			self.overruns	+= 1
+			return
+
+		self.__pending	= True
+
+		try:
+			if self.owner:
+				if not self.owner.request( self.__run_ref, 0, self.owner.REALTIME ):
+					raise RuntimeError
+			else:
+				schedule( self.__run_ref, 0 )
+		except RuntimeError:	#	schedule queue full
+			self.__pending	= False
+			self.overruns	+= 1
+
+	def __run( self, _ ):
+		self.__pending	= False
+		self.poll()
+
+	def poll( self ):
+		"""
+		read channels which are due
+
+		Called by the timer. This can be called directly when the
+		sampler is not started (reactive sampling).
+
+		Returns
+		-------
+		int : number of channels sampled
+
+		"""
+		now		= ticks_ms()
+		reads	= []	#	pairs of read function and value in this run
+		n		= 0
+
+		for ch in self.channels.values():
+			if ch.due is None:
+				ch.due	= now
+
+			delay	= ticks_diff( now, ch.due )
+
+			if delay < 0:
+				continue
+
+			missed			= delay // ch.interval_ms
+			delay		   -= missed * ch.interval_ms
+			late			= self.period_ms and self.period_ms <= delay
+			ch.dropped	   += missed
+			ch.due			= ticks_add( ch.due, (missed + 1) * ch.interval_ms )
+			ch.late		   += 1 if late else 0
+			ch.late_ms	   += delay
+			ch.max_late_ms	= max( ch.max_late_ms, delay )
+
+			for k, v in reads:
+				if k == ch.read_key:
+					break
+			else:
+				try:
+					v	= ch.read()
+				except Exception:
+					ch.errors	+= 1
+					continue
+				reads	+= [ ( ch.read_key, v ) ]
+
+			self.__store( ch, v, now, (ch.LATE if late else 0) | (ch.GAP if missed else 0) )
+			n	+= 1
+
+		return n
+
+	def sample( self, name ):
+		"""
+		take a sample of a channel now
+
+		For reactive sampling (like on requests from a browser) when the 
+		sampler is not started. The sample is taken on each call without 
+		checking the due time, so requests with jitter don't drop samples. 
+
+		Parameters
+		----------
+		name : str
+			Channel name
+
+		Returns
+		-------
+		any : sampled value. None if the read raised an exception
+
+		"""
+		ch	= self.channels[ name ]
+
+		try:
+			v	= ch.read()
+		except Exception:
+			ch.errors	+= 1
+			return None
+
+		self.__store( ch, v, ticks_ms(), 0 )
+		return v
+
+	def __store( self, ch, v, now, flags ):
+		ch.data.append( v, now, flags )
+
+		if ch.log:
+			ch.log.append( ch.log_id, v, now )
+
+		ch.samples	+= 1
+
+	def data( self, name, length = None ):
+		"""
+		sampled data of a channel
+
+		Parameters
+		----------
+		name : str
+			Channel name
+		length : int, option
+			Number of latest samples. All kept samples if not given
+
+		Returns
+		-------
+		list : tuples of ticks_ms(), value and flags, oldest first
+
+		"""
+		return self.channels[ name ].data.last( length )
+
+	def since( self, name, k ):
+		"""
+		sampled data of a channel after a sample index
+		
+		For getting new samples after last query. Keep the "index" of 
+		the buffer (sampler.channels[ name ].data.index) for next query. 
+
+		Parameters
+		----------
+		name : str
+			Channel name
+		k : int
+			Sample index
+
+		Returns
+		-------
+		list : tuples of ticks_ms(), value and flags, oldest first
+
+		"""
+		return self.channels[ name ].data.since( k )
+
+	def latest( self, name ):
+		"""
+		latest value of a channel
+
+		Parameters
+		----------
+		name : str
+			Channel name
+
+		Returns
+		-------
+		any : latest value. None if no sample yet
+
+		"""
+		d	= self.channels[ name ].data
+
+		return d.get( -1 )[ 1 ] if len( d ) else None
+
+	def stats( self ):
+		"""
+		sampling statistics
+
+		Number of timer ticks which were skipped because previous 
+		sampling run was not done is in "overruns". 
+
+		Returns
+		-------
+		dict : channel name and its statistics (see sampler_channel)
+
+		"""
+		return { name: ch.stats() for name, ch in self.channels.items() }
+
+	def clear_stats( self ):
+		"""
+		clear statistics
+		"""
+		self.overruns	= 0
+
+		for ch in self.channels.values():
+			ch.clear()
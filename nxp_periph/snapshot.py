@@ -0,0 +1,74 @@
+from	ustruct		import	pack, unpack
+
+def snapshot_all( devices, dst = None, offset = 0 ):
+	"""
+	register state snapshot of devices
+	
+	Snapshots (see Interface.snapshot()) of the devices are put in a 
+	blob after its length (2 bytes). 
+	
+	Parameters
+	----------
+	devices : list
+		Device instances
+	dst : str or obj, option
+		File name or EEPROM instance (like M24C02) to save the blob
+	offset : int, option
+		Byte address in the EEPROM
+
+	Returns
+	-------
+	bytes : blob
+
+	Examples
+	--------
+	>>> snapshot_all( [ led_c0, led_c1, accel ], "snapshot.bin" )
+	
+	After reset: 
+	
+	>>> restore_all( [ led_c0, led_c1, accel ], "snapshot.bin" )
+
+	"""
+	data	= b"".join( d.snapshot() for d in devices )
+	blob	= pack( "<H", len( data ) ) + data
+
+	if isinstance( dst, str ):
+		with open( dst, "wb" ) as f:
+			f.write( blob )
+	elif dst is not None:
+		dst.write( offset, blob )
+
+	return blob
+
+def restore_all( devices, src, offset = 0 ):
+	"""
+	write back register state of devices
+	
+	Parameters
+	----------
+	devices : list
+		Device instances in same order as snapshot_all()
+	src : bytes, str or obj
+		Blob made by snapshot_all(), its file name or EEPROM instance
+	offset : int, option
+		Byte address in the EEPROM
+
+	"""
+	if isinstance( src, str ):
+		with open( src, "rb" ) as f:
+			blob	= f.read()
+	elif isinstance( src, ( bytes, bytearray ) ):
+		blob	= src
+	else:
+		length	= unpack( "<H", bytes( src.read( offset, 2 ) ) )[ 0 ]
+		blob	= bytes( src.read( offset, length + 2 ) )
+
+	blob	= memoryview( blob )
+	end		= 2 + unpack( "<H", blob[ : 2 ] )[ 0 ]
+	p		= 2
+
+	for d in devices:
+		if end <= p:
+			raise ValueError( "snapshot has fewer devices" )
+
+		p	+= d.restore( blob[ p : end ] )
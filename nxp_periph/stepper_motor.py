@@ -123,6 +123,8 @@ class PCA9629A( StepperMotor_base, I2C_target ):
 					"SUBADR1", "SUBADR2", "SUBADR3", "ALLCALLADR",
 					"STEPCOUNT0", "STEPCOUNT1", "STEPCOUNT2", "STEPCOUNT3",
 					)
+	REG_VOLATILE	= dict.fromkeys( ( "INTSTAT", "IP", "MCNTL", "STEPCOUNT0", "STEPCOUNT1", "STEPCOUNT2", "STEPCOUNT3" ), 0xFF )
+	FIELDS			= { "PHASE": ( "OP_CFG_PHS", 6, 2 ) }	#	0: one-phase, 1: two-phase, 3: half-step
 
 	def __init__( self, i2c, address = DEFAULT_ADDR, steps_per_rotation = 48 ):
 		"""
@@ -177,7 +179,7 @@ class PCA9629A( StepperMotor_base, I2C_target ):
 
 	def __drv_phase( self, v ):
 		v	= int( 0x3 if v == 0.5 else (v - 1)  )		
-		self.bit_operation( "OP_CFG_PHS", 0xC0, v << 6 )
+		self.fields.update( PHASE = v )
 
 	def __steps( self, step, reverse = False ):
 		self.w16( "CCWSCOUNTL" if reverse else "CWSCOUNTL", step )
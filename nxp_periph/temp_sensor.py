@@ -4,6 +4,7 @@ class temp_sensor_base():
 	"""
 	An abstraction class to make user interface.
 	"""
+	BURST_WRITE	= False		#	register pointers are not byte addresses
 
 	def read( self ):
 		"""
@@ -59,6 +60,16 @@ class temp_sensor_base():
 			
 			return data
 	
+	def shadow_update( self, reg, data ):
+		"""
+		record written value in shadow
+		
+		Only 8 bit registers are kept in the shadow because the register 
+		pointers are not addresses of bytes. 
+		"""
+		if 1 == self.REG_ACC[ self.REG_NAME[ reg ] ]:
+			super().shadow_update( reg, data )
+
 	def temp_setting( self, lst ):
 		"""
 		Over-temperature threshold and hysterisis setting
@@ -85,7 +96,7 @@ class temp_sensor_base():
 		Showing all register name, address/pointer and value
 		(Overriding I2C_target class method)
 		"""
-		data	= [ self.reg_access( k ) for k in self.REG_NAME ]
+		data	= self.dump()
 		fmt		= ( "", "{:02X}", "{:04X}" )
 		
 		print( "register dump: \"{}\", I2C target address 0x{:02X} (0x{:02X})".format( self.__class__.__name__, self.__adr, self.__adr << 1 ) )
@@ -93,9 +104,58 @@ class temp_sensor_base():
 			print( ("    {:6} (0x{:02X}) : 0x" + fmt[ self.REG_ACC[ k ] ]).format( k, i, v ) )
 
 	def dump( self ):
-		data	= [ self.reg_access( k ) for k in self.REG_NAME ]
+		"""
+		dump register values
+		
+		Pointer registers have no auto-increment. Each register is read 
+		with its own width (REG_ACC). 
+		"""
+		return [ self.reg_access( k ) for k in self.REG_NAME ]
+
+	def integrity_sample( self ):
+		"""
+		register values to check bus integrity (used by bus_tuner)
+		
+		All registers except "Temp" are read with their own width. 
+		"""
+		return [ self.reg_access( k ) for k in self.REG_NAME if k != "Temp" ]
+
+	def snapshot_data( self ):
+		"""
+		register values for snapshot()
+		
+		All registers except "Temp" with their own width (REG_ACC). 
+		None if the device doesn't respond. 
+		"""
+		data	= b""
+		
+		for k in self.REG_NAME:
+			if k != "Temp":
+				v	= self.reg_access( k )
+				
+				if v is None:
+					return None
+				
+				v		&= ~self.REG_VOLATILE.get( k, 0x00 )
+				data	+= v.to_bytes( self.REG_ACC[ k ], "big" )
+		
 		return data
 
+	def restore_data( self, data ):
+		"""
+		write register values taken by snapshot_data()
+		"""
+		if len( data ) != sum( self.REG_ACC[ k ] for k in self.REG_NAME if k != "Temp" ):
+			raise ValueError( "snapshot doesn't match registers of {}".format( self.__class__.__name__ ) )
+
+		p	= 0
+		
+		for k in self.REG_NAME:
+			if k != "Temp":
+				n	= self.REG_ACC[ k ]
+				self.reg_access( k, int.from_bytes( data[ p : p + n ], "big" ) )
+				p  += n
+
 	@property
 	def temp( self ):
 		"""
@@ -108,6 +168,25 @@ class temp_sensor_base():
 		"""
 		return self.__read()
 
+	def stream( self, interval_ms = 0, count = None ):
+		"""
+		Temperature stream
+	
+		Parameters
+		----------
+		interval_ms : int, option
+			Read interval (see nxp_periph.pipeline.stream)
+		count : int, option
+			Number of reads. Endless if not given
+
+		Returns
+		-------
+		stream : stream of temperature in degree-Celsius
+			
+		"""
+		from nxp_periph.pipeline	import	stream
+		return stream( self.__read, interval_ms, count )
+
 class LM75B( temp_sensor_base, I2C_target ):
 	"""
 	LM75B class
@@ -194,6 +273,7 @@ class P3T1755( LM75B ):
 	REG_NAME	= ( "Temp", "Conf", "T_LOW", "T_HIGH" )
 	REG_LEN		= (      2,      1,       2,        2 )
 	REG_ACC		= dict( zip( REG_NAME, REG_LEN ) )
+	REG_VOLATILE	= { "Conf": 0x80 }	#	OS (one-shot) bit
 	
 	def __init__( self, i2c, address = DEFAULT_ADDR ):
 		"""
@@ -17,7 +17,7 @@ from	nxp_periph	import	PCF2131, PCF85063A
 from	nxp_periph	import	PCAL6408, PCAL6416, PCAL6524, PCAL6534
 from	nxp_periph	import	FXOS8700, FXLS8974
 from	nxp_periph	import	NAFE13388
-from	nxp_periph	import	i2c_fullscan
+from	nxp_periph	import	i2c_fullscan, bus_owner, bus_scanner, device_discovery
 
 from	demo_lib	import	DUT_LEDC, DUT_TEMP, DUT_RTC, DUT_GPIO, DUT_ACC, DUT_AFE
 from	demo_lib	import	DUT_GENERALCALL, General_call
@@ -26,6 +26,14 @@ from	demo_lib	import	DUT_base
 from	demo_lib.I2C_Character_LCD	import	AE_AQM0802
 
 NETWORK_TIMEOUT	= False
+
+#	parts which cannot be identified by registers: address and class name
+DEVICE_HINTS	= {
+					0x48: "PCT2075",
+					}
+
+#	initializer arguments for found devices
+DEVICE_OPTIONS	= dict.fromkeys( ( "PCT2075", "PCAL6408", "PCAL6416", "PCAL6524", "PCAL6534" ), { "setup_EVB": True } )
 MEM_MONITORING	= False
 # MEM_MONITORING	= True	###
 
@@ -58,10 +66,18 @@ def demo( ip = "dhcp", config = "Normal" ):
 		if "i.MX RT1050 EVKB-A" in os.uname().machine:
 			si2c	= machine.SoftI2C( sda = "D14", scl = "D15", freq = (400_000) )
 		else:
-			si2c	= i2c
+			si2c	= None	#	LCD is on the shared bus. set after the bus owner is made
 
 		ep_num	= 0
 	
+	#	all devices on the buses are accessed through bus owners, 
+	#	to avoid timer callbacks interrupting transactions of HTTP handlers
+	i2c	= bus_owner( i2c )
+	spi	= bus_owner( spi )
+
+	if si2c is None:
+		si2c	= i2c
+
 	if "AFE" in config:
 		devices	= [
 					NAFE13388( spi ),
@@ -71,31 +87,22 @@ def demo( ip = "dhcp", config = "Normal" ):
 					]
 		si2c	= i2c
 	else:
-		devices	= [
-					PCA9956B( i2c, 0x02 >>1 ),
-					PCA9956B( i2c, 0x04 >>1 ),
-					PCA9955B( i2c, 0x06 >>1 ),
-					PCA9955B( i2c, 0x08 >>1 ),
-					PCA9955B( i2c, 0xBC >>1 ),
-					PCA9632( i2c ),
+		#	I2C devices are found by device_discovery. found devices are saved in "devices.json" for next boot
+		discovery	= device_discovery( i2c, hints = DEVICE_HINTS, options = DEVICE_OPTIONS )
+		devices		= discovery.discover( "i2c" )
+		devices	   += [
 					PCA9957( spi, setup_EVB = True ),
-					PCT2075( i2c, setup_EVB = True  ),
-					PCF2131( i2c ),
-#					PCAL6408( i2c, 0x21, setup_EVB = True ),
-					PCAL6416( i2c, 0x20, setup_EVB = True ),
-#					PCAL6524( i2c, 0x22, setup_EVB = True ),
-#					PCAL6534( i2c, 0x22, setup_EVB = True ),
 #					PCF2131( spi ),
-#					PCF85063A( i2c ),
-#					P3T1085( si2c ),
-#					FXLS8974( i2c, address = 0x18 ),
 #					NAFE13388( spi ),
-					FXLS8974( i2c, address = 0x18 ),
-					FXOS8700( i2c ),
-#					P3T1755( i2c ),
 					General_call( i2c ),
 					]
 
+		for a in discovery.unknown:
+			print( "  unknown device at 0x%02X (0x%02X)" % ( a, a << 1 ) )
+
+		for a, name, e in discovery.failed:
+			print( "  {} at 0x{:02X} could not be used: {}".format( name, a, e ) )
+
 	demo_harnesses	= [	DUT_LEDC,
 						DUT_TEMP,
 						DUT_RTC,
@@ -109,6 +116,7 @@ def demo( ip = "dhcp", config = "Normal" ):
 	lcd_panel.print( [ "Hello", "mikan" ] )
 	
 	dut_list	= get_dut_list( devices, demo_harnesses )
+	scanner		= bus_scanner( i2c, ttl_ms = 10_000, expect = devices )	#	scan result for the front page is refreshed every 10 seconds
 
 #	for d in dut_list:
 #		print( d.info )
@@ -193,7 +201,7 @@ def demo( ip = "dhcp", config = "Normal" ):
 					html = None
 
 			elif "GET / " in req:
-				html	= page_setup( dut_list, i2c, live_only = True if "?live_only=True" in req else False )			
+				html	= page_setup( dut_list, scanner, live_only = True if "?live_only=True" in req else False )			
 			else:
 				html	= ""
 
@@ -269,7 +277,7 @@ class DEMO( DUT_base ):
 	def __init__( self ):
 		super().__init__( None )
 
-def page_setup( dut_list, i2c, live_only = False ):
+def page_setup( dut_list, scanner, live_only = False ):
 	db	= DEMO()
 
 	db.page_data[ "dev_name"          ]	= "GENERAL"
@@ -279,7 +287,7 @@ def page_setup( dut_list, i2c, live_only = False ):
 	db.page_data[ "all_links"         ]	= links
 	db.page_data[ "front_page_table"  ]	= table
 	db.page_data[ "filtering_list"    ]	= filter_setting( live_only )
-	db.page_data[ "i2c_scan"          ]	= i2c_scan_table( i2c )
+	db.page_data[ "i2c_scan"          ]	= i2c_scan_table( scanner )
 
 	return db.load_html()
 
@@ -337,8 +345,8 @@ def page_table( dut_list, live_only = False ):
 
 	return "\n".join( s ), ", ".join( l )
 
-def i2c_scan_table( i2c ):
-	scan_result	= i2c_fullscan( i2c )
+def i2c_scan_table( scanner ):
+	scan_result	= scanner.scan()
 	s	 = [ '<table>' ]
 	s	+= [ '<tr>' ]
 	s	+= [ '<td class="table_header">0x</td>' ]
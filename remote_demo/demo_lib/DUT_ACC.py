@@ -5,6 +5,7 @@ import	micropython
 
 from	nxp_periph	import	FXOS8700, FXLS8974
 from	nxp_periph	import	ACCELEROMETER_base
+from	nxp_periph	import	ring_buffer
 from	demo_lib	import	DUT_base
 
 class DUT_ACC( DUT_base.DUT_base ):
@@ -25,7 +26,6 @@ class DUT_ACC( DUT_base.DUT_base ):
 		super().__init__( dev )
 		
 		self.read_ref	= self.__read
-		self.data		= []
 		self.rtc		= machine.RTC()	#	for timestamping on samples
 		self.info		= [ "acc", "" ]
 		self.symbol		= '🍎'
@@ -72,26 +72,19 @@ class DUT_ACC( DUT_base.DUT_base ):
 																			minmax	= ( -2, 2 )
 																			),
 										}, )
-						
+
+		self.keys	= [ splt[ "id" ] + ds[ "label" ] for splt in self.split for ds in splt[ "setting" ].data[ "datasets" ] ]
+		self.data	= ring_buffer( self.SAMPLE_LENGTH, len( self.keys ) )
+
 	def xyz_data( self ):
-		d	= {}
+		v	= []
 		for splt in self.split:
-			xyz	= splt[ "get_data" ]()
-		
-			for i, ds in enumerate( splt[ "setting" ].data[ "datasets" ] ):
-				d[ splt[ "id" ] + ds[ "label" ] ]	= xyz[ i ]
-		
-		tm	= self.rtc.now()
-		d[ "time" ]	= "%02d:%02d:%02d" % (tm[3], tm[4], tm[5])
+			v	+= splt[ "get_data" ]()[ : len( splt[ "setting" ].data[ "datasets" ] ) ]
 
-		return d
+		return v	#	in order of self.keys
 
 	def __read( self, _ ):
-		self.data	+= [ self.xyz_data() ]
-
-		over	= len( self.data ) - self.SAMPLE_LENGTH
-		if  0 < over:
-			self.data	= self.data[ over : ]
+		self.data.append( self.xyz_data() )
 
 		# print( "sampled: {}".format( self.data[ -1 ] ) )
 
@@ -123,7 +116,7 @@ class DUT_ACC( DUT_base.DUT_base ):
 				return "["+ s +"]"
 
 	def sending_data( self, length ):
-		return ujson.dumps( self.data[ -length: ] )
+		return ujson.dumps( self.sample_dicts( self.data.last( length ), self.keys ) )
 
 	def page_setup( self ):
 		self.page_data[ "symbol"    ]	= self.symbol
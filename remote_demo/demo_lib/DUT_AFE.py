@@ -7,6 +7,7 @@ from	nxp_periph	import	NAFE13388
 #from	nxp_periph	import	P3T1755
 from	nxp_periph	import	LM75B
 from	nxp_periph	import	AFE_base
+from	nxp_periph	import	ring_buffer
 from	demo_lib	import	DUT_base
 
 import	machine
@@ -51,7 +52,6 @@ class DUT_AFE( DUT_base.DUT_base ):
 		print( self.setting )
 		
 		self.read_ref	= self.__read
-		self.data		= []
 		self.rtc		= machine.RTC()	#	for timestamping on samples
 		self.info		= [ "AFE", "" ]
 		self.symbol		= '🌊'
@@ -82,6 +82,9 @@ class DUT_AFE( DUT_base.DUT_base ):
 																			 minmax	= ( self.setting[ "scales" ][ 1 ][ "min" ], self.setting[ "scales" ][ 1 ][ "max" ] )
 																			 ),
 										}, )
+
+		self.keys	= [ splt[ "id" ] + ds[ "label" ] for splt in self.split for ds in splt[ "setting" ].data[ "datasets" ] ]
+		self.data	= ring_buffer( self.SAMPLE_LENGTH, len( self.keys ) )
 	
 		self.dev.periodic_measurement_start()
 
@@ -150,24 +153,14 @@ class DUT_AFE( DUT_base.DUT_base ):
 
 
 	def xyz_data( self ):
-		d	= {}
+		v	= []
 		for splt in self.split:
-			xyz	= splt[ "get_data" ]()
-			
-			for i, ds in enumerate( splt[ "setting" ].data[ "datasets" ] ):
-				d[ splt[ "id" ] + ds[ "label" ] ]	= xyz
-		
-		tm	= self.rtc.now()
-		d[ "time" ]	= "%02d:%02d:%02d" % (tm[3], tm[4], tm[5])
+			v	+= [ splt[ "get_data" ]() ] * len( splt[ "setting" ].data[ "datasets" ] )
 
-		return d
+		return v	#	in order of self.keys
 
 	def __read( self, _ ):
-		self.data	+= [ self.xyz_data() ]
-
-		over	= len( self.data ) - self.SAMPLE_LENGTH
-		if  0 < over:
-			self.data	= self.data[ over : ]
+		self.data.append( self.xyz_data() )
 
 		# print( "sampled: {}".format( self.data[ -1 ] ) )
 
@@ -263,7 +256,7 @@ class DUT_AFE( DUT_base.DUT_base ):
 
 
 	def sending_data( self, length ):
-		return ujson.dumps( self.data[ -length: ] )
+		return ujson.dumps( self.sample_dicts( self.data.last( length ), self.keys ) )
 
 	def page_setup( self ):
 		self.page_data[ "symbol"    ]	= self.symbol
@@ -44,8 +44,10 @@ class DUT_GPIO( DUT_base.DUT_base ):
 				idx	= int( m.group( 1 ) )
 				val	= int( m.group( 2 ) )
 				
-				self.dev.write_registers( self.dev.REG_LIST[ idx ][ "name" ], val )
-				return ujson.dumps( { "reg": self.dev.REG_LIST[ idx ][ "idx" ], "val": val } )
+				r	= self.dev.REG_LIST[ idx ]
+				
+				self.dev.write_registers( r[ "name" ], val )
+				return ujson.dumps( { "reg": r[ "idx" ], "val": val } )
 			else:
 				return ""
 
@@ -57,7 +59,8 @@ class DUT_GPIO( DUT_base.DUT_base ):
 		return self.load_html()
 
 	def get_reg_table( self, cols ):
-		total	= len( self.dev.REG_LIST )
+		rl		= self.dev.REG_LIST
+		total	= len( rl )
 		rows	= (total + cols - 1) // cols
 
 		s	 	= [ '<table class="table_GPIO">' ]
@@ -65,8 +68,8 @@ class DUT_GPIO( DUT_base.DUT_base ):
 		for y in range( rows ):
 			s	 	+= [ '<tr class="reg_table_row">' ]
 			for i in range( y, total, rows ):
-				ri	= self.dev.REG_LIST[ i ][ "idx" ]
-				rn	= self.dev.REG_LIST[ i ][ "name" ]
+				ri	= rl[ i ][ "idx" ]
+				rn	= rl[ i ][ "name" ]
 
 				s	+= [ '<td class="td_GPIO reg_table_name">{}</td><td class="td_GPIO reg_table_name">0x{:02X}</td>'.format( rn, ri ) ]
 				s	+= [ '<td class="td_GPIO reg_table_val"><input type="text" onchange="updateRegField( {} )" id="regField{}" minlength=2 size=2 value="--" class="regfield"></td>'.format( i, i ) ]
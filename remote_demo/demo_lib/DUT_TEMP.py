@@ -5,7 +5,7 @@ import	micropython
 
 from	nxp_periph	import	PCT2075, LM75B, P3T1755, P3T1085
 from	nxp_periph	import	temp_sensor_base
-from	nxp_periph	import	MikanUtil
+from	nxp_periph	import	Sampler
 from	demo_lib	import	DUT_base
 
 TEMP_SENSOR_REACTIVE_MODE	= True	# Default: To operate multiple I2C devices on same bus
@@ -29,11 +29,13 @@ class DUT_TEMP( DUT_base.DUT_base ):
 	regex_mode		= ure.compile( r".*os_polarity=(\d+)&os_mode=(\d+)" )
 	regex_update	= ure.compile( r".*update=(\d+)" )
 
+	KEYS			= ( "temp", "tos", "thyst", "os", "heater" )	#	values in a sample
+
 	def __init__( self, dev, timer = 0, sampling_interval = 1.0 ):
 		super().__init__( dev )
 		
-		self.read_ref	= self.__read
-		self.data		= []
+		self.sampler	= Sampler( timer = timer, owner = self.dev.owner )
+		self.sampler.add( "temp", self.tmp_data, int( sampling_interval * 1000.0 ), self.SAMPLE_LENGTH, width = len( self.KEYS ) )
 		self.rtc		= machine.RTC()	#	for timestamping on samples
 		self.info		= [ "temp sensor", "" ]
 		self.symbol		= '🌡️'
@@ -68,40 +70,17 @@ class DUT_TEMP( DUT_base.DUT_base ):
 			self.dev.heater	= 0
 		
 		if self.dev.live and not self.reactive_mode:
-			tim0	= machine.Timer( MikanUtil.get_timer_id( timer ) )
-			tim0.init( period = int( sampling_interval * 1000.0 ), callback = self.tim_cb )
+			self.sampler.start()
 
 	def tmp_data( self ):
-		d	= {}
-		d[ "temp" ] = self.dev.temp
-		tm	= self.rtc.now()
-
-		d[ "time"   ]	= "%02d:%02d:%02d" % (tm[3], tm[4], tm[5])
-		d[ "tos"    ]	= self.tos
-		d[ "thyst"  ]	= self.thyst
-		
 		if self.int_pin:
-			d[ "os"     ]	= self.GRAPH_HIGH if self.int_pin.value() else self.GRAPH_LOW
-			d[ "heater" ]	= self.GRAPH_HIGH if self.dev.heater      else self.GRAPH_LOW
+			os		= self.GRAPH_HIGH if self.int_pin.value() else self.GRAPH_LOW
+			heater	= self.GRAPH_HIGH if self.dev.heater      else self.GRAPH_LOW
 		else:
-			d[ "os"     ]	= 20
-			d[ "heater" ]	= 20
-			
+			os		= 20
+			heater	= 20
 		
-		return d
-
-	def tim_cb( self, _ ):
-		micropython.schedule( self.read_ref, 0 )	
-		# https://docs.micropython.org/en/latest/reference/isr_rules.html#creation-of-python-objects
-
-	def __read( self, _ ):
-		self.data	+= [ self.tmp_data() ]
-
-		over	= len( self.data ) - self.SAMPLE_LENGTH
-		if  0 < over:
-			self.data	= self.data[ over : ]
-
-		# print( "sampled: {}".format( self.data[ -1 ] ) )
+		return ( self.dev.temp, self.tos, self.thyst, os, heater )	#	in order of KEYS
 
 	def parse( self, req ):
 		if self.dev_name not in req:
@@ -116,7 +95,7 @@ class DUT_TEMP( DUT_base.DUT_base ):
 			m	= self.regex_update.match( req )
 			if m:
 				if self.reactive_mode:
-					self.__read( 0 )	# argument is dummy
+					self.sampler.sample( "temp" )
 				
 				return self.sending_data( int( m.group( 1 ) ) )
 
@@ -144,7 +123,7 @@ class DUT_TEMP( DUT_base.DUT_base ):
 				return html
 
 	def sending_data( self, length ):
-		return ujson.dumps( self.data[ -length: ] )
+		return ujson.dumps( self.sample_dicts( self.sampler.data( "temp", length ), self.KEYS ) )
 
 	def page_setup( self ):
 		self.page_data[ "symbol"    ]	= self.symbol
@@ -1,5 +1,6 @@
 import	machine
 import	os
+from	utime	import	ticks_ms, ticks_diff
 
 class DUT_base():
 	SIG	= """\
@@ -31,6 +32,38 @@ class DUT_base():
 		self.page_data[ "dev_link"    ]	= '<a href="{}" target="_blank" rel="noopener noreferrer">{}</a>'.format( self.DS_URL[ self.type ], self.type )
 		self.page_data[ "dev_info"    ]	= self.dev.info()
 
+	def sample_dicts( self, samples, keys ):
+		"""
+		convert samples in ring_buffer to dicts for sending in JSON
+		
+		Sample time (ticks_ms) is converted to "hh:mm:ss" by self.rtc. 
+
+		Parameters
+		----------
+		samples : list
+			Tuples of ticks, value(s) and flags (ring_buffer.last())
+		keys : list
+			Keys for values in a sample
+
+		Returns
+		-------
+		list : dicts of values and "time"
+
+		"""
+		tm		= self.rtc.now()
+		now		= ticks_ms()
+		base	= tm[ 3 ] * 3600 + tm[ 4 ] * 60 + tm[ 5 ]
+		rtn		= []
+		
+		for t, v, f in samples:
+			d	= dict( zip( keys, v if type( v ) == tuple else ( v, ) ) )
+			s	= (base + ticks_diff( t, now ) // 1000) % 86400
+
+			d[ "time" ]	= "%02d:%02d:%02d" % (s // 3600, s // 60 % 60, s % 60)
+			rtn		   += [ d ]
+		
+		return rtn
+
 	def load_html( self ):
 		with open( "demo_lib/" + self.__class__.__name__ + ".html", "r" ) as f:
 			html	= f.read()